@@ -0,0 +1,805 @@
+"""Micro-benchmarks for the scheduling core.
+
+Usage:
+    python benchmarks.py                  # run every benchmark
+    python benchmarks.py engines          # only the engine comparison
+    python benchmarks.py engines --sizes 1000,10000
+
+Nothing here opens Zoom: the launch callback of every SchedulerManager is
+replaced with a no-op before jobs are registered.
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def _fmt(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.1f} ms"
+    return f"{seconds:8.2f} s "
+
+
+def _make_manager(engine: str, **kwargs):
+    from main import SchedulerManager
+    manager = SchedulerManager(callback=None, engine=engine, **kwargs)
+    manager._open_zoom = lambda *args, **kwargs: None
+    return manager
+
+
+def _sample_recurrences(n: int, seed: int = 42) -> List[tuple]:
+    rnd = random.Random(seed)
+    shapes = [
+        {'type': 'daily'},
+        {'type': 'weekdays'},
+        {'type': 'weekly', 'details': {'days_of_week': [0, 2]}},
+        {'type': 'weekly', 'details': {'days_of_week': [1, 3]}},
+        {'type': 'custom', 'details': {'unit': 'ngày', 'interval': 2}},
+    ]
+    # Classes start on the hour or quarter hour during the school day.
+    return [(rnd.randrange(7, 22), rnd.choice((0, 15, 30, 45)), rnd.choice(shapes)) for _ in range(n)]
+
+
+def bench_engines(sizes: List[int]) -> None:
+    """add / toggle / remove throughput: APScheduler vs native heap engine."""
+    print("== SchedulerManager engines (add_schedule / toggle_schedule / remove_schedule) ==")
+    print(f"{'engine':<12}{'n':>9}{'add':>14}{'toggle':>14}{'remove':>14}")
+    for n in sizes:
+        records = _sample_recurrences(n)
+        for engine in ("apscheduler", "heap"):
+            manager = _make_manager(engine)
+            try:
+                ids = [f"bench-{i}" for i in range(n)]
+                t0 = time.perf_counter()
+                for job_id, (hour, minute, rec) in zip(ids, records):
+                    manager.add_schedule(job_id, hour, minute, "83738062598", "", True, "Bench", recurrence=rec)
+                t1 = time.perf_counter()
+                for job_id in ids[: max(1, n // 10)]:
+                    manager.toggle_schedule(job_id, False)
+                    manager.toggle_schedule(job_id, True)
+                t2 = time.perf_counter()
+                for job_id in ids:
+                    manager.remove_schedule(job_id)
+                t3 = time.perf_counter()
+            finally:
+                manager.stop()
+            toggles = max(1, n // 10) * 2
+            print(f"{engine:<12}{n:>9}{_fmt(t1 - t0):>14}{_fmt((t2 - t1) / toggles):>14}{_fmt(t3 - t2):>14}"
+                  f"   (toggle = per call)")
+
+
+def bench_bulk(sizes: List[int]) -> None:
+    """Startup ingestion: add_schedule() per record vs one add_schedules() batch."""
+    print("== Startup ingestion (per-record add_schedule vs batched add_schedules) ==")
+    print(f"{'engine':<12}{'n':>9}{'per-record':>14}{'batched':>14}")
+    for n in sizes:
+        records = [
+            {'id': f"bench-{i}", 'hour': hour, 'minute': minute, 'meeting_id': "83738062598",
+             'name': "Bench", 'enabled': True, 'recurrence': rec}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        ]
+        for engine in ("apscheduler", "heap"):
+            timings = []
+            for batched in (False, True):
+                manager = _make_manager(engine)
+                try:
+                    t0 = time.perf_counter()
+                    if batched:
+                        manager.add_schedules(records)
+                    else:
+                        for r in records:
+                            manager.add_schedule(r['id'], r['hour'], r['minute'], r['meeting_id'], "",
+                                                 True, r['name'], recurrence=r['recurrence'])
+                    timings.append(time.perf_counter() - t0)
+                finally:
+                    manager.stop()
+            print(f"{engine:<12}{n:>9}{_fmt(timings[0]):>14}{_fmt(timings[1]):>14}")
+
+
+def bench_triggers(sizes: List[int]) -> None:
+    """Trigger cache effectiveness after a bulk load."""
+    print("== Shared trigger cache (after add_schedules) ==")
+    print(f"{'engine':<12}{'n':>9}{'load':>14}{'triggers':>10}{'hit rate':>10}")
+    for n in sizes:
+        records = [
+            {'id': f"bench-{i}", 'hour': hour, 'minute': minute, 'recurrence': rec}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        ]
+        for engine in ("apscheduler", "heap"):
+            manager = _make_manager(engine)
+            try:
+                t0 = time.perf_counter()
+                manager.add_schedules(records)
+                elapsed = time.perf_counter() - t0
+                stats = manager.trigger_cache_stats()
+            finally:
+                manager.stop()
+            print(f"{engine:<12}{n:>9}{_fmt(elapsed):>14}{stats['size']:>10}{stats['hit_rate']:>10.1%}")
+
+
+def bench_occurrences(sizes: List[int]) -> None:
+    """Expand every schedule over a 90-day window."""
+    from datetime import datetime, timedelta
+    import occurrences
+    print("== Occurrence expansion over 90 days ==")
+    print(f"{'n':>9}{'expand':>14}{'agenda':>14}{'fires':>12}")
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=90)
+    for n in sizes:
+        jobs = {
+            f"bench-{i}": {'hour': hour, 'minute': minute, 'enabled': True, 'recurrence': rec}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        }
+        t0 = time.perf_counter()
+        expanded = occurrences.expand_schedules(jobs, start, end)
+        t1 = time.perf_counter()
+        times, _ = occurrences.agenda(jobs, start, end)
+        t2 = time.perf_counter()
+        fires = sum(len(a) for a in expanded.values())
+        print(f"{n:>9}{_fmt(t1 - t0):>14}{_fmt(t2 - t1):>14}{fires:>12}")
+
+
+def bench_store(sizes: List[int]) -> None:
+    """Cost of persisting one toggle: full JSON rewrite vs SQLite row upsert."""
+    import tempfile
+    from pathlib import Path
+    from schedule_store import JournalScheduleStore, JsonScheduleStore, SqliteScheduleStore
+    print("== Schedule store (persist one toggled schedule) ==")
+    print(f"{'store':<12}{'n':>9}{'load':>14}{'save one':>14}")
+    for n in sizes:
+        jobs = {
+            f"bench-{i}": {'hour': hour, 'minute': minute, 'meeting_id': "83738062598", 'password': "",
+                           'enabled': True, 'name': f"Lớp {i}", 'recurrence': rec, 'zoom_link': ""}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / "zoom_schedule.json"
+            JsonScheduleStore(json_path).save(jobs)
+            stores = [JsonScheduleStore(json_path),
+                      SqliteScheduleStore(Path(tmp) / "zoom_schedule.db", legacy_json=json_path),
+                      JournalScheduleStore(json_path)]
+            for store in stores:
+                store.load()  # the SQLite store migrates from JSON here
+                t0 = time.perf_counter()
+                store.load()
+                t1 = time.perf_counter()
+                rounds = 20
+                for i in range(rounds):
+                    job_id = f"bench-{i}"
+                    jobs[job_id]['enabled'] = not jobs[job_id]['enabled']
+                    store.save(jobs, [job_id])
+                t2 = time.perf_counter()
+                store.close()
+                print(f"{store.kind:<12}{n:>9}{_fmt(t1 - t0):>14}{_fmt((t2 - t1) / rounds):>14}")
+
+
+_LOAD_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+kind, path = sys.argv[1], sys.argv[2]
+t0 = time.perf_counter()
+if kind == "json":
+    with open(path, encoding="utf-8") as f:
+        jobs = json.load(f)
+    opened = time.perf_counter()
+else:
+    from binary_snapshot import SnapshotReader
+    jobs = SnapshotReader(path).records()
+    opened = time.perf_counter()
+touched = sum(1 for _job_id, data in jobs.items() if data["hour"] >= 0)
+done = time.perf_counter()
+try:
+    # VmHWM belongs to this address space; ru_maxrss can carry the parent's peak across exec.
+    with open("/proc/self/status") as f:
+        peak_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except OSError:
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(opened - t0, done - t0, peak_kb)
+"""
+
+
+def bench_snapshot(sizes: List[int]) -> None:
+    """Cold load of the schedule file: pretty JSON vs mapped binary snapshot (fresh process each)."""
+    import os
+    import subprocess
+    import tempfile
+    from pathlib import Path
+    from binary_snapshot import write_snapshot
+    from schedule_store import JsonScheduleStore
+    print("== Snapshot cold load (open / open + touch every record / peak RSS) ==")
+    print(f"{'format':<10}{'n':>9}{'size':>10}{'open':>14}{'all records':>14}{'peak RSS':>12}")
+    root = os.path.dirname(os.path.abspath(__file__))
+    probe = _LOAD_PROBE.format(root=root)
+    for n in sizes:
+        jobs = {
+            f"bench-{i}": {'id': f"bench-{i}", 'name': f"Lớp {i % 500}", 'hour': hour, 'minute': minute,
+                           'meeting_id': str(83738062598 + i % 700), 'password': "", 'zoom_link': "",
+                           'enabled': True, 'recurrence': rec}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {"json": Path(tmp) / "zoom_schedule.json", "binary": Path(tmp) / "zoom_schedule.zsb"}
+            JsonScheduleStore(paths["json"]).save(jobs)
+            write_snapshot(jobs, paths["binary"])
+            for kind, path in paths.items():
+                out = subprocess.run([sys.executable, "-c", probe, kind, str(path)],
+                                     capture_output=True, text=True, check=True).stdout.split()
+                opened, total, rss_kb = float(out[0]), float(out[1]), int(out[2])
+                size = os.path.getsize(path) / 1e6
+                print(f"{kind:<10}{n:>9}{size:>8.1f}MB{_fmt(opened):>14}{_fmt(total):>14}"
+                      f"{rss_kb / 1024:>10.1f}MB")
+
+
+def bench_entries(sizes: List[int]) -> None:
+    """Retained memory of SchedulerManager.jobs: nested dicts vs slotted ScheduleEntry."""
+    import json
+    import tracemalloc
+    import uuid
+    from schedule_entry import ScheduleEntry
+    print("== Schedule records in memory (dict vs ScheduleEntry, as loaded from JSON) ==")
+    print(f"{'n':>9}{'dict':>12}{'entry':>12}{'per dict':>11}{'per entry':>11}{'saved':>8}")
+    rnd = random.Random(7)
+    for n in sizes:
+        records = {}
+        for i, (hour, minute, rec) in enumerate(_sample_recurrences(n)):
+            if rec['type'] == 'custom':
+                rec = {**rec, 'details': {**rec['details'], 'start_date': "2025-09-01"}}
+            meeting_id, password = str(rnd.randrange(10**10, 10**11)), f"{rnd.randrange(10**6):06d}"
+            job_id = str(uuid.UUID(int=rnd.getrandbits(128)))
+            records[job_id] = {'id': job_id, 'name': f"Lớp {i}", 'hour': hour, 'minute': minute,
+                               'meeting_id': meeting_id, 'password': password,
+                               'zoom_link': f"https://us06web.zoom.us/j/{meeting_id}?pwd={password}",
+                               'enabled': True, 'recurrence': rec}
+        text = json.dumps(records, ensure_ascii=False)
+        del records
+        sizes_by_kind = {}
+        for kind in ("dict", "entry"):
+            tracemalloc.start()
+            # Same as load_schedules: the record's id becomes the key string
+            if kind == "dict":
+                jobs = {job_id: {**data, 'id': job_id} for job_id, data in json.loads(text).items()}
+            else:
+                jobs = {job_id: ScheduleEntry.from_dict({**data, 'id': job_id})
+                        for job_id, data in json.loads(text).items()}
+            sizes_by_kind[kind] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del jobs
+        plain, slotted = sizes_by_kind["dict"], sizes_by_kind["entry"]
+        print(f"{n:>9}{plain / 1e6:>10.1f}MB{slotted / 1e6:>10.1f}MB{plain / n:>10.0f}B{slotted / n:>10.0f}B"
+              f"{1 - slotted / plain:>8.0%}")
+
+
+def _realistic_schedules(n: int, seed: int = 9) -> Dict[str, dict]:
+    """Timetable-like records: ~35 schedules per class room sharing its name, id, passcode and link."""
+    import uuid
+    from datetime import datetime, timedelta
+    rnd = random.Random(seed)
+    subjects = ["Toán", "Ngữ văn", "Tiếng Anh", "Vật lý", "Hóa học", "Sinh học", "Lịch sử", "Địa lý", "Tin học"]
+    rooms = []
+    for _ in range(max(1, n // 35)):
+        meeting_id, password = str(rnd.randrange(10**10, 10**11)), f"{rnd.randrange(10**6):06d}"
+        rooms.append((f"{rnd.choice(subjects)} {rnd.randrange(6, 13)}A{rnd.randrange(1, 15)}", meeting_id, password,
+                      f"https://us0{rnd.randrange(2, 7)}web.zoom.us/j/{meeting_id}?pwd={password}"))
+    start = datetime(2025, 9, 8, 7, 0)
+    records = {}
+    for i in range(n):
+        name, meeting_id, password, link = rnd.choice(rooms)
+        if i % 5 < 3:  # one-off sessions imported from a semester timetable
+            when = start + timedelta(days=rnd.randrange(120), hours=rnd.randrange(12), minutes=rnd.choice((0, 45)))
+            rec = {'type': 'once', 'run_date': when.isoformat()}
+            hour, minute = when.hour, when.minute
+        else:
+            rec = {'type': 'weekly', 'details': {'days_of_week': [rnd.randrange(6)]}}
+            hour, minute = rnd.randrange(7, 19), rnd.choice((0, 45))
+        job_id = str(uuid.UUID(int=rnd.getrandbits(128)))
+        records[job_id] = {'id': job_id, 'name': name, 'hour': hour, 'minute': minute, 'meeting_id': meeting_id,
+                           'password': password, 'zoom_link': link, 'enabled': True, 'recurrence': rec}
+    return records
+
+
+def bench_intern(sizes: List[int]) -> None:
+    """String interning of names / meeting ids / passcodes / links, on a timetable-like fixture."""
+    import json
+    import tracemalloc
+    import schedule_entry
+    from schedule_entry import ScheduleEntry
+    from schedule_search import ScheduleSearchIndex
+    print("== String interning (ScheduleEntry table loaded from JSON) ==")
+    print(f"{'n':>9}{'rooms':>8}{'plain':>12}{'interned':>12}{'per entry':>16}{'saved':>8}{'load':>20}")
+    for n in sizes:
+        text = json.dumps(_realistic_schedules(n), ensure_ascii=False)
+        results = {}
+        for mode in ("plain", "interned"):
+            original = schedule_entry.intern_text
+            if mode == "plain":
+                schedule_entry.intern_text = lambda value: value
+            try:
+                t0 = time.perf_counter()
+                jobs = {job_id: ScheduleEntry.from_dict({**data, 'id': job_id})
+                        for job_id, data in json.loads(text).items()}
+                elapsed = time.perf_counter() - t0
+                del jobs
+                tracemalloc.start()  # separate run: tracing slows allocation down
+                jobs = {job_id: ScheduleEntry.from_dict({**data, 'id': job_id})
+                        for job_id, data in json.loads(text).items()}
+                results[mode] = (tracemalloc.get_traced_memory()[0], elapsed)
+                tracemalloc.stop()
+            finally:
+                schedule_entry.intern_text = original
+        index = ScheduleSearchIndex()
+        index.rebuild(jobs.items())
+        rooms = index.stats()["meetings"]
+        shared = schedule_entry.intern_stats(jobs.values())
+        del jobs
+        (plain, t_plain), (interned, t_interned) = results["plain"], results["interned"]
+        print(f"{n:>9}{rooms:>8}{plain / 1e6:>10.1f}MB{interned / 1e6:>10.1f}MB"
+              f"{plain / n:>7.0f}B ->{interned / n:>5.0f}B{1 - interned / plain:>8.0%}"
+              f"{_fmt(t_plain):>10} ->{_fmt(t_interned):>8}")
+        print(f"{'':>9}intern_stats: {shared}")
+
+
+def bench_search(sizes: List[int]) -> None:
+    """Secondary indexes: lookup by meeting / link / name prefix and incremental upkeep."""
+    from schedule_search import ScheduleSearchIndex
+    print("== Schedule search index (per query / per update) ==")
+    print(f"{'n':>9}{'build':>12}{'meeting':>12}{'link':>12}{'name':>12}{'dups':>12}{'edit':>12}{'remove':>12}")
+    rnd = random.Random(5)
+    subjects = ["Toán", "Lý", "Hóa", "Văn", "Anh", "Sinh", "Sử", "Địa", "Tin", "GDCD"]
+    for n in sizes:
+        rooms = [str(rnd.randrange(10**10, 10**11)) for _ in range(max(1, n // 20))]
+        records = []
+        for i in range(n):
+            room = rnd.choice(rooms)
+            records.append((f"bench-{i}", {
+                'name': f"{rnd.choice(subjects)} {rnd.randrange(6, 13)}A{rnd.randrange(1, 20)} - buổi {i}",
+                'meeting_id': room if i % 2 else "",
+                'zoom_link': f"https://us0{i % 9 + 1}web.zoom.us/j/{room}?pwd=p{room[-4:]}" if i % 3 else ""}))
+        index = ScheduleSearchIndex()
+        t0 = time.perf_counter()
+        for job_id, record in records:
+            index.put(job_id, record)
+        index.by_name_prefix("")  # first name query merges the pending run
+        build = time.perf_counter() - t0
+
+        rounds = 1000
+        probes = [rnd.choice(rooms) for _ in range(rounds)]
+        timings = []
+        for query in (
+            lambda k: index.by_meeting(probes[k]),
+            lambda k: index.by_link(f"zoom.us/j/{probes[k]}?pwd=p{probes[k][-4:]}"),
+            lambda k: index.by_name_prefix(f"{subjects[k % 10]} {k % 7 + 6}a{k % 19 + 1}", limit=100),
+            lambda k: index.duplicates() if k % 100 == 0 else None,
+        ):
+            t0 = time.perf_counter()
+            for k in range(rounds):
+                query(k)
+            timings.append((time.perf_counter() - t0) / rounds)
+        timings[-1] *= 100  # duplicates() only ran every 100th round
+        t0 = time.perf_counter()
+        for k in range(rounds):
+            job_id, record = records[k]
+            index.put(job_id, {**record, 'name': record['name'] + " (sửa)", 'meeting_id': probes[k]})
+        edit = (time.perf_counter() - t0) / rounds
+        t0 = time.perf_counter()
+        for k in range(rounds):
+            index.discard(records[-1 - k][0])
+        remove = (time.perf_counter() - t0) / rounds
+        print(f"{n:>9}{_fmt(build):>12}" + "".join(f"{_fmt(t):>12}" for t in timings)
+              + f"{_fmt(edit):>12}{_fmt(remove):>12}")
+
+
+def bench_startup(sizes: List[int]) -> None:
+    """Startup from a binary snapshot: register everything vs arm the earliest jobs from the fire index."""
+    import tempfile
+    from pathlib import Path
+    from schedule_store import BinaryScheduleStore
+    print("== Startup (binary snapshot: full add_schedules vs load_indexed, arm_limit=256) ==")
+    print(f"{'engine':<12}{'n':>9}{'full':>14}{'indexed':>14}{'armed':>8}")
+    for n in sizes:
+        jobs = {
+            f"bench-{i}": {'id': f"bench-{i}", 'name': f"Lớp {i}", 'hour': hour, 'minute': minute,
+                           'meeting_id': "83738062598", 'password': "", 'zoom_link': "", 'enabled': True,
+                           'recurrence': rec}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "zoom_schedule.zsb"
+            BinaryScheduleStore(path).save(jobs)  # writes the snapshot and its fire index
+            for engine in ("apscheduler", "heap"):
+                # A fresh store per run, as in a freshly started process.
+                store, manager = BinaryScheduleStore(path), _make_manager(engine)
+                try:
+                    t0 = time.perf_counter()
+                    records = store.load()
+                    manager.add_schedules({**data, 'id': job_id} for job_id, data in records.items())
+                    full = time.perf_counter() - t0
+                finally:
+                    manager.stop()
+                    store.close()
+                store, manager = BinaryScheduleStore(path), _make_manager(engine)
+                try:
+                    t0 = time.perf_counter()
+                    records = store.load()
+                    index = store.open_index()
+                    report = manager.load_indexed(records, index, arm_limit=256)
+                    indexed = time.perf_counter() - t0
+                finally:
+                    manager.stop()
+                    index.close()
+                    store.close()
+                print(f"{engine:<12}{n:>9}{_fmt(full):>14}{_fmt(indexed):>14}{report['armed']:>8}")
+
+
+_APP_PROBE = """
+import json, pathlib, sys
+sys.path.insert(0, {root!r})
+folder = pathlib.Path(sys.argv[1])
+import main
+main.SCHEDULE_FILE = folder / "zoom_schedule.json"
+main.SCHEDULE_DB = folder / "zoom_schedule.db"
+main.APP_CONFIG_FILE = folder / "app_config.json"
+app = main.QApplication(sys.argv[:1])
+window = main.ZoomAutoApp(startup=main.STARTUP)
+
+def done(report):
+    records = getattr(window.scheduler, "_records", None)
+    print(json.dumps({{"load": report["phases"]["load"], "tti": report["time_to_interactive"],
+                      "rows": window.table_model.rowCount(),
+                      "decoded": records.decoded if records is not None else None}}))
+    app.quit()
+
+window.startup_finished.connect(done)
+window.show()
+sys.exit(app.exec())
+"""
+
+
+def bench_app_startup(sizes: List[int]) -> None:
+    """The real window startup (finish_startup: indexed load + table fill) from a binary snapshot."""
+    import json
+    import os
+    import subprocess
+    import tempfile
+    from pathlib import Path
+    from schedule_store import BinaryScheduleStore
+    print("== App startup (binary store, startup_arm_limit=256, fresh process each) ==")
+    print(f"{'n':>9}{'load phase':>14}{'interactive':>14}{'rows':>9}{'decoded':>9}")
+    probe = _APP_PROBE.format(root=os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    for n in sizes:
+        jobs = {
+            f"bench-{i}": {'id': f"bench-{i}", 'name': f"Lớp {i % 500}", 'hour': hour, 'minute': minute,
+                           'meeting_id': str(83738062598 + i % 700), 'password': "", 'zoom_link': "",
+                           'enabled': True, 'recurrence': rec}
+            for i, (hour, minute, rec) in enumerate(_sample_recurrences(n))
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            BinaryScheduleStore(Path(tmp) / "zoom_schedule.zsb").save(jobs)
+            with open(Path(tmp) / "app_config.json", "w", encoding="utf-8") as f:
+                json.dump({"store": "binary", "startup_arm_limit": 256, "watch_interval": 0}, f)
+            out = subprocess.run([sys.executable, "-c", probe, tmp], capture_output=True, text=True,
+                                 check=True, env=env).stdout
+            result = json.loads(next(line for line in out.splitlines() if line.startswith("{")))
+            print(f"{n:>9}{_fmt(result['load'] / 1000):>14}{_fmt(result['tti'] / 1000):>14}"
+                  f"{result['rows']:>9}{result['decoded']:>9}")
+
+
+def bench_horizon(sizes: List[int]) -> None:
+    """Live job set with every schedule armed vs a 24h horizon, on a mix with far-off one-shots."""
+    from datetime import datetime, timedelta
+    print("== Horizon mode (half one-shot schedules spread over 180 days) ==")
+    print(f"{'engine':<12}{'n':>9}{'horizon':>9}{'load':>14}{'live':>9}{'cold':>9}")
+    rnd = random.Random(7)
+    today = datetime.now().replace(second=0, microsecond=0)
+    for n in sizes:
+        records = []
+        for i, (hour, minute, rec) in enumerate(_sample_recurrences(n)):
+            if i % 2:
+                run = (today + timedelta(days=rnd.randrange(1, 180))).replace(hour=hour, minute=minute)
+                rec = {'type': 'once', 'run_date': run.isoformat()}
+            records.append({'id': f"bench-{i}", 'hour': hour, 'minute': minute, 'recurrence': rec})
+        for engine in ("apscheduler", "heap"):
+            for hours in (0, 24):
+                manager = _make_manager(engine, horizon=hours * 3600)
+                try:
+                    t0 = time.perf_counter()
+                    manager.add_schedules(records)
+                    elapsed = time.perf_counter() - t0
+                    stats = manager.horizon_stats()
+                finally:
+                    manager.stop()
+                print(f"{engine:<12}{n:>9}{hours:>8}h{_fmt(elapsed):>14}{stats['live']:>9}{stats['cold']:>9}")
+
+
+def _qt_app():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def _widget_table(table, jobs) -> None:
+    """The former refresh_table: one QCheckBox cell widget + four QTableWidgetItems per row."""
+    from PyQt6.QtWidgets import QCheckBox, QHBoxLayout, QTableWidgetItem, QWidget
+    from schedule_table import time_text
+    table.setRowCount(0)
+    for row, (job_id, job) in enumerate(sorted(jobs.items(), key=lambda item: (item[1]['hour'], item[1]['minute']))):
+        table.insertRow(row)
+        cell = QWidget()
+        layout = QHBoxLayout(cell)
+        check = QCheckBox()
+        check.setChecked(job.get('enabled', False))
+        layout.addWidget(check)
+        table.setCellWidget(row, 0, cell)
+        table.setItem(row, 1, QTableWidgetItem(time_text(job)))
+        table.setItem(row, 2, QTableWidgetItem(job.get('name', '')))
+        table.setItem(row, 3, QTableWidgetItem(job.get('meeting_id', '')))
+        table.setItem(row, 4, QTableWidgetItem(job.get('zoom_link', '')))
+    table.resizeRowsToContents()
+
+
+def bench_table(sizes: List[int]) -> None:
+    """Main window table: QTableWidget with per-row widgets vs ScheduleTableModel + QTableView."""
+    from PyQt6.QtWidgets import QTableView, QTableWidget
+    from schedule_entry import ScheduleEntry
+    from schedule_table import TOGGLE, ScheduleTableModel, ToggleDelegate
+    app = _qt_app()
+    print("== Schedule table: build + first paint, then one scroll step (widgets only up to 10k) ==")
+    print(f"{'n':>9}{'widgets':>12}{'model':>12}{'scroll':>12}{'edit/reset':>12}{'edit/row':>12}{'row_of':>12}")
+    for n in sizes:
+        jobs = {job_id: ScheduleEntry.from_dict({**data, 'id': job_id})
+                for job_id, data in _realistic_schedules(n).items()}
+        widgets = None
+        if n <= 10_000:
+            table = QTableWidget(0, 5)
+            table.resize(900, 600)
+            t0 = time.perf_counter()
+            _widget_table(table, jobs)
+            table.show()
+            app.processEvents()
+            widgets = time.perf_counter() - t0
+            table.close()
+            table.deleteLater()
+            app.processEvents()
+
+        model = ScheduleTableModel(lambda: jobs)
+        view = QTableView()
+        view.resize(900, 600)
+        view.setItemDelegateForColumn(TOGGLE, ToggleDelegate(view))
+        t0 = time.perf_counter()
+        view.setModel(model)
+        model.reload()
+        view.show()
+        app.processEvents()
+        build = time.perf_counter() - t0
+
+        rnd = random.Random(3)
+        rounds = 50
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            view.scrollTo(model.index(rnd.randrange(n), 1))
+            view.viewport().repaint()
+        scroll = (time.perf_counter() - t0) / rounds
+
+        # One edit: refresh the whole model vs update just that row (it moves to another time)
+        ids = list(jobs)
+        timings = []
+        for apply in (lambda job_id: model.reload(), lambda job_id: model.update_rows([job_id])):
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                job_id = rnd.choice(ids)
+                jobs[job_id]['hour'] = rnd.randrange(24)
+                apply(job_id)
+                app.processEvents()
+            timings.append((time.perf_counter() - t0) / rounds)
+        t0 = time.perf_counter()
+        for _ in range(rounds * 100):
+            model.row_of(rnd.choice(ids))
+        timings.append((time.perf_counter() - t0) / (rounds * 100))
+        view.close()
+        print(f"{n:>9}{_fmt(widgets) if widgets is not None else '-':>12}{_fmt(build):>12}{_fmt(scroll):>12}"
+              + "".join(f"{_fmt(t):>12}" for t in timings))
+
+
+def bench_filter(sizes: List[int]) -> None:
+    """Filter bar: index lookup + proxy rows per keystroke, then repainting the filtered view."""
+    from PyQt6.QtWidgets import QTableView
+    from schedule_search import ScheduleQuery
+    from schedule_table import ScheduleFilterProxy, ScheduleTableModel
+    app = _qt_app()
+    keystrokes = ["t", "to", "toa", "toan", "toan ", "toan 1", "toan 10", "toan 10a", "", "8", "83", "837",
+                  "https://us03web.zoom.us/j/1", ""]
+    print("== Filter bar (per keystroke; warm = building the search index in idle slices) ==")
+    print(f"{'n':>9}{'warm':>12}{'mean':>12}{'max':>12}{'repaint':>12}")
+    for n in sizes:
+        manager = _make_manager('heap')
+        manager.add_schedules(_realistic_schedules(n).values())
+        t0 = time.perf_counter()
+        while not manager.warm_search_index(budget=0.01):
+            pass
+        warm = time.perf_counter() - t0
+        model = ScheduleTableModel(manager.get_all_jobs)
+        model.reload()
+        proxy = ScheduleFilterProxy()
+        proxy.setSourceModel(model)
+        view = QTableView()
+        view.resize(900, 600)
+        view.horizontalHeader().setResizeContentsPrecision(0)
+        view.setModel(proxy)
+        view.show()
+        app.processEvents()
+        timings, paints = [], []
+        for _ in range(3):
+            for text in keystrokes:
+                query = ScheduleQuery(text)
+                t0 = time.perf_counter()
+                if query:
+                    proxy.set_filter(lambda: manager.filter_schedules(query),
+                                     lambda job_id: manager.schedule_matches(job_id, query))
+                else:
+                    proxy.set_filter()
+                timings.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                view.viewport().repaint()
+                paints.append(time.perf_counter() - t0)
+        view.close()
+        manager.stop()
+        print(f"{n:>9}{_fmt(warm):>12}{_fmt(sum(timings) / len(timings)):>12}{_fmt(max(timings)):>12}"
+              f"{_fmt(sum(paints) / len(paints)):>12}")
+
+
+def bench_dialogs(sizes: List[int]) -> None:
+    """Opening the main window's dialogs: built on every click vs reused from DialogCache.
+
+    Schedule counts do not matter here; each dialog is opened 20 times per mode.
+    """
+    from PyQt6.QtWidgets import QWidget
+    import main as app_main
+    from dialog_cache import DialogCache
+    app = _qt_app()
+    parent = QWidget()
+    kinds = {
+        "schedule": lambda: app_main.ScheduleDialog(parent),
+        "recurrence": lambda: app_main.CustomRecurrenceDialog(parent),
+        "help": lambda: app_main.HelpDialog(parent),
+        "about": lambda: app_main.AboutDialog(parent),
+        "test_zoom": lambda: app_main.TestZoomDialog(parent),
+    }
+    rounds = 20
+
+    def until_painted(dialog, cache, kind):
+        dialog.show()
+        while cache.stats()[kind]["opens"] < opened[kind] + 1:
+            app.processEvents()
+        opened[kind] += 1
+        dialog.hide()
+
+    print("== Dialog open latency (open call to first paint) ==")
+    print(f"{'dialog':>12}{'fresh':>12}{'prebuild':>12}{'cached p50':>12}{'cached max':>12}")
+    for kind, factory in kinds.items():
+        fresh = []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            dialog = factory()
+            dialog.show()
+            app.processEvents()
+            fresh.append(time.perf_counter() - t0)
+            dialog.hide()
+            dialog.deleteLater()
+        app.processEvents()
+        cache = DialogCache()
+        cache.register(kind, factory)
+        opened = {kind: 0}
+        cache.prebuild()
+        cache.build_pending()
+        for _ in range(rounds):
+            until_painted(cache.open(kind), cache, kind)
+        stats = cache.stats()[kind]
+        fresh.sort()
+        print(f"{kind:>12}{_fmt(fresh[len(fresh) // 2]):>12}{_fmt(stats['build_ms'] / 1000):>12}"
+              f"{_fmt(stats['open_p50_ms'] / 1000):>12}{_fmt(stats['open_max_ms'] / 1000):>12}")
+
+
+def _write_ics(path, n: int) -> None:
+    """n VEVENTs: one-off classes over the next 120 days plus 5% weekly series with EXDATEs."""
+    from datetime import datetime, timedelta
+    rnd = random.Random(11)
+    base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        for i in range(n):
+            start = base + timedelta(days=rnd.randrange(120), hours=rnd.randrange(7, 22),
+                                     minutes=rnd.choice((0, 15, 30, 45)))
+            f.write(f"BEGIN:VEVENT\r\nUID:bench-{i}@zoom-auto\r\nSUMMARY:Lớp {i}\r\n"
+                    f"DTSTART:{start:%Y%m%dT%H%M%S}\r\n")
+            if i % 20 == 0:
+                skip = start + timedelta(weeks=3)
+                f.write(f"RRULE:FREQ=WEEKLY;COUNT=15\r\nEXDATE:{skip:%Y%m%dT%H%M%S}\r\n")
+            f.write(f"LOCATION:https://us06web.zoom.us/j/{83738000000 + i}?pwd=p{i}\r\n"
+                    "DESCRIPTION:Tham gia lớp học trực tuyến qua Zoom\\, nhớ bật camera.\r\n"
+                    " Dòng mô tả được gập (folded) theo RFC 5545.\r\nEND:VEVENT\r\n")
+        f.write("END:VCALENDAR\r\n")
+
+
+def _write_csv(path, n: int) -> None:
+    import csv
+    rnd = random.Random(12)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "meeting_id", "password", "time", "type", "days", "exclude"])
+        for i in range(n):
+            writer.writerow([f"Lớp {i}", 83738000000 + i, f"p{i}",
+                             f"{rnd.randrange(7, 22):02d}:{rnd.choice((0, 15, 30, 45)):02d}",
+                             "weekly", rnd.choice(("T2,T4", "T3,T5", "T6")), ""])
+
+
+def bench_import(sizes: List[int]) -> None:
+    """Streaming CSV / iCalendar import: parse only, then parse + one add_schedules batch."""
+    import tempfile
+    from pathlib import Path
+    from schedule_import import ScheduleImporter
+    print("== Bulk import (ScheduleImporter -> add_schedules) ==")
+    print(f"{'format':<8}{'engine':<12}{'n':>9}{'parse':>12}{'import':>12}{'events/s':>12}{'added':>9}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            for kind, write in (("ics", _write_ics), ("csv", _write_csv)):
+                path = Path(tmp) / f"bench.{kind}"
+                write(path, n)
+                t0 = time.perf_counter()
+                for _ in ScheduleImporter(path):
+                    pass
+                parse = time.perf_counter() - t0
+                for engine in ("apscheduler", "heap"):
+                    manager = _make_manager(engine)
+                    try:
+                        t0 = time.perf_counter()
+                        report = manager.add_schedules(ScheduleImporter(path))
+                        elapsed = time.perf_counter() - t0
+                    finally:
+                        manager.stop()
+                    print(f"{kind:<8}{engine:<12}{n:>9}{_fmt(parse):>12}{_fmt(elapsed):>12}"
+                          f"{n / elapsed:>12,.0f}{len(report['added']):>9}")
+
+
+BENCHMARKS: Dict[str, Callable[[List[int]], None]] = {
+    "engines": bench_engines,
+    "bulk": bench_bulk,
+    "triggers": bench_triggers,
+    "occurrences": bench_occurrences,
+    "store": bench_store,
+    "snapshot": bench_snapshot,
+    "entries": bench_entries,
+    "intern": bench_intern,
+    "search": bench_search,
+    "startup": bench_startup,
+    "app_startup": bench_app_startup,
+    "horizon": bench_horizon,
+    "import": bench_import,
+    "table": bench_table,
+    "filter": bench_filter,
+    "dialogs": bench_dialogs,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated schedule counts")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or list(BENCHMARKS):
+        BENCHMARKS[name](sizes)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,426 @@
+"""Compact binary snapshot of the schedule table (``zoom_schedule.zsb``).
+
+Layout (little endian)::
+
+    header   magic "ZASB", version u16, flags u16, record count u32,
+             string count u32, string offsets at u64, string blob at u64,
+             records at u64                                   (40 bytes)
+    strings  u32 end offset per string, then the UTF-8 blob
+    records  one fixed-width struct per schedule (RECORD below)
+
+Every text field (job id, name, meeting id, password, link and the
+recurrence, stored as compact JSON) is an index into the string table, so a
+recurrence shape or meeting id repeated across thousands of schedules is
+stored once.
+
+``SnapshotReader`` maps the file and decodes nothing up front: ``records()``
+returns a read-only mapping that decodes a record the first time it is
+accessed. Strings and parsed recurrence shapes are cached by index.
+``encode_snapshot_from`` writes a new snapshot that copies unchanged records
+from a reader as stored and encodes only the edited ones.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from schedule_entry import to_plain
+
+MAGIC = b"ZASB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQQQ")
+# job_id, name, meeting_id, password, zoom_link, recurrence, hour, minute, flags
+RECORD = struct.Struct("<6IBBBx")
+# The same record as a numpy dtype, for whole-column reads
+RECORD_DTYPE = np.dtype([("job_id", "<u4"), ("name", "<u4"), ("meeting_id", "<u4"), ("password", "<u4"),
+                         ("zoom_link", "<u4"), ("recurrence", "<u4"), ("hour", "u1"), ("minute", "u1"),
+                         ("flags", "u1"), ("pad", "V1")])
+NO_STRING = 0xFFFFFFFF
+FLAG_ENABLED = 0x01
+
+_FIELDS = ("name", "meeting_id", "password", "zoom_link")
+
+
+class SnapshotError(ValueError):
+    """The file is not a readable binary snapshot."""
+
+
+class _Encoder:
+    """String table and packed records of a snapshot being written."""
+
+    def __init__(self):
+        self.strings: List[bytes] = []
+        self.index: Dict[bytes, int] = {}
+        self.packed = bytearray()
+        self.count = 0
+
+    def intern_bytes(self, blob: bytes) -> int:
+        found = self.index.get(blob)
+        if found is None:
+            found = self.index[blob] = len(self.strings)
+            self.strings.append(blob)
+        return found
+
+    def intern(self, value) -> int:
+        if value is None:
+            return NO_STRING
+        return self.intern_bytes(str(value).encode("utf-8"))
+
+    def add(self, job_id: str, data: Mapping) -> None:
+        intern = self.intern
+        recurrence = data.get("recurrence")
+        rec_ref = NO_STRING if recurrence is None else intern(
+            json.dumps(recurrence, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=to_plain))
+        self.add_fields(
+            intern(job_id), *(intern(data.get(field, "")) for field in _FIELDS), rec_ref,
+            int(data.get("hour", 0) or 0), int(data.get("minute", 0) or 0),
+            FLAG_ENABLED if data.get("enabled", True) else 0)
+
+    def add_fields(self, *fields) -> None:
+        self.packed += RECORD.pack(*fields)
+        self.count += 1
+
+    def finish(self) -> bytes:
+        ends, total = [], 0
+        for blob in self.strings:
+            total += len(blob)
+            ends.append(total)
+        offsets_at = HEADER.size
+        blob_at = offsets_at + 4 * len(self.strings)
+        records_at = blob_at + total
+        header = HEADER.pack(MAGIC, VERSION, 0, self.count, len(self.strings), offsets_at, blob_at, records_at)
+        return b"".join((header, struct.pack(f"<{len(ends)}I", *ends), b"".join(self.strings), self.packed))
+
+
+def encode_snapshot(jobs: Mapping) -> bytes:
+    """Encode ``{job_id: record}`` into the snapshot format."""
+    encoder = _Encoder()
+    for job_id, data in jobs.items():
+        encoder.add(job_id, data)
+    return encoder.finish()
+
+
+def encode_snapshot_from(reader: "SnapshotReader", entries: Iterable[Union[int, Tuple[str, Mapping]]]) -> bytes:
+    """Encode a snapshot that mostly repeats ``reader``'s records.
+
+    ``entries`` are, in order, either a record position in ``reader`` (its
+    fields and strings are copied as stored, nothing is decoded) or a
+    ``(job_id, record)`` pair to encode.
+    """
+    encoder = _Encoder()
+    remap: Dict[int, int] = {NO_STRING: NO_STRING}
+
+    def copy(ref: int) -> int:
+        found = remap.get(ref)
+        if found is None:
+            found = remap[ref] = encoder.intern_bytes(reader.raw_string(ref))
+        return found
+
+    for entry in entries:
+        if isinstance(entry, int):
+            fields = reader.fields(entry)
+            encoder.add_fields(*(copy(ref) for ref in fields[:6]), *fields[6:])
+        else:
+            encoder.add(*entry)
+    return encoder.finish()
+
+
+def write_snapshot(jobs: Mapping, path, data: Optional[bytes] = None) -> None:
+    """Write ``jobs`` (or already encoded ``data``) atomically to ``path``."""
+    if data is None:
+        data = encode_snapshot(jobs)
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _clone_recurrence(rec: Dict[str, Any]) -> Dict[str, Any]:
+    # Shapes are parsed once and shared; hand each record its own dicts so
+    # in-place edits (e.g. stamping details['start_date']) stay local.
+    clone = dict(rec)
+    details = rec.get("details")
+    if isinstance(details, dict):
+        clone["details"] = {k: list(v) if isinstance(v, list) else v for k, v in details.items()}
+    return clone
+
+
+class SnapshotReader:
+    """Memory-mapped view of a binary snapshot."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotError(f"{self.path.name}: file too short")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _flags, count, nstrings, offsets_at, blob_at, records_at = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise SnapshotError(f"{self.path.name}: not a v{VERSION} schedule snapshot")
+        if records_at + count * RECORD.size > size:
+            self._mm.close()
+            raise SnapshotError(f"{self.path.name}: truncated")
+        self.count = count
+        self._nstrings = nstrings
+        self._offsets_at = offsets_at
+        self._blob_at = blob_at
+        self._records_at = records_at
+        self._strings: Dict[int, Optional[str]] = {NO_STRING: None}
+        self._shapes: Dict[int, Dict[str, Any]] = {}
+        # Zero-copy view of the string end offsets (the file is little endian).
+        self._view = memoryview(self._mm)
+        self._ends = self._view[offsets_at:blob_at].cast("I") if sys.byteorder == "little" else None
+        self._closed = False
+
+    def _end(self, ref: int) -> int:
+        if self._ends is not None:
+            return self._ends[ref]
+        return struct.unpack_from("<I", self._mm, self._offsets_at + 4 * ref)[0]
+
+    def _slice(self, ref: int) -> memoryview:
+        start = self._end(ref - 1) if ref else 0
+        return self._view[self._blob_at + start:self._blob_at + self._end(ref)]
+
+    def string(self, ref: int) -> Optional[str]:
+        value = self._strings.get(ref, self)
+        if value is self:
+            value = self._strings[ref] = str(self._slice(ref), "utf-8")
+        return value
+
+    def raw_string(self, ref: int) -> bytes:
+        """String ``ref`` as stored (UTF-8), without decoding or caching it."""
+        return bytes(self._slice(ref))
+
+    def job_id(self, position: int) -> str:
+        return self.string(struct.unpack_from("<I", self._mm, self._records_at + position * RECORD.size)[0])
+
+    def fields(self, position: int) -> tuple:
+        """Raw record at ``position``: six string refs, then hour, minute and flags."""
+        return RECORD.unpack_from(self._mm, self._records_at + position * RECORD.size)
+
+    def _decode(self, fields: tuple) -> Dict[str, Any]:
+        job_id, name, meeting_id, password, zoom_link, rec_ref, hour, minute, flags = fields
+        string = self.string
+        recurrence = None
+        if rec_ref != NO_STRING:
+            shape = self._shapes.get(rec_ref)
+            if shape is None:
+                shape = self._shapes[rec_ref] = json.loads(string(rec_ref))
+            recurrence = _clone_recurrence(shape)
+        return {
+            "id": string(job_id),
+            "name": string(name),
+            "hour": hour,
+            "minute": minute,
+            "meeting_id": string(meeting_id),
+            "password": string(password),
+            "zoom_link": string(zoom_link),
+            "enabled": bool(flags & FLAG_ENABLED),
+            "recurrence": recurrence,
+        }
+
+    def record(self, position: int) -> Dict[str, Any]:
+        return self._decode(self.fields(position))
+
+    def _column(self, name: str) -> np.ndarray:
+        # A copy: an array still viewing the mapping would keep close() from releasing it
+        records = np.frombuffer(self._view, dtype=RECORD_DTYPE, count=self.count, offset=self._records_at)
+        return records[name].copy()
+
+    def job_ids(self) -> List[str]:
+        """Job id of every record in position order, sliced from the string blob in one pass."""
+        refs = self._column("job_id").astype(np.int64)
+        if not len(refs):
+            return []
+        if refs.max() >= self._nstrings:
+            return [self.job_id(position) for position in range(self.count)]
+        ends = np.frombuffer(self._view, dtype="<u4", count=self._nstrings, offset=self._offsets_at)
+        stops = ends[refs].astype(np.int64)
+        starts = np.where(refs > 0, ends[np.maximum(refs - 1, 0)], 0).astype(np.int64)
+        del ends
+        # Latin-1 maps bytes to chars one to one, so byte offsets index the text; ids
+        # that are not ASCII are re-decoded as UTF-8
+        blob = str(self._view[self._blob_at:self._records_at], "latin-1")
+        return [text if text.isascii() else text.encode("latin-1").decode("utf-8")
+                for text in (blob[start:stop] for start, stop in zip(starts.tolist(), stops.tolist()))]
+
+    def times(self) -> Tuple[List[int], List[int]]:
+        """Hour and minute of every record, in position order."""
+        return self._column("hour").tolist(), self._column("minute").tolist()
+
+    def iter_records(self) -> Iterator[tuple]:
+        """``(position, fields)`` for every record, straight from the mapped array."""
+        end = self._records_at + self.count * RECORD.size
+        return enumerate(RECORD.iter_unpack(self._view[self._records_at:end]))
+
+    def records(self) -> "LazyRecords":
+        return LazyRecords(self)
+
+    def detach(self) -> None:
+        """Copy the file into memory and close the mapping, so the file can be replaced.
+
+        Reads keep working from the copy; nothing is decoded.
+        """
+        if isinstance(self._mm, mmap.mmap) and not self._mm.closed:
+            data = bytes(self._mm)
+            self.close()
+            self._closed = False
+            self._mm = data
+            self._view = memoryview(data)
+            self._ends = (self._view[self._offsets_at:self._blob_at].cast("I")
+                          if sys.byteorder == "little" else None)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            if self._ends is not None:
+                self._ends.release()
+            self._view.release()
+            if isinstance(self._mm, mmap.mmap):
+                self._mm.close()
+
+
+class LazyRecords(Mapping):
+    """``{job_id: record}`` over a ``SnapshotReader``; each record is decoded on first access."""
+
+    def __init__(self, reader: SnapshotReader):
+        self._reader = reader
+        self._count = reader.count
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+        self._positions: Optional[Dict[str, int]] = None
+        # Decoding touches the mapping; detach() swaps it out from another thread.
+        self._lock = threading.Lock()
+
+    @property
+    def reader(self) -> SnapshotReader:
+        return self._reader
+
+    def _index(self) -> Dict[str, int]:
+        # job_id -> position, read from the id column only
+        if self._positions is None:
+            with self._lock:
+                if self._positions is None:
+                    ids = self._reader.job_ids()
+                    self._positions = dict(zip(ids, range(len(ids))))
+        return self._positions
+
+    def _position_of(self, job_id: str) -> int:
+        return self._index()[job_id]
+
+    def _at(self, position: int) -> Dict[str, Any]:
+        record = self._decoded.get(position)
+        if record is None:
+            with self._lock:
+                record = self._decoded.get(position)
+                if record is None:
+                    record = self._decoded[position] = self._reader.record(position)
+        return record
+
+    def at(self, position: int) -> Dict[str, Any]:
+        """Record stored at ``position`` in the snapshot."""
+        return self._at(position)
+
+    def position_of(self, job_id: str) -> int:
+        """Position of ``job_id`` in the snapshot (reads job ids only, decodes no record)."""
+        return self._position_of(job_id)
+
+    def peek(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Record of ``job_id`` (None if absent), decoded without keeping it; for one-off scans."""
+        position = self._index().get(job_id)
+        if position is None:
+            return None
+        record = self._decoded.get(position)
+        if record is None:
+            with self._lock:
+                record = self._decoded.get(position) or self._reader.record(position)
+        return record
+
+    def __getitem__(self, job_id: str) -> Dict[str, Any]:
+        return self._at(self._position_of(job_id))
+
+    def times(self) -> Iterator[Tuple[str, int, int]]:
+        """``(job_id, hour, minute)`` of every record in snapshot order, read from the packed array."""
+        ids = list(self._index())
+        with self._lock:
+            hours, minutes = self._reader.times()
+        return zip(ids, hours, minutes)
+
+    def __contains__(self, job_id) -> bool:
+        # Membership needs the id index only, not the record
+        try:
+            self._position_of(job_id)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        # Snapshot order, from the id column: iterating decodes no record
+        return iter(list(self._index()))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def items(self):
+        # Positional walk over the packed array: no job_id -> position index needed.
+        if len(self._decoded) == self._count:
+            return ((record["id"], record) for _, record in sorted(self._decoded.items()))
+        return self._walk()
+
+    def _walk(self):
+        with self._lock:
+            decoded, decode = self._decoded, self._reader._decode
+            for position, fields in self._reader.iter_records():
+                record = decoded.get(position)
+                if record is None:
+                    record = decoded[position] = decode(fields)
+            records = [decoded[i] for i in range(self._count)]
+        return ((record["id"], record) for record in records)
+
+    def detach(self) -> None:
+        """Move the reader off the mapped file; records not read yet stay encoded, in memory."""
+        with self._lock:
+            self._reader.detach()
+
+    @property
+    def decoded(self) -> int:
+        return len(self._decoded)
+
+    def materialize(self) -> Dict[str, Dict[str, Any]]:
+        """Decode everything into a plain dict (the mapping stays usable afterwards)."""
+        return dict(self.items())
+
+
+def _convert(argv: List[str]) -> int:
+    """``python binary_snapshot.py to-binary|to-json SRC DST``"""
+    if len(argv) != 3 or argv[0] not in ("to-binary", "to-json"):
+        print(_convert.__doc__)
+        return 2
+    command, src, dst = argv
+    if command == "to-binary":
+        with open(src, "r", encoding="utf-8") as f:
+            write_snapshot(json.load(f), dst)
+    else:
+        reader = SnapshotReader(src)
+        try:
+            jobs = reader.records().materialize()
+        finally:
+            reader.close()
+        with open(dst, "w", encoding="utf-8") as f:
+            json.dump(jobs, f, ensure_ascii=False, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_convert(sys.argv[1:]))
@@ -0,0 +1,122 @@
+"""Build-once dialogs for the main window.
+
+The dialogs in ``main.py`` (add/edit schedule, custom recurrence, help,
+about, Zoom test) each parse a large stylesheet and create dozens to
+hundreds of widgets; building one took 5-35 ms on every click, and the
+first show polishes and lays it out again. ``DialogCache`` builds each kind
+once, either on first use or ahead of time in idle slices after startup
+(``prebuild``), and hands back the same instance on every open.
+
+A dialog that keeps input between opens defines ``reset()``; ``open`` calls
+it before returning, so a reused dialog looks freshly built. ``open`` also
+starts a clock that stops at the dialog's first paint, and ``stats()``
+reports those open latencies per kind.
+"""
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QDialog
+
+from launch_metrics import percentile
+
+
+class DialogCache(QObject):
+    """One instance per registered dialog kind, built lazily or while idle."""
+
+    def __init__(self, parent: Optional[QObject] = None, history: int = 100):
+        super().__init__(parent)
+        self._factories: Dict[str, Callable[[], QDialog]] = {}
+        self._dialogs: Dict[str, QDialog] = {}
+        self._build_ms: Dict[str, float] = {}
+        self._prebuilt: Dict[str, bool] = {}
+        self._latency: Dict[str, Deque[float]] = {}
+        self._history = history
+        self._opening: Dict[QDialog, tuple] = {}   # dialog -> (kind, started)
+        self._pending: Deque[str] = deque()
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._build_next)
+
+    def register(self, kind: str, factory: Callable[[], QDialog]) -> None:
+        """``factory()`` builds the dialog of ``kind`` (called at most once)."""
+        self._factories[kind] = factory
+
+    def is_built(self, kind: str) -> bool:
+        return kind in self._dialogs
+
+    def get(self, kind: str) -> QDialog:
+        """The cached dialog of ``kind``, built now if needed; not reset."""
+        dialog = self._dialogs.get(kind)
+        if dialog is None:
+            dialog = self._build(kind, prebuilt=False)
+        return dialog
+
+    def open(self, kind: str) -> QDialog:
+        """The dialog of ``kind`` reset for a new open; its first paint stops the latency clock."""
+        started = time.perf_counter()
+        dialog = self.get(kind)
+        reset = getattr(dialog, "reset", None)
+        if reset is not None:
+            reset()
+        self._opening[dialog] = (kind, started)
+        return dialog
+
+    def prebuild(self, kinds: Optional[Iterable[str]] = None) -> None:
+        """Build ``kinds`` (default: all registered) one per event-loop turn."""
+        for kind in self._factories if kinds is None else kinds:
+            if kind not in self._dialogs and kind not in self._pending:
+                self._pending.append(kind)
+        if self._pending:
+            self._timer.start()
+
+    def build_pending(self) -> None:
+        """Build everything ``prebuild`` has queued right away (tests, benchmarks)."""
+        while self._pending:
+            self._build_next()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per kind: build time, whether it was prebuilt, and open latency (ms) p50/p95/max."""
+        report = {}
+        for kind in self._factories:
+            samples = sorted(self._latency.get(kind, ()))
+            report[kind] = {
+                "built": kind in self._dialogs,
+                "prebuilt": self._prebuilt.get(kind, False),
+                "build_ms": self._build_ms.get(kind),
+                "opens": len(samples),
+                "open_p50_ms": percentile(samples, 50),
+                "open_p95_ms": percentile(samples, 95),
+                "open_max_ms": samples[-1] if samples else None,
+            }
+        return report
+
+    def _build_next(self) -> None:
+        while self._pending:
+            kind = self._pending.popleft()
+            if kind not in self._dialogs:
+                self._build(kind, prebuilt=True)
+                break
+        if not self._pending:
+            self._timer.stop()
+
+    def _build(self, kind: str, prebuilt: bool) -> QDialog:
+        started = time.perf_counter()
+        dialog = self._factories[kind]()
+        # Polish styles now, not on the first show
+        dialog.ensurePolished()
+        if dialog.layout() is not None:
+            dialog.layout().activate()
+        dialog.installEventFilter(self)
+        self._dialogs[kind] = dialog
+        self._build_ms[kind] = (time.perf_counter() - started) * 1000
+        self._prebuilt[kind] = prebuilt
+        return dialog
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint and watched in self._opening:
+            kind, started = self._opening.pop(watched)
+            samples = self._latency.setdefault(kind, deque(maxlen=self._history))
+            samples.append((time.perf_counter() - started) * 1000)
+        return False
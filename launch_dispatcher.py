@@ -0,0 +1,155 @@
+"""Coalescing dispatcher for Zoom launches.
+
+When hundreds of rooms start at 08:00 sharp, every scheduler job would call
+``webbrowser.open`` at the same instant. ``CoalescingDispatcher`` collects all
+launches that arrive within a short fire window into one batch, then runs the
+batch with a bounded number of concurrent launches and a minimum stagger
+between launch starts. Batches run one at a time, and the stagger carries
+over from one batch to the next, so launches that arrive while a long batch
+is still going wait for it instead of running beside it. A launch that
+arrives while nothing is queued or running is dispatched at once rather than
+after a full window. Timing for each batch is kept in a bounded history.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class BatchStats:
+    """Timing of one dispatched batch (all times from ``time.time()``)."""
+
+    __slots__ = ("opened_at", "started_at", "finished_at", "size", "errors")
+
+    def __init__(self, opened_at: float, size: int):
+        self.opened_at = opened_at          # first launch of the window arrived
+        self.started_at = opened_at         # batch began dispatching
+        self.finished_at = opened_at        # last launch returned
+        self.size = size
+        self.errors = 0
+
+    @property
+    def wait(self) -> float:
+        return self.started_at - self.opened_at
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "opened_at": self.opened_at,
+            "size": self.size,
+            "errors": self.errors,
+            "wait": self.wait,
+            "duration": self.duration,
+        }
+
+
+class CoalescingDispatcher:
+    """Group launches arriving within ``window`` seconds and run them as one batch."""
+
+    def __init__(self, launch: Callable[..., Any], window: float = 1.0, max_concurrency: int = 4,
+                 stagger: float = 0.25, history: int = 200):
+        self._launch = launch
+        self.window = max(0.0, float(window))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.stagger = max(0.0, float(stagger))
+        self.batches: Deque[BatchStats] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._dispatching = threading.Lock()  # held for the whole of a batch
+        self._busy = False
+        self._next_start = 0.0  # time.monotonic() of the earliest next launch start
+        self._pending: List[Tuple[tuple, dict]] = []
+        self._opened_at = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                        thread_name_prefix="zoom-launch")
+        self._stopped = False
+
+    def submit(self, *args: Any, **kwargs: Any) -> None:
+        """Queue one launch; the first launch of a window arms the flush timer.
+
+        When nothing else is queued or running the timer fires at once: a
+        lone launch does not wait out the window, later ones coalesce.
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            self._pending.append((args, kwargs))
+            if self._timer is None:
+                self._opened_at = time.time()
+                delay = 0.0 if len(self._pending) == 1 and not self._busy else self.window
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> Optional[BatchStats]:
+        """Dispatch everything queued so far and block until the batch is done.
+
+        Waits for a batch already running; launches queued meanwhile join
+        this one.
+        """
+        with self._dispatching:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                items, self._pending = self._pending, []
+                opened_at = self._opened_at
+                pool = None if self._stopped else self._pool
+                if not items or pool is None:
+                    return None
+                self._busy = True
+            try:
+                return self._run_batch(pool, items, opened_at)
+            finally:
+                with self._lock:
+                    self._busy = False
+
+    def _run_batch(self, pool: ThreadPoolExecutor, items: List[Tuple[tuple, dict]],
+                   opened_at: float) -> BatchStats:
+        stats = BatchStats(opened_at, len(items))
+        stats.started_at = time.time()
+        futures = []
+        next_start = max(self._next_start, time.monotonic())
+        for args, kwargs in items:
+            delay = next_start - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(self._launch, *args, **kwargs))
+            next_start += self.stagger
+        self._next_start = next_start
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                stats.errors += 1
+                print(f"[DISPATCH] Lỗi khi mở Zoom: {e}")
+        stats.finished_at = time.time()
+        self.batches.append(stats)
+        return stats
+
+    def stop(self) -> None:
+        """Drop queued launches and release the worker pool."""
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dropped = len(self._pending)
+            self._pending = []
+        if dropped:
+            print(f"[DISPATCH] Bỏ {dropped} lần mở Zoom đang chờ do ứng dụng dừng")
+        self._pool.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = list(self.batches)
+        return {
+            "batches": len(batches),
+            "launches": sum(b.size for b in batches),
+            "largest_batch": max((b.size for b in batches), default=0),
+            "max_duration": max((b.duration for b in batches), default=0.0),
+            "last": batches[-1].as_dict() if batches else None,
+        }
@@ -0,0 +1,146 @@
+"""Fire-latency and drift instrumentation for scheduled launches.
+
+For every fire we keep four instants (epoch seconds):
+
+* ``planned``   - when the trigger said the job should run,
+* ``picked_up`` - when a scheduler worker thread started handling it,
+* ``opened``    - when ``webbrowser.open`` returned,
+* and the derived lags between them.
+
+Records live in a fixed-size ring buffer; ``summary()`` reports p50/p95/p99
+for pickup lag, open duration and end-to-end lag, plus the number of fires
+the scheduler dropped as missed.
+
+The engines report the planned time out of band: ``mark_planned`` is called
+by the scheduler thread right before a job is handed to a worker, and the
+worker claims it with ``take_planned``.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from apscheduler.executors.pool import ThreadPoolExecutor as _APSThreadPoolExecutor
+
+
+class FireRecord:
+    __slots__ = ("job_id", "planned", "picked_up", "opened", "error")
+
+    def __init__(self, job_id: Optional[str], planned: Optional[float], picked_up: float):
+        self.job_id = job_id
+        self.planned = planned
+        self.picked_up = picked_up
+        self.opened: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def pickup_lag(self) -> Optional[float]:
+        return None if self.planned is None else self.picked_up - self.planned
+
+    @property
+    def open_duration(self) -> Optional[float]:
+        return None if self.opened is None else self.opened - self.picked_up
+
+    @property
+    def lag(self) -> Optional[float]:
+        if self.planned is None or self.opened is None:
+            return None
+        return self.opened - self.planned
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "planned": self.planned,
+            "picked_up": self.picked_up,
+            "opened": self.opened,
+            "pickup_lag": self.pickup_lag,
+            "open_duration": self.open_duration,
+            "lag": self.lag,
+            "error": self.error,
+        }
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5 - 1e-9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _to_timestamp(moment) -> float:
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return float(moment)
+
+
+class LaunchMetrics:
+    """Ring buffer of ``FireRecord`` with percentile summaries."""
+
+    def __init__(self, capacity: int = 1000):
+        self.records: Deque[FireRecord] = deque(maxlen=capacity)
+        self.missed = 0
+        self._planned: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ---- planned-time hand-off between scheduler thread and worker ---------
+    def mark_planned(self, job_id: str, planned) -> None:
+        self._planned[job_id] = _to_timestamp(planned)
+
+    def take_planned(self, job_id: Optional[str]) -> Optional[float]:
+        return self._planned.pop(job_id, None) if job_id is not None else None
+
+    def mark_missed(self, job_id: str, planned=None) -> None:
+        with self._lock:
+            self.missed += 1
+
+    # ---- recording -------------------------------------------------------------
+    def start(self, job_id: Optional[str]) -> FireRecord:
+        """Called on the worker thread when a fire is picked up."""
+        return FireRecord(job_id, self.take_planned(job_id), time.time())
+
+    def finish(self, record: FireRecord, error: Optional[str] = None) -> None:
+        """Called once the browser call returned (or failed)."""
+        record.opened = time.time()
+        record.error = error
+        with self._lock:
+            self.records.append(record)
+
+    # ---- queries -------------------------------------------------------------
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = list(self.records)[-limit:]
+        return [r.as_dict() for r in records]
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            records = list(self.records)
+            missed = self.missed
+        result: Dict[str, Any] = {"count": len(records), "missed": missed,
+                                  "errors": sum(1 for r in records if r.error)}
+        for name in ("pickup_lag", "open_duration", "lag"):
+            values = sorted(v for v in (getattr(r, name) for r in records) if v is not None)
+            result[name] = {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1] if values else None,
+            }
+        return result
+
+
+class PlannedTimeExecutor(_APSThreadPoolExecutor):
+    """APScheduler thread pool that reports each job's scheduled run time.
+
+    ``_do_submit_job`` runs on the scheduler thread before the job reaches a
+    worker, so the planned time is always registered before the job reads it.
+    """
+
+    def __init__(self, metrics: LaunchMetrics, max_workers: int = 10):
+        super().__init__(max_workers)
+        self._metrics = metrics
+
+    def _do_submit_job(self, job, run_times):
+        self._metrics.mark_planned(job.id, run_times[-1])
+        super()._do_submit_job(job, run_times)
@@ -1,17 +1,21 @@
+# Đo thời gian khởi động từ dòng đầu tiên (các pha: xem startup_timer.py)
+from startup_timer import StartupTimer, over_budget
+STARTUP = StartupTimer()
 import sys
 import json
-import os
-from datetime import datetime, timedelta
+import shutil
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+    QLabel, QLineEdit, QPushButton, QTableView, QAbstractItemView,
     QTimeEdit, QSpinBox, QMessageBox, QDialog, QFormLayout, QCheckBox,
     QHeaderView, QDateTimeEdit, QRadioButton, QButtonGroup, QDateEdit,
     QComboBox, QDialogButtonBox, QSpinBox, QCheckBox, QGroupBox, QScrollArea,
-    QTabWidget, QTextBrowser
+    QTabWidget, QTextBrowser, QFileDialog
 )
-from PyQt6.QtCore import QTime, Qt, QThread, pyqtSignal, QDateTime, QDate
+from PyQt6.QtCore import QTime, Qt, QThread, QTimer, pyqtSignal, QDateTime, QDate
 
 # Mapping thứ trong tuần
 WEEKDAYS_MAP = {
@@ -181,6 +185,8 @@ class CustomRecurrenceDialog(QDialog):
         """)
         
         self.current_date = current_date or QDate.currentDate()
+        # Mốc đếm chu kỳ (mỗi N tuần/tháng/năm); giữ nguyên khi sửa lịch có sẵn
+        self.start_date = self.current_date.toString(Qt.DateFormat.ISODate)
         
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -338,6 +344,19 @@ class CustomRecurrenceDialog(QDialog):
         self.setLayout(main_layout)
         self.update_ui()
     
+    def reset(self, current_date=None):
+        """Về trạng thái mặc định như khi vừa tạo (dialog được dùng lại giữa các lần mở)"""
+        self.current_date = current_date or QDate.currentDate()
+        self.start_date = self.current_date.toString(Qt.DateFormat.ISODate)
+        self.interval_spin.setValue(1)
+        self.unit_combo.setCurrentIndex(1)
+        today = self.current_date.dayOfWeek() - 1
+        for i, btn in enumerate(self.day_buttons):
+            btn.setChecked(i == today)
+        self.radio_never.setChecked(True)
+        self.end_date_edit.setDate(self.current_date.addMonths(1))
+        self.update_ui()
+
     def update_radio_text(self):
         """Update radio button text with checkmark for checked state"""
         if self.radio_never.isChecked():
@@ -370,11 +389,13 @@ class CustomRecurrenceDialog(QDialog):
             'interval': self.interval_spin.value(),
             'unit': self.unit_combo.currentText(),
             'days_of_week': days_of_week,
+            'start_date': self.start_date,
             'end_date': end_date
         }
     
     def set_data(self, data):
         if not data: return
+        self.start_date = data.get('start_date') or self.start_date
         self.interval_spin.setValue(data.get('interval', 1))
         self.unit_combo.setCurrentText(data.get('unit', 'tuần'))
         
@@ -389,16 +410,93 @@ class CustomRecurrenceDialog(QDialog):
         else:
             self.radio_never.setChecked(True)
 
-from PyQt6.QtGui import QIcon, QColor
-from apscheduler.schedulers.background import BackgroundScheduler
-import webbrowser
-import subprocess
-import uuid
+from PyQt6.QtGui import QIcon, QColor, QKeySequence, QShortcut
+# Không import sẵn: updater (kéo theo requests), webbrowser, uuid và BackgroundScheduler
+# (chỉ engine 'apscheduler') được import ở lần dùng đầu tiên
+import heapq
+import threading
+import time
 from version import __version__ as APP_VERSION
-import updater
+from timer_heap import HeapScheduler
+from trigger_cache import TriggerCache, apscheduler_factory, native_factory
+from launch_dispatcher import CoalescingDispatcher
+from launch_metrics import LaunchMetrics, PlannedTimeExecutor
+from recurrence import compile_recurrence
+from schedule_store import open_store
+from schedule_index import ArmQueue, OverlayJobs
+from write_behind import WriteBehindPersister
+from schedule_loader import load_schedule_file
+from schedule_import import ScheduleImporter
+from schedule_watcher import ScheduleFileWatcher, diff_schedules
+from schedule_entry import Recurrence, ScheduleEntry, as_recurrence, intern_stats
+from schedule_search import ScheduleQuery, ScheduleSearchIndex
+from dialog_cache import DialogCache
+from schedule_table import ScheduleFilterProxy, ScheduleTableModel, ToggleDelegate, JOB_ID_ROLE, TOGGLE, TIME
+STARTUP.mark('imports')
 
 # Đường dẫn lưu trữ lịch
 SCHEDULE_FILE = Path(__file__).parent / "zoom_schedule.json"
+SCHEDULE_DB = Path(__file__).parent / "zoom_schedule.db"
+# Cấu hình ứng dụng (tùy chọn)
+APP_CONFIG_FILE = Path(__file__).parent / "app_config.json"
+
+DEFAULT_APP_CONFIG = {
+    # "apscheduler" (mặc định) hoặc "heap" (bộ lập lịch min-heap gốc, cho hàng chục nghìn lịch)
+    "engine": "apscheduler",
+    # Gom các lần mở Zoom đến hạn trong cùng một cửa sổ (giây) thành một lô; 0 = tắt
+    # (lần mở đến khi không có gì đang chờ hay đang chạy thì đi ngay, không chờ cửa sổ)
+    "launch_coalesce_window": 1.0,
+    # Số lần mở Zoom chạy đồng thời tối đa trong một lô
+    "launch_concurrency": 4,
+    # Khoảng cách tối thiểu (giây) giữa hai lần mở Zoom liên tiếp trong một lô
+    "launch_stagger": 0.5,
+    # "json" (ghi lại toàn bộ zoom_schedule.json), "sqlite" (zoom_schedule.db, chỉ ghi dòng thay đổi)
+    # "binary" (snapshot nhị phân zoom_schedule.zsb, map vào bộ nhớ và giải mã từng bản ghi khi cần)
+    # hoặc "journal" (ghi thêm từng thay đổi vào zoom_schedule.journal, định kỳ gộp vào zoom_schedule.json)
+    "store": "json",
+    # Kích thước (byte) journal bắt đầu được gộp vào snapshot
+    "journal_max_bytes": 1048576,
+    # Với store "binary": chỉ đăng ký N lịch sớm nhất khi khởi động (dùng chỉ mục giờ chạy); 0 = tắt
+    "startup_arm_limit": 0,
+    # Gom các thay đổi trong cửa sổ (giây) rồi ghi một lần ở thread nền; 0 = ghi ngay trên UI thread
+    "save_debounce": 0.5,
+    # Chỉ đăng ký các lịch sẽ chạy trong N giờ tới, định kỳ nạp thêm lịch vào cửa sổ;
+    # 0 = không giới hạn (đăng ký tất cả lịch ngay khi tải)
+    "schedule_horizon_hours": 0,
+    # Chu kỳ (giây) ScheduleFileWatcher kiểm tra zoom_schedule.json bị công cụ bên ngoài sửa
+    # (chỉ với store "json"); 0 = tắt theo dõi
+    "watch_interval": 2.0,
+    # Ngân sách thời gian khởi động (ms) theo pha (imports, scheduler, ui, first_paint, load) hoặc
+    # time_to_interactive; vượt ngân sách thì in cảnh báo [STARTUP], tests.py coi là lỗi; 0 = không kiểm tra
+    "startup_budget_ms": {"imports": 1500, "time_to_interactive": 3000},
+}
+
+def open_url(url):
+    """webbrowser.open; webbrowser (kéo theo subprocess, shlex…) chỉ được import ở lần mở đầu tiên"""
+    import webbrowser
+    return webbrowser.open(url)
+
+
+def new_job_id():
+    """ID cho lịch mới"""
+    import uuid
+    return str(uuid.uuid4())
+
+
+def load_app_config():
+    """Đọc app_config.json, thiếu khóa nào thì dùng giá trị mặc định"""
+    config = dict(DEFAULT_APP_CONFIG)
+    try:
+        if APP_CONFIG_FILE.exists():
+            with open(APP_CONFIG_FILE, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+    except Exception as e:
+        print(f"[CONFIG] Không đọc được {APP_CONFIG_FILE.name}: {e}")
+    if config.get('engine') not in SchedulerManager.ENGINES:
+        print(f"[CONFIG] engine {config.get('engine')!r} không hợp lệ "
+              f"(chọn một trong {', '.join(SchedulerManager.ENGINES)}), dùng 'apscheduler'")
+        config['engine'] = 'apscheduler'
+    return config
 
 class ZoomOpener(QThread):
     """Thread để mở Zoom"""
@@ -420,7 +518,7 @@ class ZoomOpener(QThread):
                 zoom_url += f"&pwd={self.meeting_password}"
             
             print(f"[DEBUG] Mở URL: {zoom_url}")
-            webbrowser.open(zoom_url)
+            open_url(zoom_url)
             
             # Emit signal nếu được kết nối
             try:
@@ -441,99 +539,96 @@ class ZoomOpener(QThread):
 
 class SchedulerManager:
     """Quản lý lập lịch"""
-    def __init__(self, callback=None, parent_window=None):
-        self.scheduler = BackgroundScheduler()
+    ENGINES = ('apscheduler', 'heap')
+
+    def __init__(self, callback=None, parent_window=None, engine='apscheduler',
+                 coalesce_window=0, launch_concurrency=4, launch_stagger=0.5, metrics_capacity=1000,
+                 horizon=0):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Engine không hợp lệ: {engine}")
+        self.engine = engine
+        # Đo độ trễ mỗi lần mở Zoom: giờ dự kiến -> thread nhận job -> webbrowser.open trả về
+        self.launch_metrics = LaunchMetrics(metrics_capacity)
+        # 'heap': một min-heap + một thread điều phối, API giống BackgroundScheduler
+        if engine == 'heap':
+            self.scheduler = HeapScheduler(on_submit=self.launch_metrics.mark_planned,
+                                           on_missed=self.launch_metrics.mark_missed)
+        else:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            from apscheduler.events import EVENT_JOB_MISSED
+            self.scheduler = BackgroundScheduler(
+                executors={'default': PlannedTimeExecutor(self.launch_metrics)})
+            self.scheduler.add_listener(
+                lambda event: self.launch_metrics.mark_missed(event.job_id, event.scheduled_run_time),
+                EVENT_JOB_MISSED)
         self.scheduler.start()
+        # Các lịch cùng dạng lặp lại dùng chung một trigger đã biên dịch
+        self.trigger_cache = TriggerCache(native_factory if engine == 'heap' else apscheduler_factory)
+        self._trigger_keys = {}  # job_id -> khóa trigger đang dùng
+        self._compiled = {}  # chữ ký lặp lại -> CompiledRecurrence
+        # Khóa cho cache trigger / hàng đợi đăng ký (thread nạp bổ sung chạy song song với UI)
+        self._lock = threading.RLock()
+        # Chế độ chỉ mục (load_indexed): các lịch chưa đăng ký, xếp theo giờ chạy kế tiếp
+        self._records = None
+        self._arm_queue = None
+        self._arm_limit = 0
+        self._armed_until = None
+        # Chế độ cửa sổ (horizon > 0, giây): chỉ lịch chạy trong horizon giây tới mới được
+        # đăng ký với scheduler, các lịch còn lại nằm trong hàng đợi "lạnh" theo giờ chạy
+        self.horizon = max(0, horizon or 0)
+        self._cold = {}  # job_id -> timestamp lần chạy kế tiếp của lịch chưa đăng ký
+        self._cold_heap = []  # (timestamp, job_id); mục đã cũ bị bỏ qua khi lấy ra
+        if self.horizon:
+            self._schedule_horizon_refill()
+        # Gom các lịch đến hạn cùng lúc thành một lô mở Zoom (coalesce_window=0: mở ngay)
+        self.dispatcher = None
+        if coalesce_window and coalesce_window > 0:
+            self.dispatcher = CoalescingDispatcher(
+                lambda *args: self._launch(*args),
+                window=coalesce_window, max_concurrency=launch_concurrency, stagger=launch_stagger
+            )
         self.callback = callback
         self.jobs = {}
+        # Chỉ mục phụ (meeting id, link, tên) cho tìm kiếm: dựng ở truy vấn đầu tiên hoặc dần dần
+        # lúc rảnh (warm_search_index; không làm chậm lúc nạp lịch), sau đó cập nhật theo từng
+        # thao tác; dựng lại nếu self.jobs bị thay
+        self.search_index = ScheduleSearchIndex()
+        self._indexed_jobs = None
+        self._warm_ids = None   # các job_id chưa đưa vào chỉ mục khi đang dựng dần
         self.active_threads = [] # Danh sách giữ các thread đang chạy
         self.parent_window = parent_window # Thêm parent_window
     
+    RECURRENCE_TYPES = ('once', 'daily', 'weekly', 'weekdays', 'custom')
+
     def add_schedule(self, job_id, hour, minute, meeting_id, password="", enabled=True, name="", recurrence=None, zoom_link=""):
         """Thêm hoặc cập nhật lịch"""
         try:
             # Nếu job_id chưa có (thêm mới), tạo UUID
             if not job_id:
-                job_id = str(uuid.uuid4())
-            
-            # Lưu thông tin
-            self.jobs[job_id] = {
-                'id': job_id,
-                'name': name,
-                'hour': hour,
-                'minute': minute,
-                'meeting_id': meeting_id,
-                'password': password,
-                'zoom_link': zoom_link,
-                'enabled': enabled,
-                'recurrence': recurrence
-            }
+                job_id = new_job_id()
+            recurrence = as_recurrence(self._ensure_anchor(recurrence))
+            
+            # Lưu thông tin (ScheduleEntry: bản ghi gọn dùng __slots__, đọc như dict)
+            self._put_record(job_id, ScheduleEntry(
+                id=job_id,
+                name=name,
+                hour=hour,
+                minute=minute,
+                meeting_id=meeting_id,
+                password=password,
+                zoom_link=zoom_link,
+                enabled=enabled,
+                recurrence=recurrence
+            ))
             
             if enabled and recurrence:
-                rec_type = recurrence.get('type', 'daily')
-                details = recurrence.get('details', {})
-                
-                trigger_args = {'hour': hour, 'minute': minute}
-                trigger_type = 'cron'
-                
-                # Setup End Date
-                end_date = None
-                if details and details.get('end_date'):
-                    end_date = datetime.fromisoformat(details.get('end_date'))
-                    trigger_args['end_date'] = end_date
-                
-                # Logic Trigger
-                if rec_type == 'once':
-                    trigger_type = 'date'
-                    run_date_iso = recurrence.get('run_date')
-                    if run_date_iso:
-                         trigger_args = {'run_date': datetime.fromisoformat(run_date_iso)}
-                    else:
-                         return # Invalid once config
-                         
-                elif rec_type == 'daily':
-                    pass # cron hour/min default
-                    
-                elif rec_type == 'weekly':
-                    dow = details.get('days_of_week', [0])
-                    dow_str = ",".join([str(d) for d in dow])
-                    trigger_args['day_of_week'] = dow_str
-                    
-                elif rec_type == 'weekdays':
-                    trigger_args['day_of_week'] = '0-4'
-                    
-                elif rec_type == 'custom':
-                    unit = details.get('unit', 'tuần')
-                    interval = details.get('interval', 1)
-                    
-                    if unit == 'ngày':
-                        trigger_type = 'interval'
-                        trigger_args = {
-                            'days': interval, 
-                            'start_date': datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        }
-                        if end_date: trigger_args['end_date'] = end_date
-                        
-                    elif unit == 'tuần':
-                        days = details.get('days_of_week', [])
-                        if days:
-                            dow_str = ",".join([str(d) for d in days])
-                            trigger_args['day_of_week'] = dow_str
-                        
-                    elif unit == 'tháng':
-                        pass
-
-                # Add Job
-                self.scheduler.add_job(
-                    self._open_zoom,
-                    trigger_type,
-                    id=job_id,
-                    args=[meeting_id, password, zoom_link],
-                    replace_existing=True,
-                    **trigger_args
-                )
+                trigger = self._acquire_trigger(job_id, hour, minute, recurrence)
+                if trigger is None:
+                    return # Invalid once config
+                self._register_job(job_id, trigger, meeting_id, password, zoom_link)
                 
             else:
+                self._release_trigger(job_id)
                 try:
                     self.scheduler.remove_job(job_id)
                 except: pass
@@ -548,7 +643,412 @@ class SchedulerManager:
             import traceback
             traceback.print_exc()
             return None
+
+    def add_schedules(self, records):
+        """Thêm/cập nhật nhiều lịch trong một lô (dùng khi khởi động và khi nhập lịch).
+
+        records: iterable các dict cùng dạng với bản ghi trong zoom_schedule.json
+        ('id' có thể bỏ trống để tạo mới). Scheduler chỉ bị đánh thức một lần sau
+        khi đăng ký xong cả lô và callback chỉ được gọi một lần.
+
+        Trả về {'added': [job_id, ...], 'errors': [(vị trí, job_id, thông báo), ...],
+        'anchored': [job_id, ...]} (anchored: lịch tùy chỉnh vừa được gán ngày bắt đầu,
+        cần lưu lại để chu kỳ không dời theo ngày tải)
+        """
+        report = {'added': [], 'errors': [], 'anchored': []}
+        self.scheduler.pause()
+        # Một mốc "now" cho cả lô: các job dùng chung trigger chỉ tính giờ chạy một lần
+        now = datetime.now().astimezone() if self.engine == 'apscheduler' else None
+        try:
+            for index, data in enumerate(records):
+                job_id = data.get('id') if isinstance(data, Mapping) else None
+                try:
+                    record = self._validate_record(data)
+                    job_id = record['id'] or new_job_id()
+                    record['id'] = job_id
+                    trigger = None
+                    if record['enabled'] and record['recurrence']:
+                        trigger = self._acquire_trigger(job_id, record['hour'], record['minute'], record['recurrence'])
+                    else:
+                        self._release_trigger(job_id)
+                    replaced = job_id in self.jobs
+                    self._put_record(job_id, record)
+                    if trigger:
+                        self._register_job(job_id, trigger, record['meeting_id'], record['password'],
+                                           record['zoom_link'], now=now)
+                    elif replaced:
+                        try:
+                            self.scheduler.remove_job(job_id)
+                        except: pass
+                    report['added'].append(job_id)
+                    if isinstance(data, Mapping) and self._needs_anchor(data.get('recurrence')):
+                        report['anchored'].append(job_id)
+                except Exception as e:
+                    report['errors'].append((index, job_id, str(e)))
+        finally:
+            self.scheduler.resume()
+
+        if self.callback:
+            message = f"✓ Đã cập nhật {len(report['added'])} lịch"
+            if report['errors']:
+                message += f" ({len(report['errors'])} lịch lỗi bị bỏ qua)"
+            self.callback(message)
+        return report
+
+    def sync_records(self, incoming, keep=()):
+        """Đồng bộ self.jobs theo nội dung mới của tệp lịch (do công cụ bên ngoài ghi).
+
+        Chỉ các lịch thêm/sửa được đăng ký lại và các lịch không còn trong tệp bị
+        xóa; lịch không đổi không bị động tới. keep: các id không được xóa (bản ghi
+        đọc lỗi). Lịch tùy chỉnh thiếu ngày bắt đầu giữ ngày của bản ghi hiện có, nên
+        không bị coi là "đã sửa" mỗi khi qua ngày. Trả về {'added', 'changed',
+        'removed', 'anchored': [job_id, ...], 'errors': [(job_id, thông báo), ...]}
+        (anchored: lịch mà tệp thiếu ngày bắt đầu, cần ghi lại để lưu ngày đó)
+        """
+        normalized, errors, anchored, keep = {}, [], [], set(keep)
+        for job_id, data in incoming.items():
+            anchor = None
+            if isinstance(data, Mapping) and self._needs_anchor(data.get('recurrence')):
+                anchor = self._start_date(self.jobs.get(job_id))
+            try:
+                record = self._validate_record({**data, 'id': job_id} if isinstance(data, Mapping) else data, anchor)
+            except Exception as e:
+                errors.append((job_id, str(e)))
+                keep.add(job_id)
+                continue
+            record['id'] = job_id
+            normalized[job_id] = record
+            if isinstance(data, Mapping) and self._needs_anchor(data.get('recurrence')):
+                anchored.append(job_id)
+        diff = diff_schedules(self.jobs, normalized, keep)
+        if diff['added'] or diff['changed']:
+            report = self.add_schedules(normalized[job_id] for job_id in diff['added'] + diff['changed'])
+            errors.extend((job_id, error) for _, job_id, error in report['errors'])
+        for job_id in diff['removed']:
+            self.remove_schedule(job_id)
+        return {**diff, 'anchored': anchored, 'errors': errors}
+
+    def _put_record(self, job_id, record):
+        """Ghi bản ghi vào self.jobs và cập nhật chỉ mục tìm kiếm"""
+        self.jobs[job_id] = record
+        if self._indexed_jobs is self.jobs:
+            self.search_index.put(job_id, record)
+
+    def _search(self):
+        # Lần đầu, hoặc self.jobs bị thay (load_indexed, gán trực tiếp): dựng lại chỉ mục
+        self.warm_search_index(budget=None)
+        return self.search_index
+
+    def warm_search_index(self, budget=0.01):
+        """Dựng chỉ mục tìm kiếm từng phần, mỗi lần gọi tối đa budget giây (None = dựng hết).
+
+        Gọi lặp lại từ QTimer lúc rảnh để lần gõ tìm kiếm đầu tiên không phải chờ dựng
+        cả chỉ mục. Trong lúc dựng dở, thêm/sửa/xóa lịch vẫn cập nhật thẳng vào chỉ mục.
+        Trả về True khi chỉ mục đã đủ.
+        """
+        if self._indexed_jobs is not self.jobs:
+            self.search_index.clear()
+            self._indexed_jobs = self.jobs
+            self._warm_ids = iter(list(self.jobs))
+        if self._warm_ids is None:
+            return True
+        deadline = time.perf_counter() + budget if budget is not None else None
+        # Snapshot mapping: read each record without keeping it decoded (the index keeps only keys)
+        read, put = getattr(self.jobs, 'peek', self.jobs.get), self.search_index.put
+        for job_id in self._warm_ids:
+            record = read(job_id)
+            if record is not None:
+                put(job_id, record)
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+        self._warm_ids = None
+        return True
+
+    def filter_schedules(self, query):
+        """Tập job_id khớp bộ lọc query (ScheduleQuery: chữ, loại lặp, bật/tắt); None nếu không lọc gì"""
+        return self._search().search(query)
+
+    def schedule_matches(self, job_id, query):
+        """Lịch job_id có khớp bộ lọc query không (kiểm tra một dòng vừa thay đổi)"""
+        return self._search().accepts(job_id, query)
+
+    def find_by_meeting(self, meeting_id):
+        """Các job_id mở cùng phòng (Meeting ID, hoặc link chứa Meeting ID đó)"""
+        return self._search().by_meeting(meeting_id)
+
+    def find_by_link(self, zoom_link):
+        """Các job_id có cùng link Zoom (so sánh sau khi chuẩn hóa)"""
+        return self._search().by_link(zoom_link)
+
+    def find_by_name(self, prefix, limit=None):
+        """Các job_id có tên bắt đầu bằng prefix (không phân biệt hoa thường, dấu), theo thứ tự tên"""
+        return self._search().by_name_prefix(prefix, limit)
+
+    def duplicate_meetings(self):
+        """{meeting id: [job_id, ...]} cho các phòng được nhiều lịch cùng dùng"""
+        return self._search().duplicates()
+
+    def duplicate_stats(self, top=10):
+        """Thống kê trùng lặp: số phòng, số phòng/lịch dùng chung, top phòng nhiều lịch nhất
+        và số chuỗi (link, Meeting ID, mật khẩu, tên) được dùng chung thay vì sao chép"""
+        index = self._search()
+        return {**index.stats(), 'top': index.top_meetings(top), 'strings': intern_stats(self.jobs.values())}
+
+    def _validate_record(self, data, anchor=None):
+        """Kiểm tra một bản ghi lịch, trả về bản ghi đã chuẩn hóa hoặc raise ValueError.
+
+        anchor: ngày bắt đầu cho lịch tùy chỉnh chưa có (mặc định hôm nay)
+        """
+        if not isinstance(data, Mapping):
+            raise ValueError("Bản ghi không phải object")
+        hour, minute = data.get('hour'), data.get('minute')
+        if not isinstance(hour, int) or isinstance(hour, bool) or not 0 <= hour <= 23:
+            raise ValueError(f"Giờ không hợp lệ: {hour!r}")
+        if not isinstance(minute, int) or isinstance(minute, bool) or not 0 <= minute <= 59:
+            raise ValueError(f"Phút không hợp lệ: {minute!r}")
+
+        recurrence = data.get('recurrence')
+        if recurrence is not None:
+            if not isinstance(recurrence, Mapping):
+                raise ValueError("recurrence phải là object")
+            rec_type = recurrence.get('type', 'daily')
+            if rec_type not in self.RECURRENCE_TYPES:
+                raise ValueError(f"Kiểu lặp lại không hợp lệ: {rec_type!r}")
+            if rec_type == 'once':
+                if not recurrence.get('run_date'):
+                    raise ValueError("Lịch 'Một lần' thiếu run_date")
+                datetime.fromisoformat(recurrence['run_date'])
+            details = recurrence.get('details') or {}
+            if details.get('end_date'):
+                datetime.fromisoformat(details['end_date'])
+            if details.get('start_date'):
+                datetime.fromisoformat(details['start_date'])
+            recurrence = as_recurrence(self._ensure_anchor(recurrence, anchor))
+
+        return ScheduleEntry(
+            id=data.get('id'),
+            name=data.get('name', ''),
+            hour=hour,
+            minute=minute,
+            meeting_id=data.get('meeting_id', ''),
+            password=data.get('password', ''),
+            zoom_link=data.get('zoom_link', ''),
+            enabled=bool(data.get('enabled', True)),
+            recurrence=recurrence
+        )
+
+    @staticmethod
+    def _needs_anchor(recurrence):
+        """Lịch tùy chỉnh chưa có ngày bắt đầu"""
+        return (isinstance(recurrence, Mapping) and recurrence.get('type') == 'custom'
+                and not (recurrence.get('details') or {}).get('start_date'))
+
+    @staticmethod
+    def _start_date(record):
+        """Ngày bắt đầu đã lưu của lịch tùy chỉnh (None nếu không có)"""
+        recurrence = record.get('recurrence') if record else None
+        if not recurrence or recurrence.get('type') != 'custom':
+            return None
+        return (recurrence.get('details') or {}).get('start_date')
+
+    def _ensure_anchor(self, recurrence, anchor=None):
+        """Lịch tùy chỉnh cần ngày bắt đầu cố định để đếm chu kỳ (mỗi N ngày/tuần/tháng/năm).
+
+        Thiếu thì dùng anchor (mặc định hôm nay). Không sửa recurrence truyền vào
+        (có thể là dict của người gọi hoặc Recurrence dùng chung): trả về bản mới.
+        """
+        if self._needs_anchor(recurrence):
+            start = anchor or date.today().isoformat()
+            if isinstance(recurrence, Recurrence):
+                return recurrence.with_details(start_date=start)
+            return {**recurrence, 'details': {**(recurrence.get('details') or {}), 'start_date': start}}
+        return recurrence
+
+    def _build_trigger(self, hour, minute, recurrence):
+        """Chuyển cấu hình lặp lại thành (trigger_type, trigger_args); None nếu lịch 'once' thiếu ngày"""
+        rec_type = recurrence.get('type', 'daily')
+        details = recurrence.get('details', {})
+        
+        trigger_args = {'hour': hour, 'minute': minute}
+        trigger_type = 'cron'
+        
+        # Setup End Date
+        end_date = None
+        if details and details.get('end_date'):
+            end_date = datetime.fromisoformat(details.get('end_date'))
+            trigger_args['end_date'] = end_date
+        
+        # Ngày bị loại trừ (EXDATE khi nhập từ .ics): cron không biểu diễn được
+        if details and details.get('exclude_dates') and rec_type != 'once':
+            return 'bitmask', {'recurrence': recurrence, 'hour': hour, 'minute': minute}
+
+        # Logic Trigger
+        if rec_type == 'once':
+            trigger_type = 'date'
+            run_date_iso = recurrence.get('run_date')
+            if run_date_iso:
+                 trigger_args = {'run_date': datetime.fromisoformat(run_date_iso)}
+            else:
+                 return None # Invalid once config
+                 
+        elif rec_type == 'daily':
+            pass # cron hour/min default
+            
+        elif rec_type == 'weekly':
+            dow = details.get('days_of_week', [0])
+            dow_str = ",".join([str(d) for d in dow])
+            trigger_args['day_of_week'] = dow_str
+            
+        elif rec_type == 'weekdays':
+            trigger_args['day_of_week'] = '0-4'
+            
+        elif rec_type == 'custom':
+            unit = details.get('unit', 'tuần')
+            interval = details.get('interval', 1)
+            
+            anchor = date.fromisoformat(details['start_date'][:10]) if details.get('start_date') else date.today()
+            
+            if unit == 'ngày':
+                trigger_type = 'interval'
+                trigger_args = {
+                    'days': interval, 
+                    'start_date': datetime.combine(anchor, datetime.min.time()).replace(hour=hour, minute=minute)
+                }
+                if end_date: trigger_args['end_date'] = end_date
+                
+            elif unit == 'tuần' and interval == 1 and anchor <= date.today():
+                days = details.get('days_of_week', [])
+                if days:
+                    dow_str = ",".join([str(d) for d in days])
+                    trigger_args['day_of_week'] = dow_str
+                
+            else:
+                # Mỗi N tuần, hàng tháng, hàng năm, hoặc hàng tuần bắt đầu từ một ngày
+                # trong tương lai: cron không biểu diễn được, dùng trigger bitmask
+                # theo ngày trong năm (xem recurrence.py)
+                trigger_type = 'bitmask'
+                trigger_args = {'recurrence': recurrence, 'hour': hour, 'minute': minute}
+
+        return trigger_type, trigger_args
+
+    def _trigger_signature(self, hour, minute, recurrence):
+        """Khóa chuẩn hóa (kiểu lặp, chi tiết, giờ, phút, ngày kết thúc) để dùng chung trigger"""
+        rec_type = recurrence.get('type', 'daily')
+        details = recurrence.get('details') or {}
+        if rec_type == 'once':
+            detail_key = recurrence.get('run_date')
+        elif rec_type == 'weekly':
+            detail_key = tuple(sorted(details.get('days_of_week', [0])))
+        elif rec_type == 'custom':
+            detail_key = (details.get('unit', 'tuần'), details.get('interval', 1),
+                          tuple(sorted(details.get('days_of_week') or [])), details.get('start_date'))
+        else:
+            detail_key = None
+        return (rec_type, detail_key, hour, minute, details.get('end_date'),
+                tuple(details.get('exclude_dates') or ()))
+
+    def _acquire_trigger(self, job_id, hour, minute, recurrence):
+        """Lấy trigger dùng chung cho job (biên dịch nếu chưa có trong cache)"""
+        with self._lock:
+            return self._acquire_trigger_locked(job_id, hour, minute, recurrence)
+
+    def _acquire_trigger_locked(self, job_id, hour, minute, recurrence):
+        key = self._trigger_signature(hour, minute, recurrence)
+        if self._trigger_keys.get(job_id) == key:
+            # Job đã giữ đúng trigger này (ví dụ sửa tên, bật lại): không tăng tham chiếu
+            trigger = self.trigger_cache.get(key)
+            if trigger is not None:
+                return trigger
+        trigger = self.trigger_cache.acquire(key, lambda: self._build_trigger(hour, minute, recurrence))
+        self._release_trigger(job_id)
+        if trigger is not None:
+            self._trigger_keys[job_id] = key
+        return trigger
+
+    def _release_trigger(self, job_id):
+        with self._lock:
+            self._cold.pop(job_id, None)
+            key = self._trigger_keys.pop(job_id, None)
+            if key is not None:
+                self.trigger_cache.release(key)
+
+    def _compiled_rule(self, job_data):
+        """Quy tắc lặp đã biên dịch (bitmask theo năm), dùng chung theo chữ ký lặp lại"""
+        recurrence = job_data.get('recurrence')
+        if not recurrence:
+            return None
+        key = self._trigger_signature(job_data['hour'], job_data['minute'], recurrence)
+        rule = self._compiled.get(key)
+        if rule is None:
+            if len(self._compiled) >= 4096:
+                self._compiled.clear()
+            rule = self._compiled[key] = compile_recurrence(recurrence, job_data['hour'], job_data['minute'])
+        return rule
+
+    def fires_on(self, job_id, day):
+        """Lịch có chạy vào ngày `day` không (bỏ qua trạng thái bật/tắt)"""
+        job_data = self.jobs.get(job_id)
+        rule = self._compiled_rule(job_data) if job_data else None
+        return bool(rule and rule.fires_on(day))
+
+    def next_fire_time(self, job_id, after=None):
+        """Thời điểm chạy kế tiếp sau `after` (mặc định: bây giờ); None nếu lịch tắt hoặc đã hết"""
+        job_data = self.jobs.get(job_id)
+        if not job_data or not job_data.get('enabled', True):
+            return None
+        rule = self._compiled_rule(job_data)
+        return rule.next_fire_after(after or datetime.now()) if rule else None
+
+    def trigger_cache_stats(self):
+        """Số liệu cache trigger: hits/misses khi biên dịch và khi tính giờ chạy kế tiếp"""
+        return self.trigger_cache.stats()
+
+    def _register_job(self, job_id, trigger, meeting_id, password, zoom_link, now=None):
+        """Đăng ký (hoặc thay thế) job trong scheduler; ở chế độ cửa sổ, lịch chạy
+        ngoài cửa sổ được cất vào hàng đợi lạnh thay vì đăng ký"""
+        if self.horizon and not self._within_horizon(job_id, trigger, now):
+            return
+        self._add_live_job(job_id, trigger, meeting_id, password, zoom_link, now)
+
+    def _add_live_job(self, job_id, trigger, meeting_id, password, zoom_link, now=None):
+        job_kwargs = {}
+        if now is not None:
+            job_kwargs['next_run_time'] = trigger.get_next_fire_time(None, now)
+        self.scheduler.add_job(
+            self._fire,
+            trigger,
+            id=job_id,
+            args=[meeting_id, password, zoom_link],
+            kwargs={'job_id': job_id},
+            replace_existing=True,
+            **job_kwargs
+        )
     
+    def _fire(self, meeting_id, password, zoom_link="", job_id=None):
+        """Được scheduler gọi khi lịch đến hạn: đưa vào lô hoặc mở ngay"""
+        record = self.launch_metrics.start(job_id)
+        if self.dispatcher:
+            self.dispatcher.submit(meeting_id, password, zoom_link, record)
+        else:
+            self._launch(meeting_id, password, zoom_link, record)
+
+    def _launch(self, meeting_id, password, zoom_link, record):
+        """Mở Zoom và ghi lại thời điểm webbrowser.open trả về"""
+        try:
+            self._open_zoom(meeting_id, password, zoom_link)
+        except Exception as e:
+            self.launch_metrics.finish(record, error=str(e))
+            raise
+        self.launch_metrics.finish(record)
+
+    def dispatch_stats(self):
+        """Thống kê các lô mở Zoom (None nếu không bật gom lô)"""
+        return self.dispatcher.stats() if self.dispatcher else None
+
+    def latency_stats(self):
+        """Độ trễ mở Zoom (giây): p50/p95/p99 của pickup_lag, open_duration, lag và số lần bị bỏ lỡ"""
+        return self.launch_metrics.summary()
+
     def _open_zoom(self, meeting_id, password, zoom_link=""):
         """Mở Zoom"""
         print(f"[LOG] Scheduler trigger: Mở Zoom lúc {datetime.now().strftime('%H:%M:%S')}")
@@ -565,7 +1065,7 @@ class SchedulerManager:
                 url = f"https://us06web.zoom.us/j/{meeting_id}"
             print(f"[LOG] Opening HTTPS URL: {url}")
             
-        webbrowser.open(url)
+        open_url(url)
         if self.callback:
             self.callback(f"✓ Đã mở Zoom: {meeting_id if meeting_id else 'Link'}")
     
@@ -589,7 +1089,10 @@ class SchedulerManager:
                 except:
                     pass
                     
+                self._release_trigger(job_id)
                 del self.jobs[job_id]
+                if self._indexed_jobs is self.jobs:
+                    self.search_index.discard(job_id)
                 return True
         except Exception as e:
             print(f"Lỗi xóa lịch: {e}")
@@ -599,10 +1102,10 @@ class SchedulerManager:
         """Bật/tắt lịch"""
         try:
             if job_id in self.jobs:
-                self.jobs[job_id]['enabled'] = enabled
                 job_data = self.jobs[job_id]
                 
-                # Gọi lại add_schedule để cập nhật trạng thái trong scheduler
+                # Gọi lại add_schedule để cập nhật trạng thái trong scheduler; add_schedule
+                # thay bằng bản ghi mới, không sửa bản ghi cũ (có thể đang được luồng ghi đọc)
                 self.add_schedule(
                     job_id,
                     job_data['hour'],
@@ -630,10 +1133,184 @@ class SchedulerManager:
         """Lấy tất cả lịch"""
         return self.jobs
     
+    REFILL_JOB_ID = '__refill__'
+    REFILL_LEAD = 60  # giây: nạp lô kế tiếp trước giờ chạy của lịch đầu tiên chưa đăng ký
+
+    def load_indexed(self, records, index, arm_limit=256):
+        """Khởi động từ snapshot nhị phân + chỉ mục giờ chạy (schedule_index).
+
+        Chỉ arm_limit lịch có giờ chạy sớm nhất được đăng ký ngay; self.jobs đọc
+        thẳng từ snapshot (giải mã khi cần), nên thời gian khởi động không phụ
+        thuộc số lịch trên đĩa. Các lịch còn lại được đăng ký dần bởi job nội bộ
+        '__refill__' trước khi tới giờ; các lịch đã quá hạn trong lúc ứng dụng
+        tắt (chỉ mục cũ) được tính lại giờ ở thread nền.
+
+        records: LazyRecords của snapshot; index: FireIndex của cùng snapshot.
+        """
+        self.jobs = OverlayJobs(records)
+        self._records = records
+        self._arm_limit = max(1, int(arm_limit))
+        stale = index.first_at_or_after(time.time())
+        with self._lock:
+            self._arm_queue = ArmQueue(index, stale)
+            armed = self._arm_next()
+        if stale:
+            threading.Thread(target=self._catch_up, args=(stale,), name="index-catch-up", daemon=True).start()
+        return {'armed': armed, 'pending': len(self._arm_queue), 'stale': stale}
+
+    def _arm_next(self):
+        """Đăng ký lô kế tiếp từ hàng đợi chỉ mục và hẹn lần nạp sau"""
+        with self._lock:
+            queue = self._arm_queue
+            if queue is None:
+                return 0
+            armed = 0
+            while armed < self._arm_limit:
+                entry = queue.pop()
+                if entry is None:
+                    break
+                ts, position = entry
+                if self._arm_position(position):
+                    armed += 1
+                self._armed_until = ts
+            self._schedule_refill()
+            return armed
+
+    def _arm_position(self, position):
+        record = self._records.at(position)
+        job_id = record['id']
+        # Lịch đã sửa/xóa sau khi tải (đã tự đăng ký lại) hoặc đã được đăng ký: bỏ qua
+        if self.jobs.touched(job_id) or job_id in self._trigger_keys:
+            return False
+        trigger = self._acquire_trigger(job_id, record['hour'], record['minute'], record['recurrence'])
+        if trigger is None:
+            return False
+        self._register_job(job_id, trigger, record['meeting_id'], record['password'], record['zoom_link'])
+        return True
+
+    def _schedule_refill(self):
+        next_ts = self._arm_queue.peek_time()
+        if next_ts is None:
+            try:
+                self.scheduler.remove_job(self.REFILL_JOB_ID)
+            except Exception:
+                pass
+            return
+        run_at = max(datetime.now() + timedelta(seconds=1), datetime.fromtimestamp(next_ts - self.REFILL_LEAD))
+        self.scheduler.add_job(self._arm_next, 'date', run_date=run_at, id=self.REFILL_JOB_ID,
+                               replace_existing=True)
+
+    def _catch_up(self, stale):
+        """Tính lại giờ chạy cho các lịch mà chỉ mục ghi nhận đã qua (ứng dụng tắt lúc đó)"""
+        queue = self._arm_queue
+        now = datetime.now()
+        for i in range(stale):
+            position = queue.index.positions[i]
+            try:
+                job_data = self._records.at(position)
+                rule = self._compiled_rule(job_data)
+                fire = rule.next_fire_after(now) if rule else None
+            except Exception as e:
+                print(f"[INDEX] Bỏ qua bản ghi {position}: {e}")
+                continue
+            if fire is None:
+                continue
+            with self._lock:
+                if self._armed_until is not None and fire.timestamp() <= self._armed_until:
+                    self._arm_position(position)
+                else:
+                    queue.push(int(fire.timestamp()), position)
+        with self._lock:
+            self._schedule_refill()
+
+    HORIZON_JOB_ID = '__horizon__'
+    HORIZON_MAX_PERIOD = 3600  # giây: chu kỳ tối đa của job nạp cửa sổ
+
+    def _within_horizon(self, job_id, trigger, now=None):
+        """True nếu lịch chạy trong cửa sổ; nếu không, đưa lịch vào hàng đợi lạnh"""
+        # Hỏi trigger dùng chung (đã nhớ kết quả theo `now`) thay vì biên dịch lại quy tắc
+        if self.engine == 'heap':
+            fire = trigger.next_fire_time(now or datetime.now())
+        else:
+            fire = trigger.get_next_fire_time(None, now or datetime.now().astimezone())
+        with self._lock:
+            self._cold.pop(job_id, None)
+            # Không tính được giờ chạy: để scheduler tự quyết như trước
+            if fire is None or fire.timestamp() <= time.time() + self.horizon:
+                return True
+            self._park(job_id, fire.timestamp())
+        try:
+            self.scheduler.remove_job(job_id)
+        except Exception:
+            pass
+        return False
+
+    def _park(self, job_id, ts):
+        # Caller giữ self._lock
+        self._cold[job_id] = ts
+        heapq.heappush(self._cold_heap, (ts, job_id))
+
+    def _horizon_period(self):
+        # Mỗi lịch vào cửa sổ được đăng ký sớm ít nhất horizon/2 trước giờ chạy
+        return max(1.0, min(self.horizon / 2, self.HORIZON_MAX_PERIOD))
+
+    def _schedule_horizon_refill(self):
+        run_at = datetime.now() + timedelta(seconds=self._horizon_period())
+        self.scheduler.add_job(self._refill_horizon, 'date', run_date=run_at, id=self.HORIZON_JOB_ID,
+                               replace_existing=True)
+
+    def _refill_horizon(self):
+        """Job nội bộ chạy định kỳ ở chế độ cửa sổ: đăng ký các lịch vừa vào cửa sổ
+        và cất lại các lịch đã chạy xong mà lần kế tiếp nằm ngoài cửa sổ.
+
+        Chi phí tỉ lệ với số lịch đang đăng ký + số lịch được đưa vào, không phụ
+        thuộc tổng số lịch. Trả về {'promoted': n, 'demoted': n}.
+        """
+        limit = time.time() + self.horizon
+        promoted = demoted = 0
+        try:
+            with self._lock:
+                heap = self._cold_heap
+                while heap and heap[0][0] <= limit:
+                    ts, job_id = heapq.heappop(heap)
+                    if self._cold.get(job_id) != ts:
+                        continue  # lịch đã bị sửa/xóa/tắt sau khi cất
+                    del self._cold[job_id]
+                    record = self.jobs.get(job_id)
+                    trigger = self.trigger_cache.get(self._trigger_keys.get(job_id))
+                    if record is None or trigger is None:
+                        continue
+                    self._add_live_job(job_id, trigger, record['meeting_id'], record['password'],
+                                       record.get('zoom_link', ''))
+                    promoted += 1
+                for job in self.scheduler.get_jobs():
+                    if job.id not in self._trigger_keys or job.next_run_time is None:
+                        continue
+                    ts = job.next_run_time.timestamp()
+                    if ts > limit:
+                        self.scheduler.remove_job(job.id)
+                        self._park(job.id, ts)
+                        demoted += 1
+                if len(heap) > 2 * len(self._cold) + 64:
+                    self._cold_heap = [(ts, job_id) for job_id, ts in self._cold.items()]
+                    heapq.heapify(self._cold_heap)
+        finally:
+            if self.scheduler.running:
+                self._schedule_horizon_refill()
+        return {'promoted': promoted, 'demoted': demoted}
+
+    def horizon_stats(self):
+        """Số lịch đang đăng ký với scheduler và số lịch đang nằm trong hàng đợi lạnh"""
+        with self._lock:
+            live = sum(1 for job in self.scheduler.get_jobs() if job.id in self._trigger_keys)
+            return {'horizon': self.horizon, 'live': live, 'cold': len(self._cold)}
+
     def stop(self):
         """Dừng scheduler"""
         if self.scheduler.running:
             self.scheduler.shutdown()
+        if self.dispatcher:
+            self.dispatcher.stop()
 
     def _show_reminder(self, meeting_id, hour, minute):
         msg = f"Sắp đến giờ mở Zoom: {meeting_id} vào lúc {hour:02d}:{minute:02d}"
@@ -682,6 +1359,12 @@ class TestZoomDialog(QDialog):
         layout.addRow(button_layout)
         
         self.setLayout(layout)
+
+    def reset(self):
+        """Xóa nội dung đã nhập lần trước"""
+        self.url_input.clear()
+        self.password_input.clear()
+        self.url_input.setFocus()
     
     def open_https_url(self):
         """Mở URL HTTPS"""
@@ -691,7 +1374,7 @@ class TestZoomDialog(QDialog):
         
         # Nếu là URL hoặc Meeting ID
         if url.startswith('http'):
-            webbrowser.open(url)
+            open_url(url)
         else:
             # Nếu là Meeting ID, tạo URL
             pwd = self.password_input.text().strip()
@@ -699,7 +1382,7 @@ class TestZoomDialog(QDialog):
                 url = f"https://us06web.zoom.us/j/{url}?pwd={pwd}"
             else:
                 url = f"https://us06web.zoom.us/j/{url}"
-            webbrowser.open(url)
+            open_url(url)
         
         print(f"[DEBUG] Mở HTTPS: {url}")
     
@@ -715,7 +1398,7 @@ class TestZoomDialog(QDialog):
         if password:
             url += f"&pwd={password}"
         
-        webbrowser.open(url)
+        open_url(url)
         print(f"[DEBUG] Mở zoommtg: {url}")
 
 
@@ -769,7 +1452,7 @@ class HelpDialog(QDialog):
         header_layout.addStretch()
         
         # === TAB WIDGET ===
-        tab_widget = QTabWidget()
+        tab_widget = self.tab_widget = QTabWidget()
         tab_widget.setStyleSheet("""
             QTabWidget::pane {
                 border: none;
@@ -794,21 +1477,19 @@ class HelpDialog(QDialog):
             }
         """)
         
-        # Tab 1: Bắt đầu nhanh
-        quick_start = self.create_quick_start_tab()
-        tab_widget.addTab(quick_start, "🚀 Bắt đầu nhanh")
-        
-        # Tab 2: Quản lý lịch
-        manage_tab = self.create_manage_tab()
-        tab_widget.addTab(manage_tab, "📅 Quản lý lịch")
-        
-        # Tab 3: Cài đặt Zoom
-        zoom_settings = self.create_zoom_settings_tab()
-        tab_widget.addTab(zoom_settings, "⚙️ Cài đặt Zoom")
-        
-        # Tab 4: FAQ
-        faq_tab = self.create_faq_tab()
-        tab_widget.addTab(faq_tab, "❓ Câu hỏi thường gặp")
+        # Chỉ dựng nội dung tab đầu; các tab khác dựng ở lần đầu được mở
+        self.tab_builders = {}
+        tabs = ((self.create_quick_start_tab, "🚀 Bắt đầu nhanh"),       # Tab 1: Bắt đầu nhanh
+                (self.create_manage_tab, "📅 Quản lý lịch"),             # Tab 2: Quản lý lịch
+                (self.create_zoom_settings_tab, "⚙️ Cài đặt Zoom"),      # Tab 3: Cài đặt Zoom
+                (self.create_faq_tab, "❓ Câu hỏi thường gặp"))          # Tab 4: FAQ
+        for builder, label in tabs:
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_builders[tab_widget.addTab(page, label)] = builder
+        self.build_tab(0)
+        tab_widget.currentChanged.connect(self.build_tab)
         
         # === FOOTER ===
         footer = QWidget()
@@ -843,6 +1524,16 @@ class HelpDialog(QDialog):
         main_layout.addWidget(footer)
         
         self.setLayout(main_layout)
+
+    def build_tab(self, index):
+        """Dựng nội dung tab index nếu chưa dựng"""
+        builder = self.tab_builders.pop(index, None)
+        if builder:
+            self.tab_widget.widget(index).layout().addWidget(builder())
+
+    def reset(self):
+        """Mở lại luôn ở tab đầu"""
+        self.tab_widget.setCurrentIndex(0)
     
     def create_quick_start_tab(self):
         """Tab bắt đầu nhanh"""
@@ -1430,12 +2121,13 @@ class AboutDialog(QDialog):
 
 class ScheduleDialog(QDialog):
     """Dialog để thêm lịch mới"""
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, dialogs=None):
         super().__init__(parent)
         self.setWindowTitle("Thêm lịch Zoom")
         self.resize(550, 600)
         
         self.custom_recurrence_data = None # Store custom data
+        self.dialogs = dialogs  # DialogCache: dùng lại CustomRecurrenceDialog thay vì dựng mới
         
         # Modern styling
         self.setStyleSheet("""
@@ -1719,6 +2411,25 @@ class ScheduleDialog(QDialog):
 
         # Nếu hợp lệ, gọi phương thức accept gốc
         super().accept()
+
+    def reset(self):
+        """Về trạng thái "Thêm lịch" trống như khi vừa tạo (dialog được dùng lại giữa các lần mở)"""
+        self.custom_recurrence_data = None
+        for field in (self.name_input, self.link_input, self.meeting_id_input, self.password_input):
+            field.clear()
+        self.hour_combo.setCurrentText("08")
+        self.minute_combo.setCurrentText("00")
+        # Ngày hôm nay có thể đã khác lúc dựng dialog
+        today = QDate.currentDate()
+        self.recurrence_options[2] = f"Hàng tuần vào thứ {WEEKDAYS_MAP[today.dayOfWeek() - 1]}"
+        self.recurrence_combo.blockSignals(True)
+        self.recurrence_combo.setItemText(2, self.recurrence_options[2])
+        self.recurrence_combo.setCurrentIndex(0)
+        self.recurrence_combo.blockSignals(False)
+        self.date_edit.setMinimumDate(today)
+        self.date_edit.setDate(today)
+        self.on_recurrence_changed()
+        self.name_input.setFocus()
     
     def on_recurrence_changed(self):
         text = self.recurrence_combo.currentText()
@@ -1730,7 +2441,7 @@ class ScheduleDialog(QDialog):
         
         # Handle Custom
         if text == "Tùy chỉnh...":
-            dialog = CustomRecurrenceDialog(self)
+            dialog = self.dialogs.open('recurrence') if self.dialogs else CustomRecurrenceDialog(self)
             if self.custom_recurrence_data:
                 dialog.set_data(self.custom_recurrence_data)
                 
@@ -1793,7 +2504,7 @@ class ScheduleDialog(QDialog):
         self.hour_combo.setCurrentText(f"{data.get('hour', 8):02d}")
         self.minute_combo.setCurrentText(f"{data.get('minute', 0):02d}")
         
-        recurrence = data.get('recurrence', {})
+        recurrence = data.get('recurrence') or {}
         rec_type = recurrence.get('type')
         details = recurrence.get('details', {})
         
@@ -1831,18 +2542,102 @@ class ScheduleDialog(QDialog):
 
 class ZoomAutoApp(QMainWindow):
     """Ứng dụng chính"""
-    def __init__(self):
+    # Phát một lần khi ứng dụng sẵn sàng thao tác, kèm StartupTimer.report()
+    startup_finished = pyqtSignal(dict)
+
+    def __init__(self, startup=None):
         super().__init__()
+        # Các pha khởi động; main() truyền STARTUP (tính cả pha import)
+        self.startup = startup or StartupTimer()
         self.setWindowTitle(f"🎯 Zoom Auto Scheduler v{APP_VERSION} - Hẹn Giờ Tự Động")
         self.setGeometry(100, 100, 1200, 700)
         self.setWindowIcon(QIcon(str(Path(__file__).parent / "app.ico")))
+        self.config = load_app_config()
         # Khởi tạo scheduler (trước khi UI để tránh lỗi callback)
-        self.scheduler = SchedulerManager(callback=self.show_message, parent_window=self)
+        self.scheduler = SchedulerManager(
+            callback=self.show_message, parent_window=self,
+            engine=self.config.get('engine', 'apscheduler'),
+            coalesce_window=self.config.get('launch_coalesce_window', 0),
+            launch_concurrency=self.config.get('launch_concurrency', 4),
+            launch_stagger=self.config.get('launch_stagger', 0.5),
+            horizon=self.config.get('schedule_horizon_hours', 0) * 3600
+        )
+        self.startup.mark('scheduler')
+        self.store = open_store(self.config.get('store', 'json'), SCHEDULE_FILE, SCHEDULE_DB,
+                                journal_max_bytes=self.config.get('journal_max_bytes', 1 << 20))
+        # Các dialog chỉ dựng một lần (dựng sẵn lúc rảnh sau khi khởi động) và được dùng lại
+        self.dialogs = DialogCache(self)
+        self.dialogs.register('schedule', lambda: ScheduleDialog(self, dialogs=self.dialogs))
+        self.dialogs.register('recurrence', lambda: CustomRecurrenceDialog(self.dialogs.get('schedule')))
+        self.dialogs.register('help', lambda: HelpDialog(self))
+        self.dialogs.register('about', lambda: AboutDialog(self))
+        self.dialogs.register('test_zoom', lambda: TestZoomDialog(self))
         # Tạo UI trước
         self.init_ui()
-        # Tải lịch SAU khi UI sẵn sàng
-        self.load_schedules()
-        self.refresh_table()
+        self.startup.mark('ui')
+        # Tải lịch SAU khi cửa sổ đã hiện: paintEvent đầu tiên hẹn finish_startup
+        self.persister = None
+        self.watcher = None
+        self.loaded = False
+        self._load_posted = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._load_posted:
+            self._load_posted = True
+            self.startup.mark('first_paint')
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Tải lịch rồi bật các tác vụ nền; chạy một lần, ngay sau lần vẽ cửa sổ đầu tiên
+        (gọi trực tiếp nếu cần lịch khi cửa sổ chưa hiện)"""
+        if self.loaded:
+            return
+        self.loaded = True
+        self._load_posted = True
+        # Tiến độ tải gọi processEvents: chặn thao tác cho tới khi tải xong
+        self.setEnabled(False)
+        self.show_message("⏳ Đang tải lịch…")
+        try:
+            self.load_schedules()
+            if self.config.get('save_debounce', 0) > 0:
+                self.persister = WriteBehindPersister(self.store, self.scheduler.get_all_jobs(),
+                                                      window=self.config['save_debounce'])
+            self.refresh_table()
+        finally:
+            self.setEnabled(True)
+        if self.status_label.text().startswith("⏳"):
+            self.show_message("✓ Ứng dụng đang chạy...")
+        self.startup.mark('load')
+        # Dựng chỉ mục tìm kiếm dần lúc rảnh: lần gõ đầu tiên vào thanh lọc không phải chờ;
+        # xong thì dựng sẵn các dialog
+        self.warm_timer = QTimer(self)
+        self.warm_timer.timeout.connect(self._warm_search_index)
+        self.warm_timer.start(0)
+        # Theo dõi zoom_schedule.json do công cụ bên ngoài ghi (chỉ với kho JSON)
+        interval = self.config.get('watch_interval', 0)
+        if interval and interval > 0 and self.store.kind == 'json':
+            self.watcher = ScheduleFileWatcher(SCHEDULE_FILE, ignore_digest=lambda: self.store.last_written_digest)
+            self.watch_timer = QTimer(self)
+            self.watch_timer.timeout.connect(self.check_external_changes)
+            self.watch_timer.start(int(interval * 1000))
+        # Sẵn sàng khi vòng lặp sự kiện rảnh lần đầu sau khi tải (bảng đã vẽ lại với dữ liệu)
+        QTimer.singleShot(0, self._startup_interactive)
+
+    def _startup_interactive(self):
+        """Ghi nhận thời gian tới lúc dùng được, so với startup_budget_ms trong app_config.json"""
+        self.startup.interactive()
+        report = self.startup.report()
+        print(f"[STARTUP] {self.startup.summary()}")
+        for name, (took, limit) in over_budget(report, self.config.get('startup_budget_ms') or {}).items():
+            print(f"[STARTUP] Vượt ngân sách {name}: {took:.0f} ms > {limit:.0f} ms")
+        # Kiểm tra cập nhật nền (không chặn UI)
+        try:
+            import updater
+            updater.maybe_check_on_startup(self)
+        except Exception as _e:
+            pass
+        self.startup_finished.emit(report)
     
     def init_ui(self):
         """Khởi tạo giao diện"""
@@ -1914,8 +2709,24 @@ class ZoomAutoApp(QMainWindow):
                 background: #075985;
             }
             
+            /* Filter Bar */
+            QLineEdit#filterText, QComboBox#filterType, QComboBox#filterEnabled {
+                background-color: white;
+                border: 1px solid #cbd5e1;
+                border-radius: 6px;
+                padding: 6px 10px;
+                font-size: 13px;
+            }
+            QLineEdit#filterText:focus {
+                border-color: #0ea5e9;
+            }
+            QLabel#filterCount {
+                color: #64748b;
+                font-size: 12px;
+            }
+
             /* Table Styling */
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #cbd5e1;
                 border-radius: 10px;
@@ -1924,12 +2735,12 @@ class ZoomAutoApp(QMainWindow):
                 font-size: 13px;
             }
             
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #f1f5f9;
             }
             
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #dbeafe;
                 color: #0f172a;
             }
@@ -1959,7 +2770,7 @@ class ZoomAutoApp(QMainWindow):
             }
             
             /* Table Buttons */
-            QTableWidget QPushButton {
+            QTableView QPushButton {
                 background-color: #f1f5f9;
                 color: #475569;
                 border: 1px solid #cbd5e1;
@@ -1969,12 +2780,12 @@ class ZoomAutoApp(QMainWindow):
                 padding: 6px 12px;
             }
             
-            QTableWidget QPushButton:hover {
+            QTableView QPushButton:hover {
                 background-color: #e2e8f0;
                 border-color: #94a3b8;
             }
             
-            QTableWidget QPushButton:pressed {
+            QTableView QPushButton:pressed {
                 background-color: #cbd5e1;
             }
             
@@ -2061,6 +2872,11 @@ class ZoomAutoApp(QMainWindow):
         
         # Create Menu Bar
         menu_bar = self.menuBar()
+        file_menu = menu_bar.addMenu("Tệp")
+
+        import_action = file_menu.addAction("Nhập lịch từ CSV / iCalendar…")
+        import_action.triggered.connect(self.import_schedules)
+
         help_menu = menu_bar.addMenu("Trợ giúp")
 
         about_action = help_menu.addAction("Giới thiệu")
@@ -2072,6 +2888,14 @@ class ZoomAutoApp(QMainWindow):
         update_action = help_menu.addAction("Kiểm tra cập nhật…")
         update_action.triggered.connect(self.check_updates)
 
+        latency_action = help_menu.addAction("Độ trễ mở Zoom…")
+        latency_action.triggered.connect(self.show_latency_stats)
+        dialog_latency_action = help_menu.addAction("Độ trễ mở hộp thoại…")
+        dialog_latency_action.triggered.connect(self.show_dialog_stats)
+
+        duplicate_action = help_menu.addAction("Phòng Zoom dùng chung…")
+        duplicate_action.triggered.connect(self.show_duplicate_stats)
+
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         top_level_layout = QVBoxLayout(central_widget)
@@ -2099,18 +2923,63 @@ class ZoomAutoApp(QMainWindow):
         
         top_level_layout.addWidget(header_widget)
 
+        # Thanh lọc: tìm theo tên / Meeting ID / link, loại lặp lại, trạng thái bật/tắt
+        filter_layout = QHBoxLayout()
+        self.filter_text = QLineEdit()
+        self.filter_text.setObjectName("filterText")
+        self.filter_text.setPlaceholderText("🔍 Tìm theo tên, Meeting ID hoặc link Zoom… (Ctrl+F)")
+        self.filter_text.setClearButtonEnabled(True)
+        self.filter_type = QComboBox()
+        self.filter_type.setObjectName("filterType")
+        for label, value in (("Mọi kiểu lặp", None), ("Một lần", 'once'), ("Hàng ngày", 'daily'),
+                             ("Hàng tuần", 'weekly'), ("T2-T6", 'weekdays'), ("Tùy chỉnh", 'custom')):
+            self.filter_type.addItem(label, value)
+        self.filter_enabled = QComboBox()
+        self.filter_enabled.setObjectName("filterEnabled")
+        for label, value in (("Bật và tắt", None), ("Đang bật", True), ("Đang tắt", False)):
+            self.filter_enabled.addItem(label, value)
+        self.filter_count = QLabel()
+        self.filter_count.setObjectName("filterCount")
+        filter_layout.addWidget(self.filter_text, 1)
+        filter_layout.addWidget(self.filter_type)
+        filter_layout.addWidget(self.filter_enabled)
+        filter_layout.addWidget(self.filter_count)
+        top_level_layout.addLayout(filter_layout)
+        # Lọc ngay theo từng phím gõ (chỉ mục tìm kiếm, không dựng lại dòng)
+        self.filter_text.textChanged.connect(self.apply_filter)
+        self.filter_type.currentIndexChanged.connect(self.apply_filter)
+        self.filter_enabled.currentIndexChanged.connect(self.apply_filter)
+        QShortcut(QKeySequence.StandardKey.Find, self, activated=self.filter_text.setFocus)
+
         # Main content area
         content_layout = QHBoxLayout()
         
         # Bảng lịch (bên trái)
-        self.table = QTableWidget()
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Bật/Tắt", "Giờ", "Tên phòng Zoom", "Meeting ID", "Link Zoom"])
-        
+        # Model/view: chỉ các dòng đang hiển thị được vẽ, không tạo widget cho từng dòng
+        self.table_model = ScheduleTableModel(self.scheduler.get_all_jobs, format_meeting_id, self)
+        self.table_model.toggle_requested.connect(self.on_toggle_schedule)
+        # Bộ lọc nằm giữa model và bảng; mọi chỉ số dòng của bảng là dòng của table_filter
+        self.table_filter = ScheduleFilterProxy(self)
+        self.table_filter.setSourceModel(self.table_model)
+        self.table = QTableView()
+        self.table.setModel(self.table_filter)
+        # Nối sau setModel: bảng phải reset xong trước khi chọn lại dòng
+        self.table_filter.modelReset.connect(self._after_filter_reset)
+        self.table_filter.rowsInserted.connect(self.update_filter_count)
+        self.table_filter.rowsRemoved.connect(self.update_filter_count)
+        self.table.setItemDelegateForColumn(TOGGLE, ToggleDelegate(self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # Chiều cao dòng cố định: không phải đo nội dung của từng dòng
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(36)
+
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        # Cột "vừa nội dung" chỉ đo các dòng đang hiện (mặc định Qt đo 1000 dòng mỗi lần lọc/cập nhật)
+        header.setResizeContentsPrecision(0)
+        header.setSectionResizeMode(TOGGLE, QHeaderView.ResizeMode.Fixed)
+        header.resizeSection(TOGGLE, 80)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
@@ -2141,23 +3010,16 @@ class ZoomAutoApp(QMainWindow):
         top_level_layout.addWidget(self.status_label)
         
         # Connect signals
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
-        self.table.itemDoubleClicked.connect(self.handle_double_click)
-        
-        self.refresh_table()
-        # Kiểm tra cập nhật nền (không chặn UI)
-        try:
-            updater.maybe_check_on_startup(self)
-        except Exception as _e:
-            pass
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.table.doubleClicked.connect(self.handle_double_click)
 
-    def handle_double_click(self, item):
+    def handle_double_click(self, index):
         """Xử lý double-click để chỉnh sửa"""
         self.edit_selected_schedule()
     
     def add_schedule(self):
         """Thêm lịch mới"""
-        dialog = ScheduleDialog(self)
+        dialog = self.dialogs.open('schedule')
         if dialog.exec() == QDialog.DialogCode.Accepted:
             data = dialog.get_data()
             
@@ -2182,14 +3044,14 @@ class ZoomAutoApp(QMainWindow):
                 zoom_link=data['zoom_link']
             )
             if new_job_id:
-                self.save_schedules() # Lưu ngay
-                self.refresh_table()
+                self.save_schedules(new_job_id) # Lưu ngay
+                self.update_rows([new_job_id])
                 self.find_and_select_row(new_job_id) # CHỌN lịch vừa thêm
     
     def test_zoom(self):
         """Test mở Zoom"""
         try:
-            dialog = TestZoomDialog(self)
+            dialog = self.dialogs.open('test_zoom')
             dialog.exec()
         except Exception as e:
             print(f"[ERROR] test_zoom error: {e}")
@@ -2199,16 +3061,93 @@ class ZoomAutoApp(QMainWindow):
 
     def show_about(self):
         """Hiển thị thông tin giới thiệu"""
-        dialog = AboutDialog(self)
+        dialog = self.dialogs.open('about')
         dialog.exec()
 
     def show_help(self):
         """Hiển thị hướng dẫn sử dụng"""
-        dialog = HelpDialog(self)
+        dialog = self.dialogs.open('help')
         dialog.exec()
 
+    def show_latency_stats(self):
+        """Hiển thị thống kê độ trễ các lần mở Zoom (p50/p95/p99)"""
+        stats = self.scheduler.latency_stats()
+
+        def fmt(value):
+            return "—" if value is None else f"{value * 1000:.0f} ms"
+
+        lines = [f"Số lần mở đã ghi nhận: {stats['count']}",
+                 f"Bị bỏ lỡ (quá hạn): {stats['missed']}",
+                 f"Lỗi khi mở: {stats['errors']}", ""]
+        labels = (("pickup_lag", "Trễ nhận job"), ("open_duration", "Thời gian mở trình duyệt"),
+                  ("lag", "Tổng độ trễ"))
+        for key, label in labels:
+            p = stats[key]
+            lines.append(f"{label}: p50 {fmt(p['p50'])} · p95 {fmt(p['p95'])} · "
+                         f"p99 {fmt(p['p99'])} · max {fmt(p['max'])}")
+        QMessageBox.information(self, "Độ trễ mở Zoom", "\n".join(lines))
+
+    def show_dialog_stats(self):
+        """Hiển thị thời gian dựng và độ trễ mở (đến lần vẽ đầu) của các dialog dùng lại"""
+        names = {'schedule': "Thêm/sửa lịch", 'recurrence': "Lặp lại tùy chỉnh", 'help': "Hướng dẫn",
+                 'about': "Giới thiệu", 'test_zoom': "Test mở Zoom"}
+
+        def fmt(value):
+            return "—" if value is None else f"{value:.1f} ms"
+
+        lines = []
+        for kind, stats in self.dialogs.stats().items():
+            built = (f"dựng {fmt(stats['build_ms'])} ({'lúc rảnh' if stats['prebuilt'] else 'khi mở'})"
+                     if stats['built'] else "chưa dựng")
+            lines.append(f"{names.get(kind, kind)}: {built} · {stats['opens']} lần mở · "
+                         f"p50 {fmt(stats['open_p50_ms'])} · p95 {fmt(stats['open_p95_ms'])} · "
+                         f"max {fmt(stats['open_max_ms'])}")
+        QMessageBox.information(self, "Độ trễ mở hộp thoại", "\n".join(lines))
+
+    def show_duplicate_stats(self):
+        """Hiển thị các phòng Zoom được nhiều lịch cùng dùng và bộ nhớ tiết kiệm nhờ dùng chung chuỗi"""
+        stats = self.scheduler.duplicate_stats()
+        strings = stats['strings']
+        lines = [f"Số lịch: {stats['schedules']} · số phòng: {stats['meetings']} · số link: {stats['links']}",
+                 f"Phòng dùng cho nhiều lịch: {stats['duplicated_meetings']} "
+                 f"({stats['duplicated_schedules']} lịch)",
+                 f"Link/Meeting ID/mật khẩu/tên: {strings['strings']} giá trị, {strings['objects']} bản lưu "
+                 f"(tiết kiệm ~{strings['saved_bytes'] / 1024:.0f} KB nhờ dùng chung)"]
+        if stats['top']:
+            lines += ["", "Phòng có nhiều lịch nhất:"]
+            lines += [f"  {format_meeting_id(meeting)}: {count} lịch" for meeting, count in stats['top']]
+        QMessageBox.information(self, "Phòng Zoom dùng chung", "\n".join(lines))
+
+    def import_schedules(self):
+        """Nhập hàng loạt lịch từ tệp .csv hoặc .ics (đăng ký cả lô một lần)"""
+        path, _ = QFileDialog.getOpenFileName(self, "Nhập lịch", "",
+                                              "Lịch (*.csv *.ics);;CSV (*.csv);;iCalendar (*.ics)")
+        if not path:
+            return
+        try:
+            importer = ScheduleImporter(path, progress=self._show_load_progress)
+            report = self.scheduler.add_schedules(importer)
+        except Exception as e:
+            QMessageBox.warning(self, "Nhập lịch", f"Lỗi khi nhập lịch: {e}")
+            return
+        if report['added']:
+            self.save_schedules(*report['added'])
+        self.refresh_table()
+        lines = [f"Đã nhập {len(report['added'])} lịch.",
+                 f"Bỏ qua {importer.skipped} sự kiện đã qua hoặc bị hủy."]
+        problems = [f"Dòng {line}: {error}" for line, error in importer.errors]
+        problems += [f"Lịch {job_id or index}: {error}" for index, job_id, error in report['errors']]
+        if problems:
+            lines.append(f"{len(problems)} mục lỗi:")
+            lines.extend(problems[:20])
+            if len(problems) > 20:
+                lines.append("…")
+        self.show_message(f"✓ Đã nhập {len(report['added'])} lịch")
+        QMessageBox.information(self, "Nhập lịch", "\n".join(lines))
+
     def check_updates(self):
         try:
+            import updater
             updater.check_and_update_ui(self)
         except Exception as e:
             QMessageBox.warning(self, "Cập nhật", f"Lỗi kiểm tra cập nhật: {e}")
@@ -2320,18 +3259,14 @@ class ZoomAutoApp(QMainWindow):
 
     def on_selection_changed(self):
         """Xử lý khi một dòng được chọn trong bảng"""
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        selected_rows = self.table.selectionModel().selectedRows()
+        if not selected_rows:
             self.detail_pane.setVisible(False)
             self.current_selected_job_id = None
             return
 
-        selected_row = self.table.row(selected_items[0])
-        item = self.table.item(selected_row, 1) # Column 1 for job id
-        
-        if not item: return
-
-        job_id = item.data(Qt.ItemDataRole.UserRole)
+        job_id = selected_rows[0].data(JOB_ID_ROLE)
+        if not job_id: return
         self.current_selected_job_id = job_id
         
         jobs = self.scheduler.get_all_jobs()
@@ -2362,7 +3297,7 @@ class ZoomAutoApp(QMainWindow):
         else:
             self.detail_link.setText("Không có")
 
-        rec = job_data.get('recurrence', {})
+        rec = job_data.get('recurrence') or {}
         rec_type = rec.get('type', 'daily')
         details = rec.get('details', {})
         
@@ -2394,7 +3329,7 @@ class ZoomAutoApp(QMainWindow):
         job_data = self.scheduler.get_all_jobs().get(job_id)
         if not job_data: return
         
-        dialog = ScheduleDialog(self)
+        dialog = self.dialogs.open('schedule')
         dialog.set_data(job_data)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -2408,9 +3343,9 @@ class ZoomAutoApp(QMainWindow):
                 recurrence=new_data['recurrence'],
                 zoom_link=new_data['zoom_link']
             )
-            self.save_schedules()
-            self.refresh_table()
-            self.find_and_select_row(job_id) # CHỌN lịch vừa chỉnh sửa
+            self.save_schedules(job_id)
+            # Chỉ cập nhật dòng vừa sửa; dòng vẫn được chọn và bảng không bị cuộn đi
+            self.update_rows([job_id], select=job_id)
 
     def delete_selected_schedule(self):
         """Xóa lịch đã chọn"""
@@ -2426,8 +3361,8 @@ class ZoomAutoApp(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             if self.scheduler.remove_schedule(self.current_selected_job_id):
-                self.save_schedules()
-                self.refresh_table()
+                self.save_schedules(self.current_selected_job_id)
+                self.update_rows([self.current_selected_job_id])
                 self.detail_pane.setVisible(False)
                 self.current_selected_job_id = None
                 self.show_message("✓ Đã xóa lịch thành công")
@@ -2451,127 +3386,219 @@ class ZoomAutoApp(QMainWindow):
             zoom_link=job_data.get('zoom_link')
         )
         if new_job_id:
-            self.save_schedules()
-            self.refresh_table()
+            self.save_schedules(new_job_id)
+            self.update_rows([new_job_id])
             self.find_and_select_row(new_job_id)  # Chọn lịch vừa nhân bản
             self.current_selected_job_id = new_job_id  # Cập nhật current_selected_job_id
             self.edit_selected_schedule()  # Mở màn hình chỉnh sửa ngay
 
     def find_and_select_row(self, job_id):
-        """Tìm và chọn dòng trong bảng dựa trên job_id"""
+        """Tìm và chọn dòng trong bảng dựa trên job_id (bỏ bộ lọc nếu lịch đang bị lọc ẩn)"""
         if not job_id: return
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 1)  # job_id lưu ở cột 1
-            if item and item.data(Qt.ItemDataRole.UserRole) == job_id:
-                self.table.selectRow(row)
-                self.table.scrollToItem(item, QTableWidget.ScrollHint.PositionAtCenter)
-                break
+        row = self.table_filter.row_of(job_id)
+        if row < 0 and self.table_filter.is_filtered() and job_id in self.scheduler.get_all_jobs():
+            self.clear_filter()
+            row = self.table_filter.row_of(job_id)
+        if row >= 0:
+            self.table.selectRow(row)
+            self.table.scrollTo(self.table_filter.index(row, TIME), QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def apply_filter(self):
+        """Lọc bảng theo thanh lọc (gọi ở mỗi phím gõ): tập lịch khớp lấy từ chỉ mục tìm kiếm"""
+        query = ScheduleQuery(self.filter_text.text(), self.filter_type.currentData(),
+                              self.filter_enabled.currentData())
+        if query:
+            self.table_filter.set_filter(lambda: self.scheduler.filter_schedules(query),
+                                         lambda job_id: self.scheduler.schedule_matches(job_id, query))
+        else:
+            self.table_filter.set_filter()
+
+    def clear_filter(self):
+        """Bỏ mọi điều kiện lọc (lọc lại một lần)"""
+        for widget in (self.filter_text, self.filter_type, self.filter_enabled):
+            widget.blockSignals(True)
+        self.filter_text.clear()
+        self.filter_type.setCurrentIndex(0)
+        self.filter_enabled.setCurrentIndex(0)
+        for widget in (self.filter_text, self.filter_type, self.filter_enabled):
+            widget.blockSignals(False)
+        self.apply_filter()
+
+    def _after_filter_reset(self):
+        """Sau khi lọc lại hoặc tải lại bảng: chọn lại lịch đang xem nếu nó vẫn hiện trong bảng"""
+        job_id = self.current_selected_job_id
+        row = self.table_filter.row_of(job_id) if job_id else -1
+        if row >= 0:
+            self.table.selectRow(row)
+            self.table.scrollTo(self.table_filter.index(row, TIME), QAbstractItemView.ScrollHint.EnsureVisible)
+        elif job_id:
+            self.detail_pane.setVisible(False)
+            self.current_selected_job_id = None
+        self.update_filter_count()
 
-    def refresh_table(self):
-        """Cập nhật bảng"""
-        self.table.setRowCount(0)
-        jobs = self.scheduler.get_all_jobs()
-        
-        # Sắp xếp công việc theo giờ và phút
-        sorted_jobs = sorted(jobs.items(), key=lambda item: (item[1]['hour'], item[1]['minute']))
+    def update_filter_count(self, *args):
+        """Số lịch đang hiện / tổng số lịch cạnh thanh lọc"""
+        total = self.table_model.rowCount()
+        if self.table_filter.is_filtered():
+            self.filter_count.setText(f"{self.table_filter.rowCount():,} / {total:,} lịch")
+        else:
+            self.filter_count.setText(f"{total:,} lịch")
 
-        for idx, (job_id, job_data) in enumerate(sorted_jobs):
-            self.table.insertRow(idx)
+    def _warm_search_index(self):
+        """Dựng chỉ mục tìm kiếm từng phần lúc rảnh (QTimer 0 ms), dừng khi xong"""
+        if self.scheduler.warm_search_index(budget=0.01):
+            self.warm_timer.stop()
+            self.dialogs.prebuild()
 
-            # --- Cột 0: Bật/Tắt ---
-            toggle_switch = QCheckBox()
-            toggle_switch.setChecked(job_data.get('enabled', False))
-            toggle_switch.setProperty("job_id", job_id)
-            toggle_switch.toggled.connect(
-                lambda checked, jid=job_id, row=idx: self.on_toggle_schedule(jid, checked, row)
-            )
-            
-            cell_widget = QWidget()
-            layout = QHBoxLayout(cell_widget)
-            layout.addWidget(toggle_switch)
-            layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.setContentsMargins(0,0,0,0)
-            self.table.setCellWidget(idx, 0, cell_widget)
-            
-            # --- Cột 1: Giờ ---
-            rec = job_data.get('recurrence', {})
-            rec_type = rec.get('type', 'daily')
-            hour, minute = job_data.get('hour', 0), job_data.get('minute', 0)
-            time_str = f"{hour:02d}:{minute:02d}"
-            
-            display_str = time_str
-            if rec_type == 'once':
-                run_date = rec.get('run_date')
-                if run_date:
-                    try:
-                        dt = datetime.fromisoformat(run_date)
-                        display_str = dt.strftime("%d/%m %H:%M")
-                    except: pass
-            
-            item_time = QTableWidgetItem(display_str)
-            item_time.setData(Qt.ItemDataRole.UserRole, job_id)
-            self.table.setItem(idx, 1, item_time)
-            
-            # --- Cột 2: Tên phòng Zoom ---
-            self.table.setItem(idx, 2, QTableWidgetItem(job_data.get('name', '')))
-            
-            # --- Cột 3: Meeting ID ---
-            meeting_id = job_data.get('meeting_id', '')
-            self.table.setItem(idx, 3, QTableWidgetItem(format_meeting_id(meeting_id)))
+    def refresh_table(self):
+        """Cập nhật bảng (đọc lại toàn bộ danh sách lịch, không tạo widget cho từng dòng)"""
+        self.table_model.reload()
 
-            # --- Cột 4: Link Zoom ---
-            self.table.setItem(idx, 4, QTableWidgetItem(job_data.get('zoom_link', '')))
-        
-        self.table.resizeRowsToContents()
+    def update_rows(self, job_ids, select=None):
+        """Chỉ cập nhật các dòng của job_ids (thêm/sửa/xóa), giữ thứ tự theo giờ phút.
 
-    def on_toggle_schedule(self, job_id, is_enabled, row):
+        Dòng đang chọn (hoặc select) vẫn được chọn kể cả khi nó đổi chỗ, và lịch
+        đang ở đầu bảng vẫn ở đầu bảng (không nhảy khi có dòng thêm/bớt phía trên).
+        """
+        model = self.table_filter   # các dòng bảng đang hiển thị
+        job_ids = list(job_ids)
+        selected = select or self.current_selected_job_id
+        scrollbar = self.table.verticalScrollBar()
+        scroll = scrollbar.value()
+        top_job = model.job_id(self.table.rowAt(0))
+        self.table_model.update_rows(job_ids)
+        top_row = model.row_of(top_job) if top_job and top_job not in job_ids else -1
+        if top_row >= 0:
+            self.table.scrollTo(model.index(top_row, TIME), QAbstractItemView.ScrollHint.PositionAtTop)
+        else:
+            scrollbar.setValue(scroll)
+        row = model.row_of(selected) if selected else -1
+        if row >= 0:
+            if not self.table.selectionModel().isRowSelected(row):
+                self.table.selectRow(row)
+            self.table.scrollTo(model.index(row, TIME), QAbstractItemView.ScrollHint.EnsureVisible)
+            if selected in job_ids:
+                self.update_detail_pane(self.scheduler.get_all_jobs()[selected])
+        elif select:
+            self.find_and_select_row(select)   # lịch vừa sửa không còn khớp bộ lọc: bỏ lọc để thấy nó
+
+    def check_external_changes(self):
+        """Áp dụng thay đổi mà công cụ bên ngoài ghi vào zoom_schedule.json (gọi theo timer)"""
+        if not self.watcher or not self.watcher.poll():
+            return
+        incoming, report = load_schedule_file(SCHEDULE_FILE, self.store.quarantine)
+        if report['fatal']:
+            # Tệp đang ghi dở hoặc hỏng: bỏ qua, giữ nguyên lịch hiện tại
+            print(f"[WATCH] Bỏ qua zoom_schedule.json: {report['fatal']}")
+            return
+        result = self.scheduler.sync_records(incoming, keep=report['rejected_keys'])
+        for job_id, error in result['errors']:
+            print(f"[WATCH] Bỏ qua lịch {job_id}: {error}")
+            self.store.quarantine.add(job_id, error, record=incoming.get(job_id), source='watch')
+        self.store.quarantine.close()
+        affected = result['added'] + result['changed'] + result['removed']
+        # Ghi lại ở dạng chuẩn (bản ghi thiếu id trong tệp dạng mảng được gán id cố định,
+        # lịch tùy chỉnh thiếu ngày bắt đầu được ghi kèm ngày đã dùng)
+        unsaved = [job_id for job_id in result['anchored'] if job_id not in affected]
+        if affected or unsaved:
+            self.save_schedules(*affected, *unsaved)
+        if not affected:
+            return
+        self.update_rows(affected)
+        if self.current_selected_job_id in result['removed']:
+            self.detail_pane.setVisible(False)
+            self.current_selected_job_id = None
+        self.show_message(f"↻ Tệp lịch thay đổi: +{len(result['added'])} ~{len(result['changed'])} "
+                          f"-{len(result['removed'])} lịch")
+
+    def on_toggle_schedule(self, job_id, is_enabled):
         """Xử lý khi công tắc bật/tắt được gạt"""
         if self.scheduler.toggle_schedule(job_id, is_enabled):
-            self.save_schedules()
-            self.table.selectRow(row)
+            self.save_schedules(job_id)
+            # Tìm lại dòng theo job_id: chỉ số dòng cũ có thể đã đổi sau khi sắp xếp lại
+            row = self.table_filter.row_of(job_id)
+            if row >= 0:
+                self.table.selectRow(row)
             # Không cần refresh toàn bộ bảng, chỉ cần cập nhật trạng thái
             status = "bật" if is_enabled else "tắt"
             self.show_message(f"✓ Đã {status} lịch")
     
-    def save_schedules(self):
-        """Lưu lịch vào file JSON"""
+    def save_schedules(self, *changed_ids):
+        """Lưu lịch (changed_ids: các lịch vừa thay đổi; bỏ trống = lưu toàn bộ)"""
         try:
-            with open(SCHEDULE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.scheduler.get_all_jobs(), f, ensure_ascii=False, indent=4)
+            if self.persister:
+                # Chỉ ghi nhận thay đổi; thread nền sẽ gom lại và ghi xuống đĩa
+                self.persister.mark(self.scheduler.get_all_jobs(), changed_ids or None)
+            else:
+                self.store.save(self.scheduler.get_all_jobs(), changed_ids or None)
         except Exception as e:
             self.show_message(f"✗ Lỗi khi lưu: {str(e)}")
             
     def load_schedules(self):
-        """Tải lịch từ file JSON"""
-        if not SCHEDULE_FILE.exists():
-            return
-            
+        """Tải lịch từ kho lưu trữ (JSON, SQLite, nhị phân hoặc journal).
+
+        Tệp JSON được đọc từng bản ghi; bản ghi hỏng hoặc không hợp lệ được chuyển
+        vào zoom_schedule.quarantine.jsonl thay vì làm hỏng cả lần tải.
+        """
         try:
-            with open(SCHEDULE_FILE, 'r', encoding='utf-8') as f:
-                schedules = json.load(f)
+            arm_limit = self.config.get('startup_arm_limit', 0)
+            index = self.store.open_index() if arm_limit > 0 and hasattr(self.store, 'open_index') else None
+            schedules = self.store.load(progress=self._show_load_progress)
+            if index is not None and not isinstance(schedules, dict):
+                # Khởi động theo chỉ mục: không cần giải mã toàn bộ snapshot
+                report = self.scheduler.load_indexed(schedules, index, arm_limit)
+                print(f"[LOAD] Chỉ mục: đăng ký {report['armed']} lịch, "
+                      f"{report['pending']} lịch chờ, {report['stale']} lịch cần tính lại giờ")
+                return
+            # Đăng ký cả lô một lần thay vì gọi add_schedule cho từng lịch
+            keys = []
+
+            def records():
                 for job_id, data in schedules.items():
-                    self.scheduler.add_schedule(
-                        job_id,
-                        data['hour'],
-                        data['minute'],
-                        data.get('meeting_id', ''),
-                        data.get('password', ''),
-                        data.get('enabled', True),
-                        data.get('name', ''),
-                        recurrence=data.get('recurrence'),
-                        zoom_link=data.get('zoom_link', '')
-                    )
-        except json.JSONDecodeError:
-            self.show_message(f"✗ Lỗi: Tệp zoom_schedule.json bị hỏng.")
-            # (Tùy chọn) Backup file hỏng
+                    keys.append(job_id)
+                    yield {**data, 'id': job_id} if isinstance(data, Mapping) else data
+
+            report = self.scheduler.add_schedules(records())
+            if report['anchored']:
+                # Lưu ngày bắt đầu vừa gán để lần tải sau không tính chu kỳ từ ngày khác
+                self.save_schedules(*report['anchored'])
+            quarantine = getattr(self.store, 'quarantine', None)
+            for index, job_id, error in report['errors']:
+                print(f"[LOAD] Bỏ qua lịch {job_id or index}: {error}")
+                if quarantine is not None:
+                    quarantine.add(keys[index], error, record=schedules.get(keys[index]), source='validate')
+            if quarantine is not None:
+                quarantine.close()
+            self._report_load_problems(len(report['errors']))
+        except Exception as e:
+            self.show_message(f"✗ Lỗi khi tải: {str(e)}")
+
+    def _show_load_progress(self, done, total, records):
+        """Hiển thị tiến độ đọc tệp lịch lớn trên thanh trạng thái"""
+        percent = int(done * 100 / total) if total else 100
+        self.show_message(f"⏳ Đang tải lịch… {percent}% ({records} lịch)")
+        QApplication.processEvents()
+
+    def _report_load_problems(self, invalid):
+        """Thông báo bản ghi bị cách ly; giữ bản sao tệp gốc nếu cấu trúc tệp bị hỏng"""
+        load_report = getattr(self.store, 'load_report', None) or {}
+        skipped = load_report.get('quarantined', 0) + invalid
+        if load_report.get('fatal'):
+            # Lần lưu tới sẽ ghi đè tệp bằng phần đọc được: giữ lại bản gốc
             try:
-                os.rename(SCHEDULE_FILE, f"{SCHEDULE_FILE}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak")
-                self.show_message(f"✗ Lỗi: zoom_schedule.json bị hỏng. Đã tạo file backup.")
+                backup = f"{SCHEDULE_FILE}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak"
+                shutil.copy2(SCHEDULE_FILE, backup)
+                self.show_message(f"✗ zoom_schedule.json bị hỏng ({load_report['fatal']}). "
+                                  f"Đã tải {load_report['loaded']} lịch, tạo file backup.")
             except Exception as e:
                 self.show_message(f"✗ Lỗi nghiêm trọng với file schedule: {e}")
-        except Exception as e:
-            self.show_message(f"✗ Lỗi khi tải: {str(e)}")
-            
+        elif skipped:
+            self.show_message(f"⚠ {skipped} lịch lỗi đã được chuyển vào zoom_schedule.quarantine.jsonl")
+
+    def save_stats(self):
+        """Số lần ghi và thời gian ghi lịch xuống đĩa (None nếu ghi đồng bộ)"""
+        return self.persister.stats() if self.persister else None
+
     def show_message(self, message):
         """Hiển thị thông báo trên thanh trạng thái"""
         self.status_label.setText(message)
@@ -2579,13 +3606,20 @@ class ZoomAutoApp(QMainWindow):
     def closeEvent(self, event):
         """Xử lý khi đóng ứng dụng"""
         self.scheduler.stop()
+        if self.persister:
+            self.persister.stop()  # ghi nốt các thay đổi đang chờ trước khi thoát
+        self.store.close()
         super().closeEvent(event)
     
-def main():
-    app = QApplication(sys.argv)
-    window = ZoomAutoApp()
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    app = QApplication(argv)
+    window = ZoomAutoApp(startup=STARTUP)
+    if '--startup-report' in argv:
+        # In báo cáo khởi động (JSON) rồi thoát ngay khi ứng dụng sẵn sàng
+        window.startup_finished.connect(lambda report: (print(json.dumps(report)), window.close(), app.quit()))
     window.show()
-    sys.exit(app.exec())
+    return app.exec()
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
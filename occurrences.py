@@ -0,0 +1,192 @@
+"""Occurrence expansion: which schedules fire between two instants.
+
+Turns the recurrence dicts stored in ``zoom_schedule.json`` ('once', 'daily',
+'weekly', 'weekdays', 'custom' with interval/unit/days_of_week/end_date) into
+NumPy ``datetime64[m]`` arrays of fire times.
+
+The work is batched: the day grid of the requested window is built once, and
+every distinct recurrence shape is turned into a boolean day mask with
+vectorized date arithmetic. Schedules that share a shape reuse that mask and
+only add their own time-of-day offset. This is the base for agenda views and
+capacity planning (see ``agenda`` and ``load_profile``).
+
+Rule semantics match the scheduler: a fire is dropped once it is later than
+``end_date`` (parsed as midnight), a custom 'ngày'/'tuần'/'tháng'/'năm' rule
+repeats every ``interval`` units counted from ``details['start_date']`` (records
+that predate that field are phased from today), a monthly rule whose
+day does not exist in a month (e.g. the 31st) skips that month, and the days
+listed in ``details['exclude_dates']`` (ISO dates, e.g. from an iCalendar
+EXDATE) never fire.
+"""
+from datetime import date, datetime
+from typing import Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+_EPOCH_MONDAY = 4          # 1970-01-05 was a Monday (day 4 since the epoch)
+_MINUTE = np.timedelta64(1, "m")
+
+
+def _as_day(value) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value).date()
+    return np.datetime64(value, "D")
+
+
+class DayGrid:
+    """Calendar arrays for every day in a window, computed once per query."""
+
+    def __init__(self, first_day: date, last_day: date):
+        self.days = np.arange(np.datetime64(first_day, "D"), np.datetime64(last_day, "D") + 1)
+        self.ordinal = self.days.astype(np.int64)                       # days since 1970-01-01
+        self.weekday = (self.ordinal + 3) % 7                           # 0 = Monday
+        self.week = (self.ordinal - _EPOCH_MONDAY) // 7                 # Monday-based week number
+        months = self.days.astype("datetime64[M]")
+        self.month_index = months.astype(np.int64)                      # months since 1970-01
+        self.day_of_month = (self.days - months.astype("datetime64[D]")).astype(np.int64) + 1
+        self.month = self.month_index % 12 + 1
+        self.year = self.month_index // 12 + 1970
+
+
+def _anchor(details: Mapping) -> Tuple[np.datetime64, bool]:
+    # Records created before 'start_date' existed only get a phase reference
+    # (today), not a lower bound.
+    start = details.get("start_date")
+    if start:
+        return _as_day(start), True
+    return np.datetime64(date.today(), "D"), False
+
+
+def day_mask(grid: DayGrid, recurrence: Optional[Mapping]) -> np.ndarray:
+    """Boolean mask over ``grid.days`` of the days a recurrence fires on (time of day ignored)."""
+    if not recurrence:
+        return np.zeros(len(grid.days), dtype=bool)
+    mask = _rule_mask(grid, recurrence)
+    excluded = (recurrence.get("details") or {}).get("exclude_dates")
+    if excluded:
+        mask &= ~np.isin(grid.days, [_as_day(day) for day in excluded])
+    return mask
+
+
+def _rule_mask(grid: DayGrid, recurrence: Mapping) -> np.ndarray:
+    rec_type = recurrence.get("type", "daily")
+    details = recurrence.get("details") or {}
+
+    if rec_type == "daily":
+        return np.ones(len(grid.days), dtype=bool)
+    if rec_type == "weekdays":
+        return grid.weekday < 5
+    if rec_type == "weekly":
+        return np.isin(grid.weekday, list(details.get("days_of_week", [0])))
+    if rec_type == "once":
+        run_date = recurrence.get("run_date")
+        if not run_date:
+            return np.zeros(len(grid.days), dtype=bool)
+        return grid.days == _as_day(run_date)
+    if rec_type != "custom":
+        return np.zeros(len(grid.days), dtype=bool)
+
+    unit = details.get("unit", "tuần")
+    interval = max(1, int(details.get("interval", 1) or 1))
+    anchor, bounded = _anchor(details)
+    anchor_ord = int(anchor.astype(np.int64))
+    started = grid.ordinal >= anchor_ord if bounded else np.ones(len(grid.days), dtype=bool)
+
+    if unit == "ngày":
+        return started & ((grid.ordinal - anchor_ord) % interval == 0)
+    if unit == "tuần":
+        days = details.get("days_of_week") or []
+        mask = np.isin(grid.weekday, list(days)) if days else np.ones(len(grid.days), dtype=bool)
+        anchor_week = (anchor_ord - _EPOCH_MONDAY) // 7
+        return mask & started & ((grid.week - anchor_week) % interval == 0)
+    anchor_month = int(anchor.astype("datetime64[M]").astype(np.int64))
+    anchor_dom = int((anchor - anchor.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)) + 1
+    if unit == "tháng":
+        return started & (grid.day_of_month == anchor_dom) & ((grid.month_index - anchor_month) % interval == 0)
+    if unit == "năm":
+        anchor_year = anchor_month // 12 + 1970
+        return (started & (grid.day_of_month == anchor_dom) & (grid.month == anchor_month % 12 + 1)
+                & ((grid.year - anchor_year) % interval == 0))
+    return np.zeros(len(grid.days), dtype=bool)
+
+
+def _shape_key(recurrence: Optional[Mapping]) -> Hashable:
+    if not recurrence:
+        return None
+    details = recurrence.get("details") or {}
+    return (
+        recurrence.get("type", "daily"),
+        recurrence.get("run_date") if recurrence.get("type") == "once" else None,
+        tuple(sorted(details.get("days_of_week") or [])),
+        details.get("unit"),
+        details.get("interval"),
+        details.get("start_date"),
+        tuple(details.get("exclude_dates") or ()),
+    )
+
+
+def expand_schedules(jobs: Mapping[str, Mapping], start: datetime, end: datetime,
+                     include_disabled: bool = False) -> Dict[str, np.ndarray]:
+    """Fire times of every schedule in ``[start, end)`` as ``datetime64[m]`` arrays."""
+    if end <= start:
+        return {}
+    grid = DayGrid(start.date(), end.date())
+    start64 = np.datetime64(start.replace(second=0, microsecond=0), "m")
+    if start.second or start.microsecond:
+        start64 += _MINUTE
+    end64 = np.datetime64(end, "m") if not (end.second or end.microsecond) else np.datetime64(end, "m") + _MINUTE
+    masks: Dict[Hashable, np.ndarray] = {}
+    result: Dict[str, np.ndarray] = {}
+
+    for job_id, job in jobs.items():
+        if not include_disabled and not job.get("enabled", True):
+            continue
+        recurrence = job.get("recurrence")
+        key = _shape_key(recurrence)
+        fire_days = masks.get(key)
+        if fire_days is None:
+            fire_days = grid.days[day_mask(grid, recurrence)].astype("datetime64[m]")
+            masks[key] = fire_days
+        if not len(fire_days):
+            result[job_id] = fire_days
+            continue
+        if recurrence.get("type") == "once":
+            run_date = datetime.fromisoformat(recurrence["run_date"])
+            offset = run_date.hour * 60 + run_date.minute
+        else:
+            offset = int(job.get("hour", 0)) * 60 + int(job.get("minute", 0))
+        times = fire_days + np.timedelta64(offset, "m")
+        lo, hi = np.searchsorted(times, [start64, end64])
+        times = times[lo:hi]
+        end_date = (recurrence.get("details") or {}).get("end_date")
+        if end_date and len(times):
+            times = times[times <= np.datetime64(datetime.fromisoformat(end_date), "m")]
+        result[job_id] = times
+    return result
+
+
+def agenda(jobs: Mapping[str, Mapping], start: datetime, end: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """All fires in ``[start, end)`` sorted by time: ``(times, job_ids)``."""
+    expanded = expand_schedules(jobs, start, end)
+    if not expanded:
+        return np.array([], dtype="datetime64[m]"), np.array([], dtype=object)
+    ids = list(expanded)
+    arrays = [expanded[job_id] for job_id in ids]
+    counts = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=len(arrays))
+    times = np.concatenate(arrays)
+    owners = np.repeat(np.array(ids, dtype=object), counts)
+    order = np.argsort(times, kind="stable")
+    return times[order], owners[order]
+
+
+def load_profile(jobs: Mapping[str, Mapping], start: datetime, end: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """Capacity planning: distinct fire minutes in the window and how many launches each has."""
+    times, _ = agenda(jobs, start, end)
+    return np.unique(times, return_counts=True)
+
+
+def to_datetimes(times: Iterable[np.datetime64]):
+    """Convert ``datetime64[m]`` values back to naive ``datetime`` objects."""
+    return [t.astype("datetime64[m]").astype(datetime) for t in times]
@@ -0,0 +1,153 @@
+"""Recurrence compiler: per-year day bitmasks plus a time of day.
+
+``compile_recurrence`` turns a recurrence dict into a ``CompiledRecurrence``.
+For each calendar year it holds a 366-bit integer whose bit ``n`` is set
+when the rule fires on day-of-year ``n + 1``. The bitmasks are built lazily,
+one vectorized pass per year, using ``occurrences.day_mask`` so the rule
+semantics are shared with occurrence expansion. After that:
+
+* "does it fire on date D" is one shift and mask, and
+* "next fire after T" is a shift plus a lowest-set-bit lookup, and only
+  touches the following year's mask when the current year is exhausted.
+  ``once`` rules skip the masks entirely; other rules scan from their start
+  date to their end date, or, without an end, to the longest gap the rule
+  can have between two fires.
+
+``BitmaskTrigger`` wraps a compiled rule as a trigger usable by both engines
+(APScheduler's ``get_next_fire_time`` and the heap engine's
+``next_fire_time``). It is used for the rules cron cannot express: every N
+weeks, monthly and yearly.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.util import astimezone, localize
+from tzlocal import get_localzone
+
+from occurrences import DayGrid, day_mask
+
+# Never scan more years than this, whatever the rule.
+MAX_SCAN_YEARS = 120
+
+
+def _max_gap_years(recurrence: Mapping) -> int:
+    """Most consecutive years an open-ended rule can go without firing."""
+    details = recurrence.get("details") or {}
+    gap = 1
+    if recurrence.get("type") == "custom":
+        interval = max(1, int(details.get("interval", 1) or 1))
+        unit = details.get("unit", "tuần")
+        if unit == "năm":
+            gap = interval * 8      # 29/2 only exists in leap years, up to 8 years apart
+        elif unit == "tháng":
+            gap = interval          # back in the start month after 12 steps
+        else:
+            gap = interval * (7 if unit == "tuần" else 1) // 365 + 1
+    # Each excluded date can empty at most one more stretch
+    return min(MAX_SCAN_YEARS, gap * (1 + len(details.get("exclude_dates") or ())))
+
+
+class CompiledRecurrence:
+    """One recurrence rule compiled to per-year day bitmasks."""
+
+    __slots__ = ("recurrence", "time_of_day", "end", "start", "run_at", "max_gap", "_years")
+
+    def __init__(self, recurrence: Mapping, hour: int, minute: int):
+        self.recurrence = recurrence
+        details = recurrence.get("details") or {}
+        self.run_at: Optional[datetime] = None
+        if recurrence.get("type") == "once" and recurrence.get("run_date"):
+            self.run_at = datetime.fromisoformat(recurrence["run_date"]).replace(second=0, microsecond=0)
+            hour, minute = self.run_at.hour, self.run_at.minute
+        self.time_of_day = time(int(hour), int(minute))
+        self.end: Optional[datetime] = None
+        if details.get("end_date"):
+            self.end = datetime.fromisoformat(details["end_date"])
+        # Custom rules never fire before their start date (when they have one)
+        self.start: Optional[date] = None
+        if recurrence.get("type") == "custom" and details.get("start_date"):
+            self.start = datetime.fromisoformat(details["start_date"]).date()
+        self.max_gap = _max_gap_years(recurrence)
+        self._years: Dict[int, int] = {}
+
+    def year_mask(self, year: int) -> int:
+        mask = self._years.get(year)
+        if mask is None:
+            grid = DayGrid(date(year, 1, 1), date(year, 12, 31))
+            bits = np.packbits(day_mask(grid, self.recurrence), bitorder="little")
+            mask = int.from_bytes(bits.tobytes(), "little")
+            self._years[year] = mask
+        return mask
+
+    def fires_on(self, day: date) -> bool:
+        if not (self.year_mask(day.year) >> (day.timetuple().tm_yday - 1)) & 1:
+            return False
+        return self.end is None or datetime.combine(day, self.time_of_day) <= self.end
+
+    def next_fire_after(self, moment: datetime) -> Optional[datetime]:
+        """First fire strictly after ``moment`` (naive local time), or None."""
+        if self.recurrence.get("type") == "once":
+            return self._once_after(moment)
+        if self.end is not None and moment >= self.end:
+            return None
+        if self.start is not None and moment.date() < self.start:
+            year, start_bit = self.start.year, self.start.timetuple().tm_yday - 1
+        else:
+            year = moment.year
+            # Today still counts if its fire time has not passed yet.
+            start_bit = moment.timetuple().tm_yday - (1 if moment.time() < self.time_of_day else 0)
+        last_year = self.end.year if self.end is not None else year + self.max_gap
+        while year <= last_year:
+            remaining = self.year_mask(year) >> start_bit
+            if remaining:
+                offset = (remaining & -remaining).bit_length() - 1
+                day = date(year, 1, 1) + timedelta(days=start_bit + offset)
+                fire = datetime.combine(day, self.time_of_day)
+                return fire if self.end is None or fire <= self.end else None
+            year += 1
+            start_bit = 0
+        return None
+
+    def _once_after(self, moment: datetime) -> Optional[datetime]:
+        fire = self.run_at
+        if fire is None or fire <= moment or (self.end is not None and fire > self.end):
+            return None
+        excluded = (self.recurrence.get("details") or {}).get("exclude_dates") or ()
+        if any(datetime.fromisoformat(str(day)[:10]).date() == fire.date() for day in excluded):
+            return None
+        return fire
+
+
+def compile_recurrence(recurrence: Mapping, hour: int, minute: int) -> CompiledRecurrence:
+    return CompiledRecurrence(recurrence, hour, minute)
+
+
+class BitmaskTrigger(BaseTrigger):
+    """Trigger backed by a ``CompiledRecurrence`` (works with both engines)."""
+
+    def __init__(self, recurrence: Mapping, hour: int, minute: int, timezone=None):
+        self.rule = compile_recurrence(recurrence, hour, minute)
+        self.timezone = astimezone(timezone) if timezone else get_localzone()
+
+    # APScheduler interface (timezone-aware datetimes).
+    def get_next_fire_time(self, previous_fire_time, now):
+        if previous_fire_time is not None:
+            start = previous_fire_time
+        else:
+            start = now - timedelta(microseconds=1)
+        local = start.astimezone(self.timezone).replace(tzinfo=None)
+        fire = self.rule.next_fire_after(local)
+        return localize(fire, self.timezone) if fire else None
+
+    # Heap engine interface (naive local datetimes).
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        return self.rule.next_fire_after(after)
+
+    def __str__(self) -> str:
+        rec = self.rule.recurrence
+        return f"bitmask[{rec.get('type')}, {rec.get('details')}, {self.rule.time_of_day:%H:%M}]"
+
+    def __repr__(self) -> str:
+        return f"<BitmaskTrigger {self}>"
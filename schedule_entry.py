@@ -0,0 +1,304 @@
+"""Compact in-memory records for ``SchedulerManager.jobs``.
+
+A schedule used to be a plain dict with nine keys, plus a ``recurrence`` dict
+and a ``details`` dict inside it: three hash tables per schedule. Here:
+
+* ``ScheduleEntry`` holds the nine fields in ``__slots__``;
+* ``Recurrence`` / ``RecurrenceDetails`` hold the recurrence rule, also in
+  ``__slots__``. They are immutable and shared: ``Recurrence.from_dict``
+  returns the same object for equal rules, so thousands of schedules with
+  "every Monday and Wednesday" point at one rule.
+
+All three behave as read-only mappings with the same keys as the dicts in
+``zoom_schedule.json`` (``entry['hour']``, ``rec.get('details') or {}``,
+``{**entry}``, ``entry == {...}``), so code and tests written against dicts
+keep working; ``ScheduleEntry`` additionally supports ``entry[key] = value``.
+A key missing from the source dict is an unset slot, so ``to_dict`` gives
+back exactly the dict the record was built from. Pass ``default=to_plain``
+to ``json.dump``/``json.dumps`` to serialize them.
+
+Lists in a shared rule (``days_of_week``, ``exclude_dates``) must be treated
+as read-only; build a new rule (``with_details``) instead of editing one.
+
+The text fields that repeat across schedules (``INTERNED_FIELDS``: the same
+class link, meeting id and passcode on dozens of schedules, the same class
+name every weekday) are interned on the way in, so equal strings share one
+object. ``intern_record`` does the same for a plain dict, for readers that
+hold many records before they become entries; ``intern_stats`` reports how
+much text a table shares.
+"""
+import sys
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+_FROZEN = "{} là bất biến (dùng chung giữa các lịch); hãy tạo bản mới"
+
+INTERNED_FIELDS = ("name", "meeting_id", "password", "zoom_link")
+_intern = sys.intern
+
+
+def intern_text(value: Any) -> Any:
+    """The shared copy of a string (``sys.intern``); other values are returned as is."""
+    return _intern(value) if type(value) is str else value
+
+
+def intern_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern the ``INTERNED_FIELDS`` of a plain record dict in place; returns it."""
+    for key in INTERNED_FIELDS:
+        value = record.get(key)
+        if type(value) is str:
+            record[key] = _intern(value)
+    return record
+
+
+def intern_stats(records: Iterable[Mapping[str, Any]]) -> Dict[str, int]:
+    """How much text of ``INTERNED_FIELDS`` the records share.
+
+    ``strings``: non-empty values referenced; ``objects``: distinct string
+    objects behind them; ``saved_bytes``: what one private copy per extra
+    reference would have cost. Computed on demand (one pass), so interning
+    itself stays a bare ``sys.intern``.
+    """
+    objects: Dict[int, str] = {}   # id -> string (kept so the id stays unique)
+    strings = saved = 0
+    for record in records:
+        for key in INTERNED_FIELDS:
+            value = record.get(key)
+            if type(value) is not str or not value:
+                continue
+            strings += 1
+            if id(value) in objects:
+                saved += sys.getsizeof(value)
+            else:
+                objects[id(value)] = value
+    return {"strings": strings, "objects": len(objects), "saved_bytes": saved}
+
+
+class _SlotRecord(Mapping):
+    """Mapping view over ``FIELDS`` stored in slots; unknown keys go to ``_extra``."""
+
+    __slots__ = ("_extra",)
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def _init(self, data: Mapping) -> None:
+        extra = None
+        for key, value in data.items():
+            if key in self._FIELD_SET:
+                object.__setattr__(self, key, self._convert(key, value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(self, "_extra", extra)
+
+    def _convert(self, key: str, value: Any) -> Any:
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain (nested) dicts, the shape stored in ``zoom_schedule.json``."""
+        return {key: value.to_dict() if isinstance(value, _SlotRecord) else value
+                for key, value in self.items()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class RecurrenceDetails(_SlotRecord):
+    """``recurrence['details']``: weekdays, interval/unit and date bounds."""
+
+    __slots__ = ("days_of_week", "interval", "unit", "start_date", "end_date", "exclude_dates")
+    FIELDS = ("days_of_week", "interval", "unit", "start_date", "end_date", "exclude_dates")
+
+    def __init__(self, data: Mapping):
+        self._init(data)
+
+    def _convert(self, key: str, value: Any) -> Any:
+        # Own copy: the caller's lists must not alias a rule shared by other schedules
+        return list(value) if isinstance(value, list) else value
+
+    def __setattr__(self, key, value):
+        raise TypeError(_FROZEN.format("RecurrenceDetails"))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class Recurrence(_SlotRecord):
+    """``recurrence``: type ('once', 'daily', ...), run_date and details. Shared, immutable."""
+
+    __slots__ = ("type", "run_date", "details", "__weakref__")
+    FIELDS = ("type", "run_date", "details")
+
+    _shared: "weakref.WeakValueDictionary[tuple, Recurrence]" = weakref.WeakValueDictionary()
+
+    def __init__(self, data: Mapping):
+        self._init(data)
+
+    def _convert(self, key: str, value: Any) -> Any:
+        if key == "details" and type(value) is not RecurrenceDetails and isinstance(value, Mapping):
+            return RecurrenceDetails(value)
+        return value
+
+    def __setattr__(self, key, value):
+        raise TypeError(_FROZEN.format("Recurrence"))
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Recurrence":
+        """The shared rule equal to ``data`` (built on first use)."""
+        if type(data) is Recurrence:
+            return data
+        try:
+            key = _freeze(data)
+        except TypeError:  # unhashable odd value: keep a private copy
+            return cls(data)
+        rule = cls._shared.get(key)
+        if rule is None:
+            rule = cls(data)
+            cls._shared[key] = rule
+        return rule
+
+    def with_details(self, **changes: Any) -> "Recurrence":
+        """A rule equal to this one with ``details`` keys replaced."""
+        data = self.to_dict()
+        data["details"] = {**(data.get("details") or {}), **changes}
+        return Recurrence.from_dict(data)
+
+
+def _freeze(value: Any) -> Any:
+    kind = type(value)
+    if kind is str:
+        return value
+    if kind is dict or kind is RecurrenceDetails or isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if kind is list:
+        return ("__list__",) + tuple(_freeze(item) for item in value)
+    hash(value)
+    # bool/int/float compare equal across types (True == 1): keep them apart
+    return (kind.__name__, value)
+
+
+def as_recurrence(value: Optional[Mapping]) -> Optional[Recurrence]:
+    """``None`` stays ``None``; dicts become the shared ``Recurrence``."""
+    if value is None or type(value) is Recurrence:
+        return value
+    return Recurrence.from_dict(value)
+
+
+class ScheduleEntry(_SlotRecord):
+    """One schedule (a value of ``SchedulerManager.jobs``)."""
+
+    __slots__ = ("id", "name", "hour", "minute", "meeting_id", "password", "zoom_link", "enabled", "recurrence")
+    FIELDS = ("id", "name", "hour", "minute", "meeting_id", "password", "zoom_link", "enabled", "recurrence")
+
+    def __init__(self, id: Optional[str] = None, name: str = "", hour: int = 0, minute: int = 0,
+                 meeting_id: str = "", password: str = "", zoom_link: str = "", enabled: bool = True,
+                 recurrence: Optional[Mapping] = None):
+        self.id = id
+        self.name = intern_text(name)
+        self.hour = hour
+        self.minute = minute
+        self.meeting_id = intern_text(meeting_id)
+        self.password = intern_text(password)
+        self.zoom_link = intern_text(zoom_link)
+        self.enabled = enabled
+        self.recurrence = as_recurrence(recurrence)
+        self._extra = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "ScheduleEntry":
+        """Entry with exactly the keys of ``data`` (a record from a store or importer)."""
+        # Unrolled _init: this runs once per schedule on every load
+        entry = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            if key in _INTERNED:
+                value = intern_text(value)
+            elif key == "recurrence":
+                value = as_recurrence(value)
+            elif key not in _ENTRY_FIELDS:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            setattr(entry, key, value)
+        entry._extra = extra
+        return entry
+
+    def _convert(self, key: str, value: Any) -> Any:
+        if key == "recurrence":
+            return as_recurrence(value)
+        return intern_text(value) if key in _INTERNED else value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, self._convert(key, value))
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def copy(self) -> "ScheduleEntry":
+        clone = ScheduleEntry.__new__(ScheduleEntry)
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                setattr(clone, key, getattr(self, key))
+        clone._extra = dict(self._extra) if self._extra is not None else None
+        return clone
+
+    def __deepcopy__(self, memo):
+        # Strings are immutable and rules are shared and immutable
+        return self.copy()
+
+    __copy__ = copy
+
+
+_INTERNED = frozenset(INTERNED_FIELDS)
+_ENTRY_FIELDS = ScheduleEntry._FIELD_SET
+
+
+def to_plain(value: Any) -> Dict[str, Any]:
+    """``json.dumps(..., default=to_plain)`` hook for the record classes above."""
+    if isinstance(value, _SlotRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
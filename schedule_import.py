@@ -0,0 +1,475 @@
+"""Bulk import of schedules from CSV and iCalendar (``.ics``) files.
+
+Both readers stream: the file is read line by line and every event becomes a
+schedule record (same shape as in ``zoom_schedule.json``) as soon as it is
+complete, so ``SchedulerManager.add_schedules(ScheduleImporter(path))``
+registers a whole semester in one batch without building the list first.
+
+iCalendar
+    Each VEVENT becomes one schedule; ``UID`` is used as the job id, so
+    importing the same calendar again updates instead of duplicating.
+    ``RRULE`` is mapped onto the existing recurrence shapes:
+
+    =====================================  ================================
+    FREQ=DAILY                             'daily' / custom every N 'ngày'
+    FREQ=WEEKLY (BYDAY)                    'weekly' / 'weekdays' / custom
+                                           every N 'tuần'
+    FREQ=MONTHLY (same day of month)       custom every N 'tháng'
+    FREQ=YEARLY (same day and month)       custom every N 'năm'
+    =====================================  ================================
+
+    ``UNTIL``/``COUNT`` become ``end_date``; ``EXDATE`` becomes
+    ``details['exclude_dates']``. A rule starting in the future is stored as a
+    custom rule anchored on its first day so it does not fire earlier. An
+    event with ``RECURRENCE-ID`` (one moved occurrence) is imported as a
+    'once' schedule and its original day is excluded from the series; for
+    that reason recurring events are held back until the end of the file
+    (one-off events, the bulk of a timetable, are still streamed).
+    Rules the recurrence model cannot express (e.g. "2nd Tuesday of the
+    month") are reported in ``errors`` and skipped.
+
+CSV
+    One row per schedule, header required. Columns (case-insensitive):
+    ``name, meeting_id, password, zoom_link, time`` (``HH:MM``, or ``hour`` and
+    ``minute``), ``type`` (once/daily/weekly/weekdays/custom), ``date`` (for
+    'once'), ``days`` (``0,2`` or ``MO,WE`` or ``T2,T4``), ``interval``,
+    ``unit``, ``start_date``, ``end_date``, ``exclude`` (dates separated by
+    ``;``) and ``id``. Alternatively ``start`` plus ``rrule`` (and ``exdate``)
+    columns use the iCalendar mapping above.
+
+One-off events already in the past are skipped (counted in ``skipped``).
+Text fields of every record are interned (``schedule_entry.intern_record``).
+"""
+import csv
+import hashlib
+import os
+import re
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from recurrence import compile_recurrence
+from schedule_entry import intern_record
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+ProgressCallback = Callable[[int, int, int], None]
+
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6,
+             "T2": 0, "T3": 1, "T4": 2, "T5": 3, "T6": 4, "T7": 5, "CN": 6}
+_UNITS = {"day": "ngày", "days": "ngày", "ngày": "ngày", "week": "tuần", "weeks": "tuần", "tuần": "tuần",
+          "month": "tháng", "months": "tháng", "tháng": "tháng", "year": "năm", "years": "năm", "năm": "năm"}
+_ZOOM_LINK = re.compile(r"https?://[\w.-]*zoom\.us/(?:j|w|my)/[^\s\"'<>\\,;]+", re.IGNORECASE)
+_MEETING_IN_LINK = re.compile(r"/(?:j|w)/(\d{9,12})")
+_PWD_IN_LINK = re.compile(r"[?&]pwd=([^&#\s]+)")
+_MEETING_TEXT = re.compile(r"(?:Meeting ID|ID cuộc họp)\s*:?\s*(\d[\d ]{7,14}\d)", re.IGNORECASE)
+_PASSCODE_TEXT = re.compile(r"(?:Passcode|Password|Mật mã|Mật khẩu)\s*:?\s*(\S+)", re.IGNORECASE)
+_TEXT_ESCAPES = re.compile(r"\\([\\;,nN])")
+
+
+class ScheduleImportError(ValueError):
+    """An event or row that cannot be turned into a schedule."""
+
+
+# --- value parsing --------------------------------------------------------
+
+def _local_naive(value: datetime) -> datetime:
+    """Aware -> naive local time (what the scheduler uses); naive values are kept."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def parse_ics_datetime(value: str, tzid: Optional[str] = None) -> Tuple[datetime, bool]:
+    """``20250901T080000[Z]`` or ``20250901`` -> (naive local datetime, is_date_only)."""
+    value = value.strip()
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d"), True
+    utc = value.endswith("Z")
+    moment = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    if utc:
+        return _local_naive(moment.replace(tzinfo=timezone.utc)), False
+    if tzid and ZoneInfo is not None:
+        try:
+            return _local_naive(moment.replace(tzinfo=ZoneInfo(tzid))), False
+        except Exception:
+            pass  # Unknown zone name (e.g. Windows names): treat as floating local time
+    return moment, False
+
+
+def _parse_days(value: str) -> List[int]:
+    days = []
+    for token in re.split(r"[,;\s]+", value.strip()):
+        if not token:
+            continue
+        token = token.upper()
+        if token.isdigit():
+            days.append(int(token) % 7)
+        elif token in _WEEKDAYS:
+            days.append(_WEEKDAYS[token])
+        else:
+            # "2TU" (thứ Ba thứ hai trong tháng) không có trong mô hình lặp lại
+            raise ScheduleImportError(f"Thứ không hợp lệ hoặc không hỗ trợ: {token}")
+    return sorted(set(days))
+
+
+def parse_moment(value: str) -> datetime:
+    """ISO (``2025-09-01 08:00``) or iCalendar (``20250901T080000Z``) date-time, as naive local time."""
+    value = value.strip()
+    if re.fullmatch(r"\d{8}(T\d{6}Z?)?", value):
+        return parse_ics_datetime(value)[0]
+    return _local_naive(datetime.fromisoformat(value))
+
+
+def _parse_date_list(value: str) -> List[str]:
+    return [datetime.fromisoformat(part.strip()).date().isoformat()
+            for part in re.split(r"[;\s]+", value.strip()) if part.strip()]
+
+
+# --- RRULE -> recurrence dict ----------------------------------------------
+
+def rrule_to_recurrence(rrule: str, start: datetime, exdates: Iterable[date] = (),
+                        today: Optional[date] = None) -> Dict[str, Any]:
+    """Map an RRULE (starting at ``start``) onto the app's recurrence dict."""
+    today = today or date.today()
+    parts = dict(part.split("=", 1) for part in rrule.strip().split(";") if "=" in part)
+    freq = parts.get("FREQ", "").upper()
+    interval = int(parts.get("INTERVAL", "1") or 1)
+    unsupported = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "BYMONTH", "UNTIL", "COUNT", "WKST"}
+    if unsupported:
+        raise ScheduleImportError(f"RRULE không hỗ trợ: {';'.join(sorted(unsupported))}")
+    days = _parse_days(parts["BYDAY"]) if parts.get("BYDAY") else None
+    future = start.date() > today
+    details: Dict[str, Any] = {}
+
+    if freq == "DAILY" and days is None:
+        if interval == 1 and not future:
+            recurrence: Dict[str, Any] = {"type": "daily"}
+        else:
+            recurrence = {"type": "custom"}
+            details.update(unit="ngày", interval=interval)
+    elif freq in ("DAILY", "WEEKLY"):
+        if freq == "DAILY" and interval != 1:
+            raise ScheduleImportError("RRULE DAILY có BYDAY và INTERVAL > 1")
+        days = days if days is not None else [start.weekday()]
+        if interval == 1 and not future:
+            recurrence = {"type": "weekdays"} if days == [0, 1, 2, 3, 4] else {"type": "weekly"}
+            if recurrence["type"] == "weekly":
+                details["days_of_week"] = days
+        else:
+            recurrence = {"type": "custom"}
+            details.update(unit="tuần", interval=interval, days_of_week=days)
+    elif freq == "MONTHLY":
+        if days is not None or parts.get("BYMONTHDAY", str(start.day)) != str(start.day):
+            raise ScheduleImportError("Chỉ hỗ trợ RRULE MONTHLY lặp vào đúng ngày của DTSTART")
+        recurrence = {"type": "custom"}
+        details.update(unit="tháng", interval=interval)
+    elif freq == "YEARLY":
+        if (days is not None or parts.get("BYMONTHDAY", str(start.day)) != str(start.day)
+                or parts.get("BYMONTH", str(start.month)) != str(start.month)):
+            raise ScheduleImportError("Chỉ hỗ trợ RRULE YEARLY lặp vào đúng ngày tháng của DTSTART")
+        recurrence = {"type": "custom"}
+        details.update(unit="năm", interval=interval)
+    else:
+        raise ScheduleImportError(f"RRULE FREQ không hỗ trợ: {freq or '(trống)'}")
+
+    if recurrence["type"] == "custom":
+        details["start_date"] = start.date().isoformat()
+    if parts.get("UNTIL"):
+        until, date_only = parse_ics_datetime(parts["UNTIL"])
+        details["end_date"] = (until.replace(hour=23, minute=59) if date_only else until).isoformat()
+    excluded = sorted({day.isoformat() for day in exdates})
+    if excluded:
+        details["exclude_dates"] = excluded
+    if details:
+        recurrence["details"] = details
+    if parts.get("COUNT"):
+        details["end_date"] = _nth_fire(recurrence, start, int(parts["COUNT"])).isoformat()
+        recurrence["details"] = details
+    return recurrence
+
+
+def _nth_fire(recurrence: Dict[str, Any], start: datetime, count: int) -> datetime:
+    # COUNT includes occurrences later removed by EXDATE (RFC 5545), so count without them,
+    # on a rule bounded to start at DTSTART.
+    if recurrence["type"] == "custom":
+        details = {k: v for k, v in recurrence["details"].items() if k not in ("exclude_dates", "end_date")}
+    else:
+        details = dict(_custom_equivalent(recurrence), start_date=start.date().isoformat())
+    rule = compile_recurrence({"type": "custom", "details": details}, start.hour, start.minute)
+    fire = start - timedelta(minutes=1)
+    for _ in range(max(1, count)):
+        nxt = rule.next_fire_after(fire)
+        if nxt is None:
+            break
+        fire = nxt
+    return fire
+
+
+def _custom_equivalent(recurrence: Dict[str, Any]) -> Dict[str, Any]:
+    # Bounded (start_date) equivalent of the simple shapes, used to count COUNT occurrences.
+    if recurrence["type"] == "daily":
+        return {"unit": "ngày", "interval": 1}
+    if recurrence["type"] == "weekdays":
+        days = [0, 1, 2, 3, 4]
+    else:
+        days = (recurrence.get("details") or {}).get("days_of_week", [0])
+    return {"unit": "tuần", "interval": 1, "days_of_week": days}
+
+
+# --- Zoom details from free text --------------------------------------------
+
+def zoom_details(*texts: Optional[str]) -> Dict[str, str]:
+    """Link, meeting id and passcode found in LOCATION / URL / DESCRIPTION texts."""
+    found = {"zoom_link": "", "meeting_id": "", "password": ""}
+    for text in texts:
+        if not text:
+            continue
+        if not found["zoom_link"]:
+            match = _ZOOM_LINK.search(text)
+            if match:
+                found["zoom_link"] = match.group(0)
+        if not found["meeting_id"]:
+            match = _MEETING_IN_LINK.search(found["zoom_link"]) or _MEETING_TEXT.search(text)
+            if match:
+                found["meeting_id"] = match.group(1).replace(" ", "")
+        if not found["password"]:
+            match = _PWD_IN_LINK.search(found["zoom_link"]) or _PASSCODE_TEXT.search(text)
+            if match:
+                found["password"] = match.group(1)
+    return found
+
+
+# --- readers -------------------------------------------------------------------
+
+class ScheduleImporter:
+    """Iterate schedule records from a ``.csv`` or ``.ics`` file (see module docstring).
+
+    After iteration: ``imported``, ``skipped`` (past one-off events) and
+    ``errors`` (``[(line, message), ...]``) describe the outcome.
+    ``progress(bytes_read, total_bytes, records)`` is called every
+    ``progress_every`` records.
+    """
+
+    def __init__(self, path, kind: Optional[str] = None, progress: Optional[ProgressCallback] = None,
+                 now: Optional[datetime] = None, progress_every: int = 1000):
+        self.path = Path(path)
+        self.kind = (kind or self.path.suffix.lstrip(".")).lower()
+        if self.kind not in ("csv", "ics"):
+            raise ValueError(f"Định dạng không hỗ trợ: {self.path.suffix or kind}")
+        self.progress = progress
+        self.progress_every = max(1, progress_every)
+        self.now = now or datetime.now()
+        self.imported = 0
+        self.skipped = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.bytes_read = 0
+        self.total_bytes = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.total_bytes = os.path.getsize(self.path)
+        with open(self.path, "rb") as f:
+            lines = self._lines(f)
+            records = self._csv(lines) if self.kind == "csv" else self._ics(lines)
+            for record in records:
+                self.imported += 1
+                if self.progress and self.imported % self.progress_every == 0:
+                    self.progress(self.bytes_read, self.total_bytes, self.imported)
+                yield intern_record(record)
+        if self.progress:
+            self.progress(self.total_bytes, self.total_bytes, self.imported)
+
+    def _lines(self, f) -> Iterator[str]:
+        first = True
+        for raw in f:
+            self.bytes_read += len(raw)
+            line = raw.decode("utf-8", errors="replace")
+            if first:
+                line, first = line.lstrip("﻿"), False
+            yield line
+
+    # .ics ------------------------------------------------------------------
+
+    def _unfolded(self, lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """Join RFC 5545 folded lines; yields (line number, logical line)."""
+        pending, pending_no = None, 0
+        for number, line in enumerate(lines, 1):
+            line = line.rstrip("\r\n")
+            if line[:1] in (" ", "\t") and pending is not None:
+                pending += line[1:]
+                continue
+            if pending is not None:
+                yield pending_no, pending
+            pending, pending_no = line, number
+        if pending is not None:
+            yield pending_no, pending
+
+    def _ics(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        masters: Dict[str, Tuple[int, Dict[str, Any]]] = {}   # recurring events, held until the end
+        moved: Dict[str, List[date]] = {}                       # UID -> days replaced by RECURRENCE-ID
+        event: Optional[Dict[str, Any]] = None
+        start_line = 0
+        for number, line in self._unfolded(lines):
+            if line == "BEGIN:VEVENT":
+                event, start_line = {"EXDATE": []}, number
+                continue
+            if event is None:
+                continue
+            if line == "END:VEVENT":
+                try:
+                    record = self._event(event, masters, moved, start_line)
+                except (ScheduleImportError, ValueError, KeyError) as e:
+                    self.errors.append((start_line, str(e)))
+                    record = None
+                event = None
+                if record is not None:
+                    yield record
+                continue
+            name, _, value = line.partition(":")
+            name, *params = name.split(";")
+            param = dict(p.split("=", 1) for p in params if "=" in p)
+            name = name.upper()
+            if name == "EXDATE":
+                event["EXDATE"].extend((v, param.get("TZID")) for v in value.split(","))
+            elif name in ("DTSTART", "RECURRENCE-ID"):
+                event[name] = (value, param.get("TZID"))
+            elif name in ("UID", "SUMMARY", "RRULE", "LOCATION", "URL", "DESCRIPTION", "STATUS"):
+                event[name] = value
+        for uid, (number, record) in masters.items():
+            days = moved.get(uid)
+            if days:
+                details = record["recurrence"].setdefault("details", {})
+                details["exclude_dates"] = sorted(set(details.get("exclude_dates", [])) |
+                                                  {day.isoformat() for day in days})
+            yield record
+
+    def _event(self, event: Dict[str, Any], masters, moved, number: int) -> Optional[Dict[str, Any]]:
+        uid = event.get("UID")
+        if "RECURRENCE-ID" in event and uid:
+            # Buổi bị dời hoặc hủy: ngày gốc không còn thuộc chuỗi lặp
+            original, _ = parse_ics_datetime(*event["RECURRENCE-ID"])
+            moved.setdefault(uid, []).append(original.date())
+        if event.get("STATUS", "").upper() == "CANCELLED":
+            self.skipped += 1
+            return None
+        if "DTSTART" not in event:
+            raise ScheduleImportError("VEVENT thiếu DTSTART")
+        start, date_only = parse_ics_datetime(*event["DTSTART"])
+        if date_only:
+            raise ScheduleImportError("Sự kiện cả ngày (không có giờ bắt đầu)")
+        uid = uid or hashlib.sha1(f"{event.get('SUMMARY')}{start}".encode()).hexdigest()
+        record = {
+            "id": uid,
+            "name": _unescape(event.get("SUMMARY", "")),
+            "hour": start.hour,
+            "minute": start.minute,
+            "enabled": True,
+            **zoom_details(_unescape(event.get("LOCATION", "")), event.get("URL"),
+                           _unescape(event.get("DESCRIPTION", ""))),
+        }
+        if "RECURRENCE-ID" in event:
+            record["id"] = f"{uid}/{moved[uid][-1]:%Y%m%d}"
+        elif event.get("RRULE"):
+            exdates = [parse_ics_datetime(v, tz)[0].date() for v, tz in event["EXDATE"]]
+            record["recurrence"] = rrule_to_recurrence(event["RRULE"], start, exdates, self.now.date())
+            if self._expired(record):
+                self.skipped += 1
+            else:
+                masters[uid] = (number, record)
+            return None
+        return self._once(record, start)
+
+    # .csv ------------------------------------------------------------------
+
+    def _csv(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [column.strip().lower() for column in header]
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            values = {column: cell.strip() for column, cell in zip(columns, row)}
+            try:
+                record = self._row(values)
+            except (ScheduleImportError, ValueError, KeyError) as e:
+                self.errors.append((reader.line_num, str(e)))
+                continue
+            if record is not None:
+                yield record
+
+    def _row(self, row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        get = lambda *names: next((row[n] for n in names if row.get(n)), "")  # noqa: E731
+        record: Dict[str, Any] = {
+            "id": get("id") or str(uuid.uuid4()),
+            "name": get("name", "tên"),
+            "meeting_id": get("meeting_id", "meeting id").replace(" ", ""),
+            "password": get("password", "passcode", "mật khẩu"),
+            "zoom_link": get("zoom_link", "link"),
+            "enabled": get("enabled").lower() not in ("0", "false", "no", "không"),
+        }
+        if not (record["meeting_id"] or record["zoom_link"]):
+            record.update({k: v for k, v in zoom_details(get("description", "location")).items() if v})
+
+        if get("start"):
+            start = parse_moment(get("start"))
+            record["hour"], record["minute"] = start.hour, start.minute
+            if not get("rrule"):
+                return self._once(record, start)
+            exdates = [date.fromisoformat(day) for day in _parse_date_list(get("exdate", "exclude"))]
+            rrule = re.sub(r"^RRULE:", "", get("rrule"), flags=re.IGNORECASE)
+            record["recurrence"] = rrule_to_recurrence(rrule, start, exdates, self.now.date())
+            return self._checked(record)
+
+        hour, minute = (get("time").split(":")[:2] if get("time") else (get("hour"), get("minute") or "0"))
+        record["hour"], record["minute"] = int(hour), int(minute)
+        rec_type = (get("type") or ("once" if get("date", "run_date") else "daily")).lower()
+        if rec_type == "once":
+            day = datetime.fromisoformat(get("date", "run_date"))
+            return self._once(record, day.replace(hour=record["hour"], minute=record["minute"]))
+        details: Dict[str, Any] = {}
+        if rec_type == "weekly":
+            details["days_of_week"] = _parse_days(get("days")) if get("days") else [0]
+        elif rec_type == "custom":
+            unit = _UNITS.get(get("unit").lower() or "tuần")
+            if unit is None:
+                raise ScheduleImportError(f"Đơn vị lặp không hợp lệ: {get('unit')}")
+            details.update(unit=unit, interval=int(get("interval") or 1),
+                           start_date=(datetime.fromisoformat(get("start_date")).date()
+                                       if get("start_date") else self.now.date()).isoformat())
+            if get("days"):
+                details["days_of_week"] = _parse_days(get("days"))
+        elif rec_type not in ("daily", "weekdays"):
+            raise ScheduleImportError(f"Kiểu lặp không hợp lệ: {rec_type}")
+        if get("end_date"):
+            details["end_date"] = datetime.fromisoformat(get("end_date")).isoformat()
+        if get("exclude"):
+            details["exclude_dates"] = _parse_date_list(get("exclude"))
+        record["recurrence"] = {"type": rec_type, "details": details} if details else {"type": rec_type}
+        return self._checked(record)
+
+    def _expired(self, record: Dict[str, Any]) -> bool:
+        end = (record["recurrence"].get("details") or {}).get("end_date")
+        return bool(end) and datetime.fromisoformat(end) <= self.now
+
+    def _checked(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self._expired(record):
+            self.skipped += 1
+            return None
+        return record
+
+    def _once(self, record: Dict[str, Any], moment: datetime) -> Optional[Dict[str, Any]]:
+        if moment <= self.now:
+            self.skipped += 1
+            return None
+        record["recurrence"] = {"type": "once", "run_date": moment.replace(second=0, microsecond=0).isoformat()}
+        return record
+
+
+def _unescape(text: str) -> str:
+    return _TEXT_ESCAPES.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
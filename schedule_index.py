@@ -0,0 +1,294 @@
+"""On-disk index of a binary snapshot, ordered by next fire time.
+
+``zoom_schedule.zsx`` sits next to ``zoom_schedule.zsb``::
+
+    header     magic "ZASX", version u16, flags u16, entry count u32,
+               snapshot size u64, snapshot mtime_ns i64, built_at f64
+                                                               (40 bytes)
+    times      int64[count]   next fire (epoch seconds), ascending
+    positions  uint32[count]  record position in the snapshot
+
+Only enabled schedules that still have a future fire are listed. The file is
+memory-mapped and both arrays are used in place, so opening it and finding
+"the first fire after now" (a bisect over ``times``) cost the same for ten or
+a million schedules. That lets ``SchedulerManager.load_indexed`` arm just the
+earliest few jobs at startup and pull more from the index as time advances.
+
+``OverlayJobs`` is the ``jobs`` mapping used in that mode: reads fall through
+to the (lazily decoded) snapshot, writes and deletes go to an in-memory
+overlay.
+"""
+import bisect
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from binary_snapshot import FLAG_ENABLED, NO_STRING, SnapshotError, SnapshotReader
+from recurrence import compile_recurrence
+
+MAGIC = b"ZASX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQqd4x")
+
+
+class FireTimeCalculator:
+    """Next fire per raw snapshot record, memoized by (recurrence string, hour, minute)."""
+
+    def __init__(self, reader: SnapshotReader):
+        self._reader = reader
+        self._rules: Dict[Tuple[int, int, int], Any] = {}
+
+    def next_fire(self, fields: tuple, after: datetime) -> Optional[datetime]:
+        rec_ref, hour, minute, flags = fields[5], fields[6], fields[7], fields[8]
+        if not flags & FLAG_ENABLED or rec_ref == NO_STRING:
+            return None
+        key = (rec_ref, hour, minute)
+        rule = self._rules.get(key)
+        if rule is None:
+            rule = self._rules[key] = compile_recurrence(json.loads(self._reader.string(rec_ref)), hour, minute)
+        return rule.next_fire_after(after)
+
+
+def write_index(snapshot_path, index_path, now: Optional[datetime] = None) -> int:
+    """Build the fire-time index of ``snapshot_path``; returns the number of entries."""
+    now = now or datetime.now()
+    reader = SnapshotReader(snapshot_path)
+    try:
+        calc = FireTimeCalculator(reader)
+        # Records sharing a rule and a time share the answer: memoize per rule key.
+        memo: Dict[Tuple[int, int, int], Optional[int]] = {}
+        entries: List[Tuple[int, int]] = []
+        for position, fields in reader.iter_records():
+            key = (fields[5], fields[6], fields[7]) if fields[8] & FLAG_ENABLED else None
+            if key is None:
+                continue
+            ts = memo.get(key, -1)
+            if ts == -1:
+                fire = calc.next_fire(fields, now)
+                ts = memo[key] = int(fire.timestamp()) if fire else None
+            if ts is not None:
+                entries.append((ts, position))
+    finally:
+        reader.close()
+    entries.sort()
+    count = len(entries)
+    stat = os.stat(snapshot_path)
+    header = HEADER.pack(MAGIC, VERSION, 0, count, stat.st_size, stat.st_mtime_ns, now.timestamp())
+    index_path = Path(index_path)
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(struct.pack(f"<{count}q", *(ts for ts, _ in entries)))
+        f.write(struct.pack(f"<{count}I", *(pos for _, pos in entries)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, index_path)
+    return count
+
+
+class FireIndex:
+    """Memory-mapped fire-time index (see module docstring)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotError(f"{self.path.name}: file too short")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _flags, count, self.snapshot_size, self.snapshot_mtime_ns, self.built_at = \
+            HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION or size < HEADER.size + 12 * count:
+            self._mm.close()
+            raise SnapshotError(f"{self.path.name}: not a v{VERSION} schedule index")
+        self.count = count
+        times_at, positions_at = HEADER.size, HEADER.size + 8 * count
+        self._view = memoryview(self._mm)
+        if sys.byteorder == "little":
+            self.times = self._view[times_at:positions_at].cast("q")
+            self.positions = self._view[positions_at:positions_at + 4 * count].cast("I")
+        else:
+            self.times = struct.unpack_from(f"<{count}q", self._mm, times_at)
+            self.positions = struct.unpack_from(f"<{count}I", self._mm, positions_at)
+
+    def matches(self, snapshot_path) -> bool:
+        """True when the index was built from this exact snapshot file."""
+        try:
+            stat = os.stat(snapshot_path)
+        except OSError:
+            return False
+        return stat.st_size == self.snapshot_size and stat.st_mtime_ns == self.snapshot_mtime_ns
+
+    def first_at_or_after(self, ts: float) -> int:
+        return bisect.bisect_left(self.times, ts)
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        for view in (self.times, self.positions):
+            if isinstance(view, memoryview):
+                view.release()
+        self._view.release()
+        self._mm.close()
+
+
+class ArmQueue:
+    """Pending (not yet armed) schedules in fire order: the index tail merged
+    with schedules whose fire time had to be recomputed after startup."""
+
+    def __init__(self, index: FireIndex, start: int):
+        self.index = index
+        self.cursor = start
+        self._spill: List[Tuple[int, int]] = []
+
+    def push(self, ts: int, position: int) -> None:
+        heapq.heappush(self._spill, (ts, position))
+
+    def peek_time(self) -> Optional[int]:
+        candidates = []
+        if self.cursor < self.index.count:
+            candidates.append(self.index.times[self.cursor])
+        if self._spill:
+            candidates.append(self._spill[0][0])
+        return min(candidates) if candidates else None
+
+    def pop(self) -> Optional[Tuple[int, int]]:
+        from_index = self.cursor < self.index.count
+        if self._spill and (not from_index or self._spill[0][0] < self.index.times[self.cursor]):
+            return heapq.heappop(self._spill)
+        if not from_index:
+            return None
+        entry = (self.index.times[self.cursor], self.index.positions[self.cursor])
+        self.cursor += 1
+        return entry
+
+    def __len__(self) -> int:
+        return self.index.count - self.cursor + len(self._spill)
+
+
+class OverlayJobs(MutableMapping):
+    """``jobs`` mapping over a read-only base (the lazy snapshot) plus local edits."""
+
+    def __init__(self, base: Mapping[str, Any]):
+        self._base = base
+        self._overlay: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+        self._added: Set[str] = set()       # overlay keys absent from the base
+
+    def touched(self, job_id: str) -> bool:
+        """True if the job was edited or removed since the snapshot was loaded."""
+        return job_id in self._overlay or job_id in self._deleted
+
+    def __getitem__(self, job_id: str) -> Any:
+        if job_id in self._overlay:
+            return self._overlay[job_id]
+        if job_id in self._deleted:
+            raise KeyError(job_id)
+        return self._base[job_id]
+
+    def __contains__(self, job_id) -> bool:
+        if job_id in self._overlay:
+            return True
+        return job_id not in self._deleted and job_id in self._base
+
+    def peek(self, job_id: str) -> Any:
+        """Like ``get``, but a base record read this way is not kept decoded (see ``LazyRecords.peek``)."""
+        if job_id in self._overlay:
+            return self._overlay[job_id]
+        if job_id in self._deleted:
+            return None
+        peek = getattr(self._base, "peek", self._base.get)
+        return peek(job_id)
+
+    def __setitem__(self, job_id: str, value: Any) -> None:
+        if job_id not in self._overlay and job_id not in self._base:
+            self._added.add(job_id)
+        self._deleted.discard(job_id)
+        self._overlay[job_id] = value
+
+    def __delitem__(self, job_id: str) -> None:
+        if job_id not in self:
+            raise KeyError(job_id)
+        self._overlay.pop(job_id, None)
+        if job_id in self._added:
+            self._added.discard(job_id)
+        else:
+            self._deleted.add(job_id)
+
+    def __iter__(self) -> Iterator[str]:
+        for job_id in self._base:
+            if job_id not in self._deleted:
+                yield job_id
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return len(self._base) - len(self._deleted) + len(self._added)
+
+    def items(self):
+        overlay, deleted = self._overlay, self._deleted
+        for job_id, record in self._base.items():
+            if job_id in deleted:
+                continue
+            yield job_id, overlay.get(job_id, record)
+        for job_id in list(self._added):
+            yield job_id, overlay[job_id]
+
+    @property
+    def base(self) -> Mapping[str, Any]:
+        return self._base
+
+    def layout(self) -> Iterator[Union[int, Tuple[str, Any]]]:
+        """``items()`` order for ``encode_snapshot_from``: base positions of untouched records, else pairs.
+
+        Needs a ``LazyRecords`` base; untouched records are not decoded.
+        """
+        overlay, deleted = self._overlay, self._deleted
+        touched = {self._base.position_of(job_id): job_id
+                   for job_id in (*overlay, *deleted) if job_id not in self._added}
+        for position in range(len(self._base)):
+            job_id = touched.get(position)
+            if job_id is None:
+                yield position
+            elif job_id not in deleted:
+                yield job_id, overlay[job_id]
+        for job_id in list(self._added):
+            yield job_id, overlay[job_id]
+
+    def times(self) -> Iterator[Tuple[str, int, int]]:
+        """``(job_id, hour, minute)`` in ``items()`` order; untouched base records are not decoded
+        when the base has ``times()`` (``LazyRecords``)."""
+        base_times = getattr(self._base, "times", None)
+        if base_times is None:
+            base = ((job_id, record.get("hour", 0), record.get("minute", 0)) for job_id, record in self._base.items())
+        elif not (self._overlay or self._deleted):
+            return base_times()
+        else:
+            base = base_times()
+        return self._merge_times(base)
+
+    def _merge_times(self, base: Iterator[Tuple[str, int, int]]) -> Iterator[Tuple[str, int, int]]:
+        overlay, deleted = self._overlay, self._deleted
+        for job_id, hour, minute in base:
+            if job_id in deleted:
+                continue
+            record = overlay.get(job_id)
+            if record is not None:
+                hour, minute = record.get("hour", 0), record.get("minute", 0)
+            yield job_id, hour, minute
+        for job_id in list(self._added):
+            record = overlay[job_id]
+            yield job_id, record.get("hour", 0), record.get("minute", 0)
+
+    def copy(self) -> "OverlayJobs":
+        clone = OverlayJobs(self._base)
+        clone._overlay = dict(self._overlay)
+        clone._deleted = set(self._deleted)
+        clone._added = set(self._added)
+        return clone
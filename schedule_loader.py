@@ -0,0 +1,293 @@
+"""Streaming, fault-isolating reader for ``zoom_schedule.json``.
+
+``json.load`` needs the whole document in memory and gives up on the first
+syntax error. ``StreamingJsonLoader`` reads the file in chunks and decodes one
+schedule at a time, so only the record being parsed is buffered. It accepts
+both layouts found in the wild:
+
+* ``{"<job_id>": {...}, ...}`` — what the app writes;
+* ``[{...}, {...}]`` — what ``create_test_schedule.py`` and hand-written
+  files use. Entries without an ``id`` get one derived from their content
+  (``derived_id``), so reading the same file twice gives the same ids.
+
+A record that is not valid JSON (or not an object) is written to the
+quarantine side file (``zoom_schedule.quarantine.jsonl``, one JSON line per
+record) and loading carries on with the next one. If the document structure
+itself is broken (truncated file, garbage between records), everything from
+that point is quarantined as raw text and the records read so far are kept.
+
+Repeated text fields (links, meeting ids, passcodes, names) are interned as
+records are read (``schedule_entry.intern_record``), so a large file does not
+hold one copy of the same class link per schedule.
+"""
+import codecs
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from schedule_entry import intern_record
+
+_WS = re.compile(r"[ \t\n\r]*")
+_STRUCTURAL = re.compile(r'["\[\]{},]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_MISSING = object()
+_ID_NAMESPACE = uuid.UUID("6f3c2a1e-5b7d-4c8e-9a0f-1d2e3b4c5a69")
+
+ProgressCallback = Callable[[int, int, int], None]
+
+
+def quarantine_path_for(path) -> Path:
+    """``zoom_schedule.json`` / ``.db`` / ``.zsb`` -> ``zoom_schedule.quarantine.jsonl``."""
+    path = Path(path)
+    return path.with_name(path.stem + ".quarantine.jsonl")
+
+
+def derived_id(record: Dict[str, Any], occurrence: int = 0) -> str:
+    """Stable id for a list entry without one: a UUID of its content (``occurrence``
+    tells identical entries of one file apart)."""
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return str(uuid.uuid5(_ID_NAMESPACE, f"{canonical}#{occurrence}" if occurrence else canonical))
+
+
+class Quarantine:
+    """Append-only side file for records that could not be loaded. Opened on first use."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+
+    def add(self, key: Optional[str], error: str, record: Any = _MISSING, raw: Optional[str] = None,
+            source: Optional[str] = None) -> None:
+        entry: Dict[str, Any] = {"at": datetime.now().isoformat(timespec="seconds"), "key": key, "error": error}
+        if source:
+            entry["source"] = source
+        if record is not _MISSING:
+            entry["record"] = record
+        if raw is not None:
+            entry["raw"] = raw
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Fatal(Exception):
+    """The document structure is broken at the current position."""
+
+
+class StreamingJsonLoader:
+    """Iterate ``(job_id, record)`` pairs of a schedule file without loading it whole.
+
+    ``progress(bytes_read, total_bytes, records)`` is called after every chunk.
+    After iteration, ``loaded``, ``quarantined``, ``rejected_keys`` (job ids of
+    quarantined records, when the layout has them) and ``fatal`` (the
+    structural error message, or None) describe the outcome.
+    """
+
+    def __init__(self, path, quarantine: Optional[Quarantine] = None,
+                 progress: Optional[ProgressCallback] = None, chunk_size: int = 1 << 16):
+        self.path = Path(path)
+        self.quarantine = quarantine
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.loaded = 0
+        self.quarantined = 0
+        self.rejected_keys: List[str] = []
+        self._derived: Dict[str, int] = {}   # derived id -> identical entries seen so far
+        self.fatal: Optional[str] = None
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._file = None
+        self._text = None
+
+    # --- buffer -----------------------------------------------------------
+
+    def _fill(self) -> bool:
+        """Read one more chunk; False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._buf += self._text.decode(b"", final=True)
+            self._eof = True
+            return False
+        self.bytes_read += len(chunk)
+        # Drop what has been consumed so the buffer stays the size of one record.
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += self._text.decode(chunk)
+        if self.progress:
+            self.progress(self.bytes_read, self.total_bytes, self.loaded)
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character ('' at end of file), without consuming it."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill():
+                return self._buf[self._pos:self._pos + 1]
+
+    def _decode(self) -> Tuple[Any, Optional[str]]:
+        """Decode the value at the cursor: ``(value, None)`` or ``(None, raw_text)`` if malformed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                end = self._value_end()
+                if end is None:
+                    if self._fill():
+                        continue
+                    raise _Fatal("Tệp bị cắt cụt giữa một bản ghi")
+                raw = self._buf[self._pos:end].strip()
+                self._pos = end
+                return None, raw
+            # A number may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value, None
+
+    def _value_end(self) -> Optional[int]:
+        """End of the (malformed) value at the cursor: the ',' or closing bracket
+        that follows it at nesting depth 0. None if it is not in the buffer yet."""
+        buf, depth, i = self._buf, 0, self._pos
+        while True:
+            m = _STRUCTURAL.search(buf, i)
+            if m is None:
+                return None
+            ch, i = m.group(), m.start()
+            if ch == '"':
+                s = _STRING.match(buf, i)
+                if s is None:
+                    return None
+                i = s.end()
+                continue
+            if ch in "[{":
+                depth += 1
+            elif ch in "]}":
+                if depth == 0:
+                    return i
+                depth -= 1
+            elif depth == 0:
+                return i
+            i += 1
+
+    # --- document ---------------------------------------------------------
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if not self.path.exists():
+            return
+        self.total_bytes = os.path.getsize(self.path)
+        self._text = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        with open(self.path, "rb") as self._file:
+            try:
+                yield from self._document()
+            except _Fatal as e:
+                self.fatal = str(e)
+                self._quarantine_tail()
+            finally:
+                if self.quarantine:
+                    self.quarantine.close()
+        if self.progress:
+            self.progress(self.bytes_read, self.total_bytes, self.loaded)
+
+    def _document(self):
+        opener = self._peek()
+        if opener == "":
+            return
+        if opener not in "{[":
+            raise _Fatal("Tệp lịch không phải object hoặc mảng JSON")
+        self._pos += 1
+        keyed = opener == "{"
+        closer = "}" if keyed else "]"
+        index = 0
+        while True:
+            if self._peek() == closer:
+                self._pos += 1
+                return
+            key = self._key(index) if keyed else None
+            value, raw = self._decode()
+            result = self._accept(key, value, raw)
+            if result is not None:
+                yield result
+            index += 1
+            sep = self._peek()
+            if sep == ",":
+                self._pos += 1
+            elif sep == closer:
+                self._pos += 1
+                return
+            else:
+                raise _Fatal(f"Thiếu dấu phẩy sau bản ghi thứ {index}")
+
+    def _key(self, index: int) -> str:
+        if self._peek() != '"':
+            raise _Fatal(f"Khóa không hợp lệ ở bản ghi thứ {index + 1}")
+        key, raw = self._decode()
+        if raw is not None or self._peek() != ":":
+            raise _Fatal(f"Khóa không hợp lệ ở bản ghi thứ {index + 1}")
+        self._pos += 1
+        return key
+
+    def _accept(self, key: Optional[str], value: Any, raw: Optional[str]):
+        if raw is not None:
+            self._reject(key, "JSON không hợp lệ", raw=raw)
+            return None
+        if not isinstance(value, dict):
+            self._reject(key, "Bản ghi không phải object", record=value)
+            return None
+        if key is None:
+            key = value.get("id") if isinstance(value.get("id"), str) and value.get("id") else None
+        if key is None:
+            key = derived_id(value)
+            seen = self._derived.get(key, 0)
+            self._derived[key] = seen + 1
+            if seen:
+                key = derived_id(value, seen)
+        self.loaded += 1
+        return key, intern_record(value)
+
+    def _reject(self, key: Optional[str], error: str, record: Any = _MISSING, raw: Optional[str] = None) -> None:
+        self.quarantined += 1
+        if key is not None:
+            self.rejected_keys.append(key)
+        if self.quarantine:
+            self.quarantine.add(key, error, record=record, raw=raw, source=self.path.name)
+
+    def _quarantine_tail(self) -> None:
+        parts = []
+        while True:
+            parts.append(self._buf[self._pos:])
+            self._pos = len(self._buf)
+            if not self._fill():
+                break
+        parts.append(self._buf[self._pos:])
+        raw = "".join(parts).strip()
+        if raw:
+            self._reject(None, self.fatal, raw=raw)
+
+
+def load_schedule_file(path, quarantine: Optional[Quarantine] = None,
+                       progress: Optional[ProgressCallback] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Read a schedule file into ``{job_id: record}``; returns ``(jobs, report)``."""
+    loader = StreamingJsonLoader(path, quarantine=quarantine, progress=progress)
+    jobs = dict(loader)
+    return jobs, {"loaded": loader.loaded, "quarantined": loader.quarantined,
+                  "rejected_keys": loader.rejected_keys, "fatal": loader.fatal}
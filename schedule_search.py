@@ -0,0 +1,328 @@
+"""Secondary indexes over the schedule table: meeting, link and name.
+
+``ScheduleSearchIndex`` is kept up to date by ``SchedulerManager`` on every
+add, edit and removal (``put`` / ``discard``), so lookups never scan
+``jobs``:
+
+* meeting id -> job ids. The key is the digits of ``meeting_id``, or the id
+  found in ``zoom_link`` (``/j/<id>``, ``confno=<id>``) when the schedule
+  only has a link, so both kinds of schedule for one room are found together;
+* normalized ``zoom_link`` -> job ids (``https://us06web.zoom.us/j/1?pwd=x``
+  and ``zoom.us/j/1?pwd=x`` are the same link);
+* a sorted ``(folded name, job_id)`` list for prefix search. Names are
+  folded to lower case without Vietnamese diacritics, so "toan 10a" finds
+  "Toán 10A1". New names are appended to a pending run and merged with one
+  sort on the next name query (a bulk load does not pay an insertion per
+  record); stale pairs left by renames and removals are skipped on read and
+  dropped when they outnumber the live ones.
+
+Meetings shared by several schedules are tracked as they appear, so
+``duplicates()`` costs the number of duplicated meetings, not the table size.
+
+For the filter bar, ``search(ScheduleQuery)`` answers "name words, meeting id
+or link starting with what was typed, of this recurrence type, on/off" from
+the index alone: every word of a folded name maps to its job ids, recurrence
+types and disabled schedules are sets, and prefixes are found by bisecting
+the sorted distinct words / meeting ids / links (a few thousand in a real
+timetable) and uniting their job id sets. ``accepts(job_id, query)`` checks
+one schedule against the same query, for rows that change while a filter is
+active.
+"""
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+_NON_DIGITS = re.compile(r"\D")
+_URL = re.compile(r"(?:[a-zA-Z][\w+.-]*://)?(?:[^/?#@]*@)?([^/?#]*)([^?#]*)(?:\?([^#]*))?")
+_LINK_MEETING = re.compile(r"/(?:j|w|s|wc(?:/join)?)/(\d{9,11})\b|[?&]confno=(\d{9,11})\b")
+_MARKS = re.compile("[\u0300-\u036f]+")  # combining diacritics left by NFD
+_MEETING_QUERY = re.compile(r"[\d\s-]+")
+_LINK_CACHE_SIZE = 1 << 16
+
+Keys = Tuple[str, str, str, str, bool]   # meeting, link, folded name, recurrence type, enabled
+
+_link_cache: Dict[str, str] = {}
+
+
+def fold_name(name: Optional[str]) -> str:
+    """Case- and accent-insensitive search key: "Toán  10A" -> "toan 10a"."""
+    if not name:
+        return ""
+    if not name.isascii():
+        name = _MARKS.sub("", unicodedata.normalize("NFD", name.replace("đ", "d").replace("Đ", "D")))
+    return " ".join(name.split()).casefold()
+
+
+def normalize_meeting_id(meeting_id: Optional[str]) -> str:
+    """Digits only: "837 3806 2598" -> "83738062598"."""
+    return _NON_DIGITS.sub("", str(meeting_id)) if meeting_id else ""
+
+
+def normalize_link(link: Optional[str]) -> str:
+    """Comparable form of a Zoom link: no scheme, one host for every ``*.zoom.us``,
+    no trailing slash or fragment, query parameters sorted."""
+    if not link:
+        return ""
+    # The same class link is shared by many schedules: normalize each one once
+    normalized = _link_cache.get(link)
+    if normalized is None:
+        if len(_link_cache) >= _LINK_CACHE_SIZE:
+            _link_cache.clear()
+        normalized = _link_cache[link] = _normalize_link(link)
+    return normalized
+
+
+def _normalize_link(link: str) -> str:
+    match = _URL.match(link.strip())
+    host, path, query = match.group(1).lower(), match.group(2).rstrip("/"), match.group(3)
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(".zoom.us"):
+        host = "zoom.us"
+    if query:
+        return f"{host}{path}?{'&'.join(sorted(p for p in query.split('&') if p))}"
+    return host + path
+
+
+def meeting_key(record: Mapping[str, Any]) -> str:
+    """Meeting a schedule opens: its meeting id, else the id inside its link."""
+    key = normalize_meeting_id(record.get("meeting_id"))
+    if key:
+        return key
+    match = _LINK_MEETING.search(record.get("zoom_link") or "")
+    return (match.group(1) or match.group(2)) if match else ""
+
+
+def recurrence_type(record: Mapping[str, Any]) -> str:
+    """'once', 'daily', 'weekly', ...; a schedule without a rule counts as daily, as in the table."""
+    return (record.get("recurrence") or {}).get("type", "daily")
+
+
+class ScheduleQuery:
+    """What the filter bar asks for. Empty text, ``rec_type=None`` and ``enabled=None`` match everything.
+
+    The text is a link when it contains "/" or "zoom.us" (prefix of the
+    normalized link, or the same meeting); otherwise every word must start a
+    word of the name, and text made of digits only also matches meeting ids
+    starting with those digits ("837 38" finds 837 3806 2598).
+    """
+
+    __slots__ = ("text", "rec_type", "enabled", "words", "digits", "link", "link_meeting")
+
+    def __init__(self, text: str = "", rec_type: Optional[str] = None, enabled: Optional[bool] = None):
+        self.text = text = (text or "").strip()
+        self.rec_type = rec_type or None
+        self.enabled = enabled
+        is_link = "/" in text or "zoom.us" in text.lower()
+        self.link = normalize_link(text) if is_link else ""
+        self.link_meeting = meeting_key({"zoom_link": text}) if is_link else ""
+        self.words = () if is_link else tuple(fold_name(text).split())
+        self.digits = normalize_meeting_id(text) if not is_link and _MEETING_QUERY.fullmatch(text) else ""
+
+    def __bool__(self) -> bool:
+        return bool(self.text) or self.rec_type is not None or self.enabled is not None
+
+    def accepts(self, keys: Keys) -> bool:
+        meeting, link, name, rec_type, enabled = keys
+        if self.rec_type is not None and rec_type != self.rec_type:
+            return False
+        if self.enabled is not None and enabled != self.enabled:
+            return False
+        if self.link:
+            return link.startswith(self.link) or (bool(self.link_meeting) and meeting == self.link_meeting)
+        if self.digits and meeting.startswith(self.digits):
+            return True
+        if self.words:
+            tokens = name.split()
+            return all(any(token.startswith(word) for token in tokens) for word in self.words)
+        return not self.digits
+
+
+class ScheduleSearchIndex:
+    """Meeting / link / name-prefix lookups over ``{job_id: record}`` (see module docstring)."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self._keys: Dict[str, Keys] = {}               # job_id -> Keys
+        self._meetings: Dict[str, Set[str]] = {}
+        self._links: Dict[str, Set[str]] = {}
+        self._words: Dict[str, Set[str]] = {}          # word of a folded name -> job ids
+        self._types: Dict[str, Set[str]] = {}
+        self._disabled: Set[str] = set()
+        self._duplicated: Set[str] = set()             # meeting keys with more than one job
+        self._names: List[Tuple[str, str]] = []        # sorted; may hold stale pairs
+        self._pending: List[Tuple[str, str]] = []      # added since the last sort
+        self._sorted_keys: Dict[str, List[str]] = {}   # "meetings" / "links" / "words" -> sorted keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def rebuild(self, items: Iterable[Tuple[str, Mapping[str, Any]]]) -> None:
+        self.clear()
+        for job_id, record in items:
+            self.put(job_id, record)
+
+    def put(self, job_id: str, record: Mapping[str, Any]) -> None:
+        """Index a new schedule or re-index an edited one."""
+        keys = (meeting_key(record), normalize_link(record.get("zoom_link")), fold_name(record.get("name")),
+                recurrence_type(record), bool(record.get("enabled", False)))
+        old = self._keys.get(job_id)
+        if old == keys:
+            return
+        if old is not None:
+            self._unlink(job_id, old)
+        self._keys[job_id] = keys
+        meeting, link, name, rec_type, enabled = keys
+        if meeting:
+            ids = self._add(self._meetings, "meetings", meeting, job_id)
+            if len(ids) == 2:
+                self._duplicated.add(meeting)
+        if link:
+            self._add(self._links, "links", link, job_id)
+        for word in set(name.split()):
+            self._add(self._words, "words", word, job_id)
+        self._types.setdefault(rec_type, set()).add(job_id)
+        if not enabled:
+            self._disabled.add(job_id)
+        if old is None or old[2] != name:
+            self._pending.append((name, job_id))
+
+    def _add(self, table: Dict[str, Set[str]], kind: str, key: str, job_id: str) -> Set[str]:
+        ids = table.get(key)
+        if ids is None:
+            ids = table[key] = set()
+            self._sorted_keys.pop(kind, None)   # a new key: re-sort on the next prefix query
+        ids.add(job_id)
+        return ids
+
+    def discard(self, job_id: str) -> None:
+        old = self._keys.pop(job_id, None)
+        if old is not None:
+            self._unlink(job_id, old)
+
+    def _unlink(self, job_id: str, keys: Keys) -> None:
+        meeting, link, name, rec_type, _ = keys
+        if meeting:
+            ids = self._meetings[meeting]
+            ids.discard(job_id)
+            if len(ids) < 2:
+                self._duplicated.discard(meeting)
+            if not ids:
+                del self._meetings[meeting]
+        if link:
+            ids = self._links[link]
+            ids.discard(job_id)
+            if not ids:
+                del self._links[link]
+        for word in set(name.split()):
+            ids = self._words[word]
+            ids.discard(job_id)
+            if not ids:
+                del self._words[word]
+        self._types[rec_type].discard(job_id)
+        self._disabled.discard(job_id)
+
+    # --- queries ------------------------------------------------------------
+
+    def by_meeting(self, meeting_id: str) -> List[str]:
+        """Job ids of the schedules opening this meeting (id, or a link to it)."""
+        if "/" in meeting_id:
+            key = meeting_key({"zoom_link": meeting_id})
+        else:
+            key = normalize_meeting_id(meeting_id)
+        return sorted(self._meetings.get(key, ()))
+
+    def by_link(self, link: str) -> List[str]:
+        return sorted(self._links.get(normalize_link(link), ()))
+
+    def by_name_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Job ids whose folded name starts with ``prefix`` (a trailing ``*`` is allowed), in name order."""
+        key = fold_name(prefix.rstrip("*"))
+        names = self._sorted_names()
+        found: Dict[str, None] = {}
+        for i in range(bisect_left(names, (key, "")), len(names)):
+            name, job_id = names[i]
+            if not name.startswith(key):
+                break
+            keys = self._keys.get(job_id)
+            if keys is not None and keys[2] == name:
+                found[job_id] = None
+                if limit is not None and len(found) >= limit:
+                    break
+        return list(found)
+
+    def duplicates(self) -> Dict[str, List[str]]:
+        """``{meeting id: [job ids]}`` for every meeting used by more than one schedule."""
+        return {meeting: sorted(self._meetings[meeting]) for meeting in sorted(self._duplicated)}
+
+    def top_meetings(self, count: int = 10) -> List[Tuple[str, int]]:
+        """The ``count`` meetings shared by the most schedules: ``[(meeting id, schedules), ...]``."""
+        sizes = ((meeting, len(self._meetings[meeting])) for meeting in self._duplicated)
+        return heapq.nlargest(count, sizes, key=lambda item: (item[1], item[0]))
+
+    def search(self, query: ScheduleQuery) -> Optional[Set[str]]:
+        """Job ids matching ``query``; ``None`` when the query filters nothing.
+
+        The set may be one of the index's own: read it, do not keep or modify it.
+        """
+        found: Optional[Set[str]] = None
+        if query.link:
+            found = self._by_prefix(self._links, "links", query.link)
+            if query.link_meeting in self._meetings:
+                found = found | self._meetings[query.link_meeting]
+        elif query.words or query.digits:
+            for word in query.words:
+                ids = self._by_prefix(self._words, "words", word)
+                found = ids if found is None else found & ids
+            if query.digits:
+                ids = self._by_prefix(self._meetings, "meetings", query.digits)
+                found = ids if found is None else found | ids
+        if query.rec_type is not None:
+            ids = self._types.get(query.rec_type, set())
+            found = ids if found is None else found & ids
+        if query.enabled is False:
+            found = self._disabled if found is None else found & self._disabled
+        elif query.enabled:
+            found = self._keys.keys() - self._disabled if found is None else found - self._disabled
+        return found
+
+    def accepts(self, job_id: str, query: ScheduleQuery) -> bool:
+        keys = self._keys.get(job_id)
+        return keys is not None and query.accepts(keys)
+
+    def _by_prefix(self, table: Dict[str, Set[str]], kind: str, prefix: str) -> Set[str]:
+        keys = self._sorted_keys.get(kind)
+        if keys is None:
+            keys = self._sorted_keys[kind] = sorted(table)
+        sets = []
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            key = keys[i]
+            if not key.startswith(prefix):
+                break
+            ids = table.get(key)   # None: key gone since the sort
+            if ids:
+                sets.append(ids)
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    def stats(self) -> Dict[str, int]:
+        return {"schedules": len(self._keys), "meetings": len(self._meetings), "links": len(self._links),
+                "duplicated_meetings": len(self._duplicated),
+                "duplicated_schedules": sum(len(self._meetings[m]) for m in self._duplicated)}
+
+    def _sorted_names(self) -> List[Tuple[str, str]]:
+        if self._pending:
+            self._names.extend(self._pending)
+            self._pending = []
+            self._names.sort()
+        # Pairs left behind by renames and removals: drop them once they outnumber the live ones
+        if len(self._names) > 2 * len(self._keys) + 64:
+            keys = self._keys
+            self._names = sorted({(name, job_id) for name, job_id in self._names
+                                  if job_id in keys and keys[job_id][2] == name})
+        return self._names
@@ -0,0 +1,437 @@
+"""Persistence backends for the schedule table.
+
+Both stores share one interface:
+
+* ``load()`` returns ``{job_id: record}`` in the same shape as
+  ``zoom_schedule.json``;
+* ``save(jobs, changed=None)`` persists a mutation. ``changed`` lists the job
+  ids touched by it (an id missing from ``jobs`` means it was deleted);
+  ``None`` means "everything may have changed".
+
+``JsonScheduleStore`` keeps the historical behaviour (rewrite the whole file),
+now atomically through a temp file and ``os.replace``. It reads the file with
+``schedule_loader``, record by record; records that cannot be loaded go to
+the quarantine side file instead of failing the whole load.
+``SqliteScheduleStore`` keeps one row per schedule in a WAL-mode database and
+only upserts/deletes the rows named in ``changed``. On first use it imports
+the legacy JSON file in a single transaction; the JSON file is left in place
+as a backup.
+``BinaryScheduleStore`` keeps a compact binary snapshot (``binary_snapshot``)
+that is memory-mapped on load and decoded record by record on access.
+``JournalScheduleStore`` appends one line per changed schedule to
+``zoom_schedule.journal`` and folds the journal back into
+``zoom_schedule.json`` on a background thread once it grows past a size
+threshold.
+"""
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from binary_snapshot import (LazyRecords, SnapshotError, SnapshotReader, encode_snapshot, encode_snapshot_from,
+                             write_snapshot)
+from schedule_entry import to_plain
+from schedule_index import FireIndex, OverlayJobs, write_index
+from schedule_loader import Quarantine, load_schedule_file, quarantine_path_for
+from schedule_watcher import file_digest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    job_id  TEXT PRIMARY KEY,
+    hour    INTEGER NOT NULL DEFAULT 0,
+    minute  INTEGER NOT NULL DEFAULT 0,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    data    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_time ON schedules (hour, minute);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class JsonScheduleStore:
+    """Whole-file JSON snapshot (``zoom_schedule.json``)."""
+
+    kind = "json"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.last_written_digest: Optional[str] = None  # lets the file watcher skip our own saves
+        self.quarantine = Quarantine(quarantine_path_for(self.path))
+        self.load_report: Optional[Dict[str, Any]] = None
+
+    def load(self, progress=None) -> Dict[str, Any]:
+        jobs, self.load_report = load_schedule_file(self.path, self.quarantine, progress)
+        return jobs
+
+    def save(self, jobs: Mapping[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        self.write_text(json.dumps(jobs, ensure_ascii=False, indent=4, default=to_plain))
+
+    def write_text(self, text: str) -> None:
+        # Write a temp file next to the target and swap it in, so a crash
+        # mid-write never leaves a truncated zoom_schedule.json behind.
+        data = text.encode("utf-8")
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.last_written_digest = file_digest(data)
+        os.replace(tmp, self.path)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteScheduleStore:
+    """One row per schedule; a mutation only writes the rows it touched."""
+
+    kind = "sqlite"
+
+    def __init__(self, path: Path, legacy_json: Optional[Path] = None):
+        self.path = Path(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self.quarantine = Quarantine(quarantine_path_for(self.path))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _row(job_id: str, data: Mapping[str, Any]) -> tuple:
+        return (job_id, int(data.get("hour", 0) or 0), int(data.get("minute", 0) or 0),
+                1 if data.get("enabled", True) else 0, json.dumps(data, ensure_ascii=False, default=to_plain))
+
+    def _migrate(self, progress=None) -> None:
+        """Import the legacy JSON file once, the first time the database is used."""
+        done = self._conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone()
+        if done:
+            return
+        legacy = {}
+        if self.legacy_json is not None and self.legacy_json.exists():
+            legacy = JsonScheduleStore(self.legacy_json).load(progress)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO schedules (job_id, hour, minute, enabled, data) VALUES (?, ?, ?, ?, ?)",
+                (self._row(job_id, data) for job_id, data in legacy.items() if isinstance(data, dict)))
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                               (str(len(legacy)),))
+        if legacy:
+            print(f"[STORE] Đã chuyển {len(legacy)} lịch từ {self.legacy_json.name} sang {self.path.name}")
+
+    def load(self, progress=None) -> Dict[str, Any]:
+        with self._lock:
+            self._migrate(progress)
+            rows = self._conn.execute("SELECT job_id, data FROM schedules ORDER BY hour, minute")
+            return {job_id: json.loads(data) for job_id, data in rows}
+
+    def save(self, jobs: Mapping[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        with self._lock, self._conn:
+            if changed is None:
+                self._conn.execute("DELETE FROM schedules")
+                changed = list(jobs)
+            upserts, deletes = [], []
+            for job_id in changed:
+                data = jobs.get(job_id)
+                if data is None:
+                    deletes.append((job_id,))
+                else:
+                    upserts.append(self._row(job_id, data))
+            if deletes:
+                self._conn.executemany("DELETE FROM schedules WHERE job_id = ?", deletes)
+            if upserts:
+                self._conn.executemany(
+                    "INSERT INTO schedules (job_id, hour, minute, enabled, data) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(job_id) DO UPDATE SET hour = excluded.hour, minute = excluded.minute, "
+                    "enabled = excluded.enabled, data = excluded.data",
+                    upserts)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BinaryScheduleStore:
+    """Binary snapshot (``zoom_schedule.zsb``), mapped and decoded lazily.
+
+    ``load`` returns a read-only mapping backed by the mapped file. Until the
+    first binary save, the legacy JSON file is read instead. Saves rewrite
+    the whole snapshot, which is why this store is best paired with the
+    write-behind persister; when ``jobs`` is an ``OverlayJobs`` over loaded
+    records, unchanged records are copied as stored and only edits are
+    encoded. Every save also rebuilds the fire-time index
+    (``zoom_schedule.zsx``, see ``schedule_index``).
+    """
+
+    kind = "binary"
+
+    def __init__(self, path: Path, legacy_json: Optional[Path] = None):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix(".zsx")
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self.quarantine = Quarantine(quarantine_path_for(self.path))
+        self._reader: Optional[SnapshotReader] = None
+        self._records = None
+        self._lock = threading.Lock()
+
+    def load(self, progress=None) -> Mapping[str, Any]:
+        with self._lock:
+            if not self.path.exists():
+                if self.legacy_json is not None:
+                    return JsonScheduleStore(self.legacy_json).load(progress)
+                return {}
+            self._release()
+            self._reader = SnapshotReader(self.path)
+            self._records = self._reader.records()
+            return self._records
+
+    def open_index(self) -> Optional[FireIndex]:
+        """Fire-time index of the current snapshot, or None if missing or stale."""
+        try:
+            index = FireIndex(self.index_path)
+        except (OSError, SnapshotError):
+            return None
+        if not index.matches(self.path):
+            index.close()
+            return None
+        return index
+
+    def _release(self) -> None:
+        # The mapping must be closed before the file can be replaced (Windows);
+        # records handed out by load() keep reading from an in-memory copy.
+        if self._records is not None:
+            self._records.detach()
+        elif self._reader is not None:
+            self._reader.close()
+        self._records = None
+        self._reader = None
+
+    def save(self, jobs: Mapping[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            # Both encoders may still read from the mapped file
+            base = jobs.base if isinstance(jobs, OverlayJobs) else None
+            if isinstance(base, LazyRecords):
+                data = encode_snapshot_from(base.reader, jobs.layout())
+                base.detach()
+            else:
+                data = encode_snapshot(jobs)
+            if self._records is not None:
+                # Keep the loaded records as the base of later saves
+                self._records.detach()
+            write_snapshot(jobs, self.path, data)
+            write_index(self.path, self.index_path)
+
+    def close(self) -> None:
+        # The window may still paint rows from the loaded records while it closes
+        with self._lock:
+            self._release()
+
+
+def _is_put(record: Any) -> bool:
+    return (type(record) is list and len(record) == 3 and record[0] == "p"
+            and isinstance(record[1], str) and isinstance(record[2], dict))
+
+
+def _is_delete(record: Any) -> bool:
+    return type(record) is list and len(record) == 2 and record[0] == "d" and isinstance(record[1], str)
+
+
+class JournalScheduleStore:
+    """Snapshot (``zoom_schedule.json``) plus an append-only mutation journal.
+
+    Each journal line is one compact JSON array: ``["p", job_id, record]``
+    (put) or ``["d", job_id]`` (delete). Loading replays the snapshot, then
+    the journal being compacted (if any), then the live journal. A crash can
+    only leave the last line half written; that line is ignored on replay and
+    cut off before the next append.
+
+    Compaction renames the live journal to ``<journal>.1`` and starts a fresh
+    one (cheap, done under the lock), then rebuilds the snapshot from files
+    on the compactor thread. Replaying ``<journal>.1`` twice is harmless, so a
+    crash at any point of compaction loses nothing.
+    """
+
+    kind = "journal"
+
+    def __init__(self, snapshot_path: Path, journal_path: Optional[Path] = None,
+                 max_bytes: int = 1 << 20):
+        self.snapshot = JsonScheduleStore(snapshot_path)
+        self.path = Path(journal_path) if journal_path else self.snapshot.path.with_suffix(".journal")
+        self.rotated = self.path.with_name(self.path.name + ".1")
+        self.max_bytes = max_bytes
+        self.compactions = 0
+        self.skipped_records = 0
+        self._generation = 0               # bumped by every full rewrite
+        self._compacting = threading.Lock()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._compact_requested = False
+        self._closed = False
+        self._file = self._open_journal()
+        self._compactor = threading.Thread(target=self._run_compactor, name="journal-compactor", daemon=True)
+        self._compactor.start()
+
+    def _open_journal(self):
+        # Drop a half-written last record so the next append starts on a fresh line.
+        if self.path.exists():
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    f.truncate(data.rfind(b"\n") + 1)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _replay(self, path: Path, jobs: Dict[str, Any]) -> None:
+        if not path.exists():
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write at the tail (or a damaged line): skip it.
+                    self.skipped_records += 1
+                    continue
+                if _is_put(record):
+                    jobs[record[1]] = record[2]
+                elif _is_delete(record):
+                    jobs.pop(record[1], None)
+                else:
+                    # Valid JSON but not a journal record: skip it like a torn line.
+                    self.skipped_records += 1
+
+    def _fold(self, progress=None) -> Dict[str, Any]:
+        jobs = self.snapshot.load(progress)
+        self._replay(self.rotated, jobs)
+        return jobs
+
+    def _fold_files(self) -> Dict[str, Any]:
+        """Snapshot plus rotated journal for compaction, without the loader.
+
+        The snapshot was written by this store, so it is parsed in one go;
+        records were already checked (and bad ones quarantined) when the app
+        loaded them, so compaction does not send them through the quarantine
+        again. Only a damaged snapshot falls back to the streaming loader.
+        """
+        try:
+            with open(self.snapshot.path, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+            if not isinstance(jobs, dict):
+                raise ValueError("snapshot is not an object")
+        except FileNotFoundError:
+            jobs = {}
+        except ValueError:
+            jobs, _ = load_schedule_file(self.snapshot.path)
+        jobs = {job_id: data for job_id, data in jobs.items() if isinstance(data, dict)}
+        self._replay(self.rotated, jobs)
+        return jobs
+
+    @property
+    def quarantine(self) -> Quarantine:
+        return self.snapshot.quarantine
+
+    @property
+    def load_report(self) -> Optional[Dict[str, Any]]:
+        return self.snapshot.load_report
+
+    def load(self, progress=None) -> Dict[str, Any]:
+        with self._lock:
+            jobs = self._fold(progress)
+            self._replay(self.path, jobs)
+            return jobs
+
+    def save(self, jobs: Mapping[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            if changed is None:
+                # Full rewrite: the snapshot is the whole truth, the journals are obsolete.
+                self._generation += 1
+                self.snapshot.save(jobs)
+                self._file.close()
+                self._file = open(self.path, "w", encoding="utf-8")
+                if self.rotated.exists():
+                    os.remove(self.rotated)
+                return
+            lines = []
+            for job_id in changed:
+                data = jobs.get(job_id)
+                record = ["d", job_id] if data is None else ["p", job_id, data]
+                lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=to_plain) + "\n")
+            self._file.write("".join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if self._file.tell() >= self.max_bytes and not self._compact_requested:
+                self._compact_requested = True
+                self._wake.notify_all()
+
+    def journal_size(self) -> int:
+        with self._lock:
+            return self._file.tell()
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot now (blocking)."""
+        with self._compacting:
+            with self._lock:
+                self._rotate()
+            self._rebuild_snapshot()
+
+    def _rotate(self) -> None:
+        # A previous compaction may have died before finishing: fold that one first.
+        if self.rotated.exists() or self._file.tell() == 0:
+            return
+        self._file.close()
+        os.replace(self.path, self.rotated)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _rebuild_snapshot(self) -> None:
+        # Runs with self._compacting held. Folding and encoding happen outside
+        # the main lock so appends to the fresh live journal are not blocked.
+        with self._lock:
+            if not self.rotated.exists():
+                return
+            generation = self._generation
+        text = json.dumps(self._fold_files(), ensure_ascii=False, indent=4)
+        with self._lock:
+            if generation != self._generation:
+                return  # a full rewrite superseded this compaction
+            self.snapshot.write_text(text)
+            os.remove(self.rotated)
+            self.compactions += 1
+
+    def _run_compactor(self) -> None:
+        while True:
+            with self._lock:
+                while not self._compact_requested and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                self._compact_requested = False
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"[STORE] Lỗi khi gộp journal: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wake.notify_all()
+        self._compactor.join()
+        with self._lock:
+            self._file.close()
+
+
+def open_store(kind: str, json_path: Path, sqlite_path: Path, journal_max_bytes: int = 1 << 20):
+    """Build the store selected by the ``store`` config key."""
+    if kind == "sqlite":
+        return SqliteScheduleStore(sqlite_path, legacy_json=json_path)
+    if kind == "binary":
+        return BinaryScheduleStore(json_path.with_suffix(".zsb"), legacy_json=json_path)
+    if kind == "journal":
+        return JournalScheduleStore(json_path, max_bytes=journal_max_bytes)
+    if kind != "json":
+        raise ValueError(f"Kiểu lưu trữ không hợp lệ: {kind}")
+    return JsonScheduleStore(json_path)
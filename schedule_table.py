@@ -0,0 +1,446 @@
+"""Model/view for the schedule table of the main window.
+
+``ScheduleTableModel`` exposes ``SchedulerManager.jobs`` to a ``QTableView``
+without copying it: the model only keeps the job ids in display order with
+each one's sort key (minutes since midnight) and formats a cell when the
+view asks for it, so Qt only renders the rows on screen. ``reload`` reads the
+hour and minute of every record once (from the packed snapshot records when
+``jobs`` offers ``times()``, decoding none) and sorts the keys, O(n log n),
+instead of building 50k rows of widgets and ``QTableWidgetItem``s; ``update_rows``
+keeps the keys in step with edits, so placing a changed row is a binary
+search over the stored keys that reads no other record.
+
+Rows and job ids map both ways: ``job_id(row)`` reads the order list and
+``row_of(job_id)`` a dict of the rows as of the last renumbering, corrected
+by the (at most ``RENUMBER_AFTER``) inserts and removals logged since. An
+edit costs no renumbering of the rows after it; the dict is rebuilt once
+per ``RENUMBER_AFTER`` changes, or on a sort (``reload``).
+
+``ScheduleFilterProxy`` sits between the model and the view for the filter
+bar. ``QSortFilterProxyModel`` would call a Python ``filterAcceptsRow`` for
+every row on each keystroke (70-280 ms at 50k rows); here the caller hands
+over the set of matching job ids (from ``ScheduleSearchIndex.search``) and the
+proxy keeps the source rows whose id is in it, in source order, with its own
+``RowIndex``. Rows the source inserts, removes or changes later are checked
+one by one with the ``accepts(job_id)`` callback.
+
+The on/off switch of the first column is painted by ``ToggleDelegate`` (no
+``QCheckBox`` per row). A click on it calls ``setData(..., CheckStateRole)``,
+which emits ``toggle_requested(job_id, enabled)``; the app applies it to the
+scheduler (finding the row again with ``row_of``) and the cell is repainted
+from ``jobs``.
+"""
+from datetime import datetime
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from PyQt6.QtCore import (QAbstractProxyModel, QAbstractTableModel, QEvent, QModelIndex, QObject, QRect, QRectF,
+                          QSize, Qt, pyqtSignal)
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+TOGGLE, TIME, NAME, MEETING, LINK = range(5)
+HEADERS = ("Bật/Tắt", "Giờ", "Tên phòng Zoom", "Meeting ID", "Link Zoom")
+JOB_ID_ROLE = Qt.ItemDataRole.UserRole
+RENUMBER_AFTER = 64
+
+
+def sort_key(record: Mapping[str, Any]) -> int:
+    """Display order of the table: minutes since midnight."""
+    return record.get("hour", 0) * 60 + record.get("minute", 0)
+
+
+def time_text(record: Mapping[str, Any]) -> str:
+    """Text of the "Giờ" column: "HH:MM", or "dd/mm HH:MM" for a one-off schedule."""
+    rec = record.get("recurrence") or {}
+    if rec.get("type") == "once" and rec.get("run_date"):
+        try:
+            return datetime.fromisoformat(rec["run_date"]).strftime("%d/%m %H:%M")
+        except (TypeError, ValueError):
+            pass
+    return f"{record.get('hour', 0):02d}:{record.get('minute', 0):02d}"
+
+
+class RowIndex:
+    """Row <-> job id of one table: the job ids in display order plus the reverse map."""
+
+    def __init__(self, order: Optional[List[str]] = None):
+        self.reset(order or [])
+
+    def reset(self, order: List[str]) -> None:
+        self.order = order                            # row -> job_id
+        self._rows: Dict[str, int] = {}               # job_id -> row at the last renumbering
+        self._born: Dict[str, Tuple[int, int]] = {}   # inserted since: job_id -> (row, len(_shifts) then)
+        self._shifts: List[Tuple[int, int]] = []      # (row, +1 inserted / -1 removed) since
+        self._numbered = False   # the dict is built by the first lookup, not by every reset
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def insert(self, row: int, job_id: str) -> None:
+        self.order.insert(row, job_id)
+        self._shifts.append((row, 1))
+        self._born[job_id] = (row, len(self._shifts))
+
+    def remove(self, row: int) -> str:
+        job_id = self.order.pop(row)
+        self._rows.pop(job_id, None)
+        self._born.pop(job_id, None)
+        self._shifts.append((row, -1))
+        return job_id
+
+    def job_id(self, row: int) -> Optional[str]:
+        return self.order[row] if 0 <= row < len(self.order) else None
+
+    def row_of(self, job_id: str) -> int:
+        """Row of ``job_id`` (-1 if none)."""
+        if not self._numbered or len(self._shifts) > RENUMBER_AFTER:
+            self._rows = dict(zip(self.order, range(len(self.order))))
+            self._born, self._shifts, self._numbered = {}, [], True
+        row = self._rows.get(job_id)
+        since = 0
+        if row is None:
+            if job_id not in self._born:
+                return -1
+            row, since = self._born[job_id]
+        # Replay the inserts / removals logged after the row was numbered
+        for at, delta in self._shifts[since:]:
+            if row > at or (row == at and delta > 0):
+                row += delta
+        return row
+
+
+class ScheduleTableModel(QAbstractTableModel):
+    """Read-only table over ``jobs()`` (``{job_id: record}``) sorted by time of day."""
+
+    toggle_requested = pyqtSignal(str, bool)   # job_id, enabled
+
+    def __init__(self, jobs: Callable[[], Mapping[str, Mapping[str, Any]]],
+                 format_meeting_id: Callable[[str], str] = str, parent=None):
+        super().__init__(parent)
+        self._jobs = jobs
+        self._format_meeting_id = format_meeting_id
+        self._rows = RowIndex()
+        self._keys: Dict[str, int] = {}   # job_id -> sort_key of the row shown
+
+    # --- structure ----------------------------------------------------------
+
+    def reload(self) -> None:
+        """Re-read every job id (after a load or a bulk change)."""
+        self.beginResetModel()
+        jobs = self._jobs()
+        times = getattr(jobs, "times", None)
+        if times is not None:
+            # Snapshot-backed jobs (schedule_index.OverlayJobs): times come from the packed
+            # records, so a reload decodes none of them
+            keys = {job_id: hour * 60 + minute for job_id, hour, minute in times()}
+        else:
+            keys = {job_id: sort_key(record) for job_id, record in jobs.items()}
+        self._keys = keys
+        # Stable: schedules at the same time keep the order of ``jobs``
+        self._rows.reset(sorted(keys, key=keys.__getitem__))
+        self.endResetModel()
+
+    def update_rows(self, job_ids: Iterable[str]) -> None:
+        """Repaint, move, insert or remove just the rows of ``job_ids`` after they changed in ``jobs``."""
+        jobs, order, keys = self._jobs(), self._rows.order, self._keys
+        job_ids = list(dict.fromkeys(job_ids))
+        rows = sorted(row for row in map(self.row_of, job_ids) if row >= 0)
+        affected = set(rows)
+        for job_id in job_ids:
+            record = jobs.get(job_id)
+            if record is None:
+                keys.pop(job_id, None)
+            else:
+                keys[job_id] = sort_key(record)
+        # A row stays (and is only repainted) while it is still in order with the rows that remain
+        stay, moved = [], set()
+        for row in rows:
+            key = keys.get(order[row])
+            if key is not None and self._in_place(row, key, affected, moved):
+                stay.append(order[row])
+            else:
+                moved.add(row)
+        for row in sorted(moved, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._rows.remove(row)
+            self.endRemoveRows()
+        for job_id in stay:
+            row = self.row_of(job_id)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+        kept = set(stay)
+        for job_id in job_ids:
+            key = keys.get(job_id)
+            if key is not None and job_id not in kept:
+                row = self._insert_position(key)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.insert(row, job_id)
+                self.endInsertRows()
+
+    def _in_place(self, row: int, key: int, affected, moved) -> bool:
+        """``key`` fits at ``row`` between the previous remaining row and the next unchanged one."""
+        keys, order = self._keys, self._rows.order
+        before = row - 1
+        while before >= 0 and before in moved:
+            before -= 1
+        after = row + 1
+        while after < len(order) and after in affected:
+            after += 1
+        previous = keys.get(order[before]) if before >= 0 else None
+        following = keys.get(order[after]) if after < len(order) else None
+        return (previous is None or previous <= key) and (following is None or key < following)
+
+    def _insert_position(self, key: int) -> int:
+        # After the schedules at the same time, like the stable sort of reload()
+        keys, order = self._keys, self._rows.order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            other = keys.get(order[mid])
+            if other is not None and other > key:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def job_id(self, row: int) -> Optional[str]:
+        return self._rows.job_id(row)
+
+    def row_of(self, job_id: str) -> int:
+        """Row showing ``job_id`` (-1 if none)."""
+        return self._rows.row_of(job_id)
+
+    def job_ids(self) -> List[str]:
+        """Every job id in display order (do not modify)."""
+        return self._rows.order
+
+    # --- QAbstractTableModel ------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return HEADERS[section]
+            return str(section + 1)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        job_id = self._rows.order[index.row()]
+        if role == JOB_ID_ROLE:
+            return job_id
+        record = self._jobs().get(job_id)
+        if record is None:
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == TIME:
+                return time_text(record)
+            if column == NAME:
+                return record.get("name", "")
+            if column == MEETING:
+                return self._format_meeting_id(record.get("meeting_id", ""))
+            if column == LINK:
+                return record.get("zoom_link", "")
+        elif role == Qt.ItemDataRole.CheckStateRole and column == TOGGLE:
+            return Qt.CheckState.Checked if record.get("enabled", False) else Qt.CheckState.Unchecked
+        elif role == Qt.ItemDataRole.ToolTipRole and column == LINK:
+            return record.get("zoom_link") or None
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if (role != Qt.ItemDataRole.CheckStateRole or index.column() != TOGGLE
+                or not 0 <= index.row() < len(self._rows)):
+            return False
+        enabled = value in (True, Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        self.toggle_requested.emit(self._rows.order[index.row()], enabled)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+
+class ScheduleFilterProxy(QAbstractProxyModel):
+    """Rows of a ``ScheduleTableModel`` whose job id passes the current filter, in the same order."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = RowIndex()
+        self._search: Optional[Callable[[], Optional[AbstractSet[str]]]] = None
+        self._accepts: Optional[Callable[[str], bool]] = None
+
+    def setSourceModel(self, model: ScheduleTableModel) -> None:
+        super().setSourceModel(model)
+        model.modelReset.connect(self._refilter)
+        model.rowsInserted.connect(self._source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._source_rows_removed)
+        model.dataChanged.connect(self._source_data_changed)
+        self._refilter()
+
+    def set_filter(self, search: Optional[Callable[[], Optional[AbstractSet[str]]]] = None,
+                   accepts: Optional[Callable[[str], bool]] = None) -> None:
+        """``search()``: matching job ids (``None`` = all); ``accepts(job_id)``: the same test for one row."""
+        self._search, self._accepts = search, accepts
+        self._refilter()
+
+    def is_filtered(self) -> bool:
+        return self._search is not None
+
+    def _refilter(self) -> None:
+        self.beginResetModel()
+        order = self.sourceModel().job_ids() if self.sourceModel() is not None else []
+        found = self._search() if self._search is not None else None
+        self._rows.reset(list(order) if found is None else [job_id for job_id in order if job_id in found])
+        self.endResetModel()
+
+    def _shown(self, job_id: str) -> bool:
+        return self._accepts is None or self._accepts(job_id)
+
+    def _source_rows_inserted(self, parent, first: int, last: int) -> None:
+        source = self.sourceModel()
+        for source_row in range(first, last + 1):
+            job_id = source.job_id(source_row)
+            if self._shown(job_id):
+                self._insert(job_id, source_row)
+
+    def _insert(self, job_id: str, source_row: int) -> None:
+        # Keep the source order: first visible row whose source row is after this one
+        source, order = self.sourceModel(), self._rows.order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if source.row_of(order[mid]) < source_row:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.beginInsertRows(QModelIndex(), lo, lo)
+        self._rows.insert(lo, job_id)
+        self.endInsertRows()
+
+    def _source_rows_removed(self, parent, first: int, last: int) -> None:
+        source = self.sourceModel()
+        for source_row in range(last, first - 1, -1):
+            self._remove(source.job_id(source_row))
+
+    def _remove(self, job_id: str) -> None:
+        row = self._rows.row_of(job_id)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._rows.remove(row)
+            self.endRemoveRows()
+
+    def _source_data_changed(self, top_left, bottom_right, roles=()) -> None:
+        source = self.sourceModel()
+        for source_row in range(top_left.row(), bottom_right.row() + 1):
+            job_id = source.job_id(source_row)
+            row, shown = self._rows.row_of(job_id), self._shown(job_id)
+            if row >= 0 and shown:
+                self.dataChanged.emit(self.index(row, top_left.column()),
+                                      self.index(row, bottom_right.column()), roles)
+            elif row >= 0:
+                self._remove(job_id)
+            elif shown:
+                self._insert(job_id, source_row)
+
+    def job_id(self, row: int) -> Optional[str]:
+        return self._rows.job_id(row)
+
+    def row_of(self, job_id: str) -> int:
+        """Row showing ``job_id`` (-1 if filtered out or absent)."""
+        return self._rows.row_of(job_id)
+
+    # --- QAbstractProxyModel ------------------------------------------------
+
+    def mapToSource(self, index):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return QModelIndex()
+        source = self.sourceModel()
+        return source.index(source.row_of(self._rows.order[index.row()]), index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._rows.row_of(self.sourceModel().job_id(source_index.row()))
+        return self.index(row, source_index.column()) if row >= 0 else QModelIndex()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._rows) or not 0 <= column < len(HEADERS):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:   # QObject.parent()
+            return QObject.parent(self)
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical:
+            return str(section + 1) if role == Qt.ItemDataRole.DisplayRole else None
+        return self.sourceModel().headerData(section, orientation, role)
+
+
+class ToggleDelegate(QStyledItemDelegate):
+    """Paints the "Bật/Tắt" cell as a switch and flips it on click or Space."""
+
+    WIDTH, HEIGHT = 36, 20
+    ON, OFF, KNOB = QColor("#10b981"), QColor("#cbd5e1"), QColor("#ffffff")
+
+    def _switch_rect(self, option) -> QRect:
+        rect = QRect(0, 0, self.WIDTH, self.HEIGHT)
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    def paint(self, painter, option, index):
+        # Selection / hover background the way the style draws it, without the default check box
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.features &= ~QStyleOptionViewItem.ViewItemFeature.HasCheckIndicator
+        opt.text = ""
+        style = opt.widget.style() if opt.widget is not None else None
+        if style is not None:
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, opt, painter, opt.widget)
+
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        rect = QRectF(self._switch_rect(option))
+        radius = rect.height() / 2
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.ON if checked else self.OFF)
+        painter.drawRoundedRect(rect, radius, radius)
+        knob = rect.height() - 4
+        left = rect.right() - knob - 2 if checked else rect.left() + 2
+        painter.setBrush(self.KNOB)
+        painter.drawEllipse(QRectF(left, rect.top() + 2, knob, knob))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(self.WIDTH + 24, self.HEIGHT + 8)
+
+    def editorEvent(self, event, model, option, index):
+        kind = event.type()
+        if kind in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+            # Swallowed so a double click on the switch does not open the edit dialog
+            return self._switch_rect(option).contains(event.position().toPoint())
+        if kind == QEvent.Type.MouseButtonRelease:
+            if (event.button() != Qt.MouseButton.LeftButton
+                    or not self._switch_rect(option).contains(event.position().toPoint())):
+                return False
+        elif kind != QEvent.Type.KeyPress or event.key() not in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+            return False
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        return model.setData(index, not checked, Qt.ItemDataRole.CheckStateRole)
@@ -0,0 +1,91 @@
+"""Notice edits other programs make to ``zoom_schedule.json`` while the app runs.
+
+``ScheduleFileWatcher.poll`` is meant to be called from a timer. Each call is
+one ``os.stat``; the file is only hashed once its mtime or size changed *and*
+stayed the same for one more poll (so a file being written in several steps
+is not read half-way). Content identical to the last save of the app itself
+(``ignore_digest``) is not reported either.
+
+``diff_schedules`` compares the schedules read from the new file with the
+ones in memory, so the caller can apply just the added, changed and removed
+records.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Collection, Dict, List, Mapping, Optional, Tuple
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ScheduleFileWatcher:
+    """Polling change detector for one file (stat first, hash only when the stat changed)."""
+
+    def __init__(self, path, ignore_digest: Optional[Callable[[], Optional[str]]] = None):
+        self.path = Path(path)
+        self.ignore_digest = ignore_digest
+        self._stat = self._stat_now()
+        self._pending: Optional[Tuple[int, int]] = None
+        self.digest = _hash_file(self.path) if self._stat else None
+        self.polls = 0
+        self.changes = 0
+
+    def _stat_now(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self) -> bool:
+        """True when the file now holds content written by someone else."""
+        self.polls += 1
+        stat = self._stat_now()
+        if stat == self._stat:
+            self._pending = None
+            return False
+        if stat is None or stat != self._pending:
+            # Missing (being replaced) or still changing: look again next time.
+            self._pending = stat
+            return False
+        self._stat, self._pending = stat, None
+        digest = _hash_file(self.path)
+        if digest is None or digest == self.digest:
+            return False
+        self.digest = digest
+        if self.ignore_digest is not None and digest == self.ignore_digest():
+            return False
+        self.changes += 1
+        return True
+
+
+def diff_schedules(current: Mapping[str, dict], incoming: Mapping[str, dict],
+                   keep: Collection[str] = ()) -> Dict[str, List[str]]:
+    """Job ids added, changed and removed going from ``current`` to ``incoming``.
+
+    Ids in ``keep`` are never reported as removed (records that could not be
+    read from the new file must not delete the schedule in memory).
+    """
+    added: List[str] = []
+    changed: List[str] = []
+    for job_id, record in incoming.items():
+        old = current.get(job_id)
+        if old is None:
+            added.append(job_id)
+        elif old != record:
+            changed.append(job_id)
+    removed = [job_id for job_id in current if job_id not in incoming and job_id not in keep]
+    return {"added": added, "changed": changed, "removed": removed}
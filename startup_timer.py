@@ -0,0 +1,76 @@
+"""Startup phases and time-to-interactive.
+
+``StartupTimer`` is created as early as possible (the first lines of
+``main.py``) and marked at the end of each phase; a phase lasts from the
+previous mark to its own. ``ZoomAutoApp`` marks:
+
+* ``imports``     - loading main.py and what it imports;
+* ``scheduler``   - reading app_config.json and starting SchedulerManager;
+* ``ui``          - building the main window;
+* ``first_paint`` - until the window is painted for the first time;
+* ``load``        - opening the store, loading and registering schedules,
+  filling the table.
+
+``interactive()`` is called once the event loop is idle after ``load``; the
+time from start to that call is the time to interactive. ``over_budget``
+compares a report with budgets in milliseconds, keyed by phase name or
+``time_to_interactive``.
+"""
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+TTI = "time_to_interactive"
+
+
+class StartupTimer:
+    """Consecutive named phases measured with ``time.perf_counter``."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started = clock()
+        self._last = self.started
+        self.phases: List[Tuple[str, float]] = []
+        self.ready: Optional[float] = None
+
+    def mark(self, phase: str) -> float:
+        """End ``phase`` now; returns its duration in seconds."""
+        now = self._clock()
+        duration = now - self._last
+        self._last = now
+        self.phases.append((phase, duration))
+        return duration
+
+    def interactive(self) -> float:
+        """Record time to interactive (first call wins); returns it in seconds."""
+        if self.ready is None:
+            self.ready = self._clock()
+        return self.ready - self.started
+
+    def report(self) -> Dict[str, object]:
+        """Phase durations and time to interactive, in milliseconds (``None`` until interactive)."""
+        return {
+            "phases": {phase: duration * 1000 for phase, duration in self.phases},
+            TTI: None if self.ready is None else (self.ready - self.started) * 1000,
+        }
+
+    def summary(self) -> str:
+        parts = [f"{phase} {duration * 1000:.0f} ms" for phase, duration in self.phases]
+        if self.ready is not None:
+            parts.append(f"sẵn sàng sau {(self.ready - self.started) * 1000:.0f} ms")
+        return " · ".join(parts)
+
+
+def over_budget(report: Mapping[str, object], budget: Mapping[str, float]) -> Dict[str, Tuple[float, float]]:
+    """``{name: (measured_ms, budget_ms)}`` for every budgeted phase (or TTI) that took longer.
+
+    A budget of 0 or ``None`` is not checked; a budgeted phase missing from
+    the report is not reported either.
+    """
+    measured = dict(report.get("phases") or {})
+    if report.get(TTI) is not None:
+        measured[TTI] = report[TTI]
+    exceeded = {}
+    for name, limit in budget.items():
+        if limit and name in measured and measured[name] > limit:
+            exceeded[name] = (measured[name], limit)
+    return exceeded
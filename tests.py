@@ -1,9 +1,33 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from main import SchedulerManager
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import uuid
 import updater
+import timer_heap
+from launch_dispatcher import CoalescingDispatcher
+from launch_metrics import LaunchMetrics
+from schedule_store import BinaryScheduleStore, JournalScheduleStore, JsonScheduleStore, SqliteScheduleStore
+import binary_snapshot
+import dialog_cache
+import schedule_entry
+import schedule_index
+import schedule_import
+import schedule_loader
+import schedule_search
+import schedule_table
+import schedule_watcher
+import startup_timer
+from write_behind import WriteBehindPersister
+import occurrences
+import recurrence
 
 class TestZoomScheduler(unittest.TestCase):
     def setUp(self):
@@ -33,9 +57,10 @@ class TestZoomScheduler(unittest.TestCase):
         self.manager.scheduler.add_job.assert_called()
         args, kwargs = self.manager.scheduler.add_job.call_args
         
-        print(f"   -> Trigger type: {args[1]}")
-        self.assertEqual(args[1], 'date', "Trigger phải là 'date'")
-        self.assertEqual(kwargs['run_date'].isoformat(), datetime.fromisoformat(run_date).isoformat())
+        trigger = args[1]
+        print(f"   -> Trigger type: {trigger.alias}")
+        self.assertEqual(trigger.alias, 'date', "Trigger phải là 'date'")
+        self.assertEqual(trigger.trigger_args['run_date'].isoformat(), datetime.fromisoformat(run_date).isoformat())
         print("   -> [PASS]")
 
     def test_version_compare(self):
@@ -59,10 +84,11 @@ class TestZoomScheduler(unittest.TestCase):
         )
         
         args, kwargs = self.manager.scheduler.add_job.call_args
-        print(f"   -> Trigger type: {args[1]}")
-        self.assertEqual(args[1], 'cron', "Trigger phải là 'cron'")
-        self.assertEqual(kwargs['hour'], 14)
-        self.assertEqual(kwargs['minute'], 0)
+        trigger = args[1]
+        print(f"   -> Trigger type: {trigger.alias}")
+        self.assertEqual(trigger.alias, 'cron', "Trigger phải là 'cron'")
+        self.assertEqual(trigger.trigger_args['hour'], 14)
+        self.assertEqual(trigger.trigger_args['minute'], 0)
         print("   -> [PASS]")
 
     def test_add_schedule_weekly(self):
@@ -78,9 +104,10 @@ class TestZoomScheduler(unittest.TestCase):
         )
         
         args, kwargs = self.manager.scheduler.add_job.call_args
-        print(f"   -> Trigger type: {args[1]}")
-        self.assertEqual(args[1], 'cron')
-        self.assertEqual(kwargs['day_of_week'], '0,2')
+        trigger = args[1]
+        print(f"   -> Trigger type: {trigger.alias}")
+        self.assertEqual(trigger.alias, 'cron')
+        self.assertEqual(trigger.trigger_args['day_of_week'], '0,2')
         print("   -> [PASS]")
 
     def test_add_schedule_weekdays(self):
@@ -95,7 +122,7 @@ class TestZoomScheduler(unittest.TestCase):
         )
         
         args, kwargs = self.manager.scheduler.add_job.call_args
-        self.assertEqual(kwargs['day_of_week'], '0-4')
+        self.assertEqual(args[1].trigger_args['day_of_week'], '0-4')
         print("   -> [PASS]")
 
     def test_edit_existing_schedule(self):
@@ -181,8 +208,8 @@ class TestZoomScheduler(unittest.TestCase):
         )
         
         args, kwargs = self.manager.scheduler.add_job.call_args
-        self.assertEqual(args[1], 'interval', "Trigger phải là 'interval'")
-        self.assertEqual(kwargs['days'], 3)
+        self.assertEqual(args[1].alias, 'interval', "Trigger phải là 'interval'")
+        self.assertEqual(args[1].trigger_args['days'], 3)
         print("   -> [PASS]")
         
     def test_add_schedule_custom_weekly(self):
@@ -200,11 +227,1608 @@ class TestZoomScheduler(unittest.TestCase):
         )
         
         args, kwargs = self.manager.scheduler.add_job.call_args
-        self.assertEqual(args[1], 'cron', "Trigger phải là 'cron'")
-        self.assertEqual(kwargs['day_of_week'], '5,6', "Phải là T7, CN")
-        # Note: APScheduler's cron doesn't directly support "every 2 weeks".
-        # The current implementation will run it every week on Sat/Sun.
-        # This is a limitation of the current app logic, not the test.
+        # Cron không hỗ trợ "mỗi 2 tuần" -> dùng trigger bitmask (recurrence.py)
+        self.assertEqual(args[1].alias, 'bitmask', "Trigger phải là 'bitmask'")
+        details = args[1].trigger_args['recurrence']['details']
+        self.assertEqual(details['days_of_week'], [5, 6], "Phải là T7, CN")
+        self.assertIn('start_date', details, "Phải có mốc bắt đầu để đếm chu kỳ")
+        print("   -> [PASS]")
+
+    def test_add_schedules_bulk(self):
+        """Test case 15: Nạp lịch theo lô, báo lỗi từng bản ghi"""
+        print("\n[TEST 15] Kiểm tra add_schedules (bulk)")
+        records = [
+            {'id': 'a', 'hour': 8, 'minute': 0, 'meeting_id': '1', 'recurrence': {'type': 'daily'}},
+            {'id': 'b', 'minute': 0, 'recurrence': {'type': 'daily'}},  # thiếu 'hour'
+            {'id': 'c', 'hour': 9, 'minute': 15, 'enabled': False, 'recurrence': {'type': 'weekdays'}},
+            {'hour': 10, 'minute': 0, 'recurrence': {'type': 'once', 'run_date': 'not-a-date'}},
+            {'hour': 7, 'minute': 45, 'recurrence': {'type': 'weekly', 'details': {'days_of_week': [1]}}},
+        ]
+        report = self.manager.add_schedules(records)
+
+        self.assertEqual(len(report['added']), 3)
+        self.assertEqual([(i, jid) for i, jid, _ in report['errors']], [(1, 'b'), (3, None)])
+        self.assertIn('a', self.manager.jobs)
+        self.assertFalse(self.manager.jobs['c']['enabled'])
+        # Chỉ các lịch đang bật mới được đăng ký, và chỉ đánh thức scheduler một lần
+        self.assertEqual(self.manager.scheduler.add_job.call_count, 2)
+        self.manager.scheduler.pause.assert_called_once()
+        self.manager.scheduler.resume.assert_called_once()
+        self.mock_callback.assert_called_once()
+        print("   -> [PASS]")
+
+    def test_trigger_cache_shares_signatures(self):
+        """Test case 17: Lịch cùng dạng lặp lại dùng chung một trigger"""
+        print("\n[TEST 17] Kiểm tra cache trigger theo chữ ký lặp lại")
+        weekly = {'type': 'weekly', 'details': {'days_of_week': [1, 3]}}
+        a = self.manager.add_schedule(None, 9, 0, "1", recurrence=weekly)
+        b = self.manager.add_schedule(None, 9, 0, "2", recurrence={'type': 'weekly', 'details': {'days_of_week': [3, 1]}})
+        c = self.manager.add_schedule(None, 8, 0, "3", recurrence={'type': 'weekdays'})
+        triggers = [call.args[1] for call in self.manager.scheduler.add_job.call_args_list]
+        self.assertIs(triggers[0], triggers[1])
+        self.assertIsNot(triggers[0], triggers[2])
+
+        stats = self.manager.trigger_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+
+        # Tắt/xóa lịch thì trả lại tham chiếu; hết tham chiếu thì trigger bị bỏ khỏi cache
+        self.manager.toggle_schedule(c, False)
+        self.manager.remove_schedule(a)
+        self.assertEqual(self.manager.trigger_cache_stats()['size'], 1)
+        self.manager.remove_schedule(b)
+        self.assertEqual(self.manager.trigger_cache_stats()['size'], 0)
+        print("   -> [PASS]")
+
+    def test_shared_trigger_memoizes_fire_time(self):
+        """Test case 18: Một lần tính giờ chạy kế tiếp cho mỗi tick"""
+        print("\n[TEST 18] Kiểm tra memo get_next_fire_time")
+        self.manager.add_schedule(None, 8, 0, "1", recurrence={'type': 'daily'})
+        trigger = self.manager.scheduler.add_job.call_args.args[1]
+        now = datetime.now().astimezone()
+        first = trigger.get_next_fire_time(None, now)
+        self.assertEqual(trigger.get_next_fire_time(None, now), first)
+        stats = self.manager.trigger_cache_stats()
+        self.assertEqual((stats['fire_time_hits'], stats['fire_time_misses']), (1, 1))
+        print("   -> [PASS]")
+
+class TestRecurrenceCompiler(unittest.TestCase):
+    """Biên dịch quy tắc lặp thành bitmask theo ngày trong năm"""
+    def test_every_two_weeks(self):
+        """Test case 23: Mỗi 2 tuần vào T7, CN chạy đúng tuần"""
+        print("\n[TEST 23] Kiểm tra mỗi 2 tuần")
+        rec = {'type': 'custom', 'details': {'unit': 'tuần', 'interval': 2, 'days_of_week': [5, 6],
+                                             'start_date': '2025-01-01'}}
+        rule = recurrence.compile_recurrence(rec, 20, 0)
+        fires, moment = [], datetime(2025, 1, 1)
+        for _ in range(4):
+            moment = rule.next_fire_after(moment)
+            fires.append(moment)
+        self.assertEqual(fires, [datetime(2025, 1, 4, 20), datetime(2025, 1, 5, 20),
+                                 datetime(2025, 1, 18, 20), datetime(2025, 1, 19, 20)])
+        self.assertFalse(rule.fires_on(datetime(2025, 1, 11).date()))
+        print("   -> [PASS]")
+
+    def test_monthly_and_year_rollover(self):
+        """Test case 24: Hàng tháng (bỏ qua tháng không có ngày 31), qua năm mới"""
+        print("\n[TEST 24] Kiểm tra lịch hàng tháng")
+        rec = {'type': 'custom', 'details': {'unit': 'tháng', 'interval': 1, 'start_date': '2024-10-31',
+                                             'end_date': '2025-06-01'}}
+        rule = recurrence.compile_recurrence(rec, 9, 30)
+        self.assertEqual(rule.next_fire_after(datetime(2024, 11, 1)), datetime(2024, 12, 31, 9, 30))
+        self.assertEqual(rule.next_fire_after(datetime(2024, 12, 31, 9, 30)), datetime(2025, 1, 31, 9, 30))
+        self.assertEqual(rule.next_fire_after(datetime(2025, 1, 31, 10)), datetime(2025, 3, 31, 9, 30))
+        self.assertIsNone(rule.next_fire_after(datetime(2025, 5, 31, 10)))  # quá end_date
+
+        trigger = recurrence.BitmaskTrigger(rec, 9, 30)
+        now = datetime(2025, 1, 1).astimezone()
+        self.assertEqual(trigger.get_next_fire_time(None, now).replace(tzinfo=None), datetime(2025, 1, 31, 9, 30))
+        print("   -> [PASS]")
+
+    def test_manager_next_fire_time(self):
+        """Test case 25: SchedulerManager.next_fire_time / fires_on"""
+        print("\n[TEST 25] Kiểm tra next_fire_time của SchedulerManager")
+        manager = SchedulerManager(callback=None, engine='heap')
+        try:
+            job_id = manager.add_schedule(None, 8, 0, "1", recurrence={'type': 'weekdays'})
+            self.assertEqual(manager.next_fire_time(job_id, datetime(2025, 1, 3, 9)), datetime(2025, 1, 6, 8))
+            self.assertTrue(manager.fires_on(job_id, datetime(2025, 1, 6).date()))
+            self.assertFalse(manager.fires_on(job_id, datetime(2025, 1, 5).date()))
+            monthly = manager.add_schedule(None, 7, 0, "2", recurrence={'type': 'custom', 'details': {
+                'unit': 'tháng', 'interval': 1, 'start_date': '2025-01-15'}})
+            job = manager.scheduler.get_job(monthly)
+            self.assertEqual(job.next_run_time.day, 15)
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+    def test_scan_stops_at_rule_bounds(self):
+        """Test case 58: Tìm giờ chạy kế tiếp dừng ở run_date, ngày bắt đầu/kết thúc và khoảng trống tối đa"""
+        print("\n[TEST 58] Kiểm tra giới hạn quét năm")
+        once = recurrence.compile_recurrence({'type': 'once', 'run_date': '2025-03-01T08:15:00'}, 0, 0)
+        self.assertEqual(once.next_fire_after(datetime(2025, 1, 1)), datetime(2025, 3, 1, 8, 15))
+        self.assertIsNone(once.next_fire_after(datetime(2025, 3, 1, 8, 15)))
+        self.assertEqual(len(once._years), 0)  # so thẳng run_date, không dựng bitmask năm nào
+
+        ended = recurrence.compile_recurrence({'type': 'custom', 'details': {
+            'unit': 'ngày', 'interval': 1, 'start_date': '2024-01-01', 'end_date': '2024-06-01'}}, 9, 0)
+        self.assertIsNone(ended.next_fire_after(datetime(2026, 1, 1)))
+        self.assertEqual(len(ended._years), 0)
+
+        later = recurrence.compile_recurrence({'type': 'custom', 'details': {
+            'unit': 'ngày', 'interval': 3, 'start_date': '2040-05-02'}}, 9, 0)
+        self.assertEqual(later.next_fire_after(datetime(2025, 1, 1)), datetime(2040, 5, 2, 9))
+        self.assertEqual(sorted(later._years), [2040])
+
+        leap = recurrence.compile_recurrence({'type': 'custom', 'details': {
+            'unit': 'năm', 'interval': 1, 'start_date': '2096-02-29'}}, 9, 0)
+        self.assertEqual(leap.next_fire_after(datetime(2096, 3, 1)), datetime(2104, 2, 29, 9))
+
+        never = recurrence.compile_recurrence({'type': 'custom', 'details': {
+            'unit': 'tuần', 'interval': 1, 'days_of_week': [9]}}, 9, 0)
+        self.assertIsNone(never.next_fire_after(datetime(2025, 1, 1)))
+        self.assertLessEqual(len(never._years), 2)
+        print("   -> [PASS]")
+
+class TestHeapEngine(unittest.TestCase):
+    """Bộ lập lịch min-heap (engine='heap')"""
+    def setUp(self):
+        self.manager = SchedulerManager(callback=MagicMock(), engine='heap')
+        self.fired = threading.Event()
+        self.manager._open_zoom = lambda *args: self.fired.set()
+
+    def tearDown(self):
+        self.manager.stop()
+
+    def test_native_triggers(self):
+        """Test case 12: Tính thời điểm chạy kế tiếp của trigger gốc"""
+        print("\n[TEST 12] Kiểm tra trigger của engine heap")
+        wed = datetime(2025, 1, 1, 9, 0)  # Thứ Tư
+        cron = timer_heap.create_trigger('cron', hour=8, minute=0, day_of_week='0-4')
+        self.assertEqual(cron.next_fire_time(wed), datetime(2025, 1, 2, 8, 0))
+        weekly = timer_heap.create_trigger('cron', hour=9, minute=0, day_of_week='0')
+        self.assertEqual(weekly.next_fire_time(wed), datetime(2025, 1, 6, 9, 0))
+        every3 = timer_heap.create_trigger('interval', days=3, start_date=datetime(2025, 1, 1, 15, 0))
+        self.assertEqual(every3.next_fire_time(datetime(2025, 1, 1, 15, 0)), datetime(2025, 1, 4, 15, 0))
+        once = timer_heap.create_trigger('date', run_date=wed)
+        self.assertIsNone(once.next_fire_time(wed))
+        print("   -> [PASS]")
+
+    def test_add_remove_toggle(self):
+        """Test case 13: add/remove/toggle giữ nguyên API khi dùng heap"""
+        print("\n[TEST 13] Kiểm tra add/remove/toggle trên engine heap")
+        job_id = self.manager.add_schedule(None, 10, 30, "123", enabled=True, recurrence={'type': 'daily'})
+        job = self.manager.scheduler.get_job(job_id)
+        self.assertIsNotNone(job.next_run_time)
+        self.assertEqual((job.next_run_time.hour, job.next_run_time.minute), (10, 30))
+
+        self.manager.toggle_schedule(job_id, False)
+        self.assertIsNone(self.manager.scheduler.get_job(job_id))
+        self.manager.toggle_schedule(job_id, True)
+        self.assertIsNotNone(self.manager.scheduler.get_job(job_id))
+
+        self.assertTrue(self.manager.remove_schedule(job_id))
+        self.assertIsNone(self.manager.scheduler.get_job(job_id))
+        with self.assertRaises(timer_heap.JobLookupError):
+            self.manager.scheduler.remove_job(job_id)
+        print("   -> [PASS]")
+
+    def test_bulk_insert_keeps_heap_order(self):
+        """Test case 16: Nạp theo lô trên heap (heapify một lần khi resume)"""
+        print("\n[TEST 16] Kiểm tra add_schedules trên engine heap")
+        records = [{'hour': h, 'minute': 0, 'recurrence': {'type': 'daily'}} for h in (23, 5, 17, 0, 9)]
+        report = self.manager.add_schedules(records)
+        self.assertEqual(len(report['added']), 5)
+        heap = self.manager.scheduler._heap
+        self.assertEqual(heap[0][0], min(entry[0] for entry in heap))
+        print("   -> [PASS]")
+
+    def test_dispatcher_fires_due_job(self):
+        """Test case 14: Thread điều phối đánh thức và chạy job đến hạn"""
+        print("\n[TEST 14] Kiểm tra job 'date' được chạy đúng hạn")
+        run_date = datetime.now() + timedelta(milliseconds=200)
+        self.manager.add_schedule(None, run_date.hour, run_date.minute, "123", enabled=True,
+                                  recurrence={'type': 'once', 'run_date': run_date.isoformat()})
+        self.assertTrue(self.fired.wait(3), "Job phải được chạy trong vòng 3 giây")
+        print("   -> [PASS]")
+
+    def test_invalid_engine_in_config_falls_back(self):
+        """Test case 64: engine sai trong app_config.json không làm hỏng khởi động"""
+        print("\n[TEST 64] Kiểm tra engine không hợp lệ trong app_config.json")
+        import main
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'app_config.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'engine': 'hepa', 'launch_concurrency': 2}, f)
+            with patch.object(main, 'APP_CONFIG_FILE', main.Path(path)):
+                config = main.load_app_config()
+        self.assertEqual(config['engine'], 'apscheduler')
+        self.assertEqual(config['launch_concurrency'], 2)
+        SchedulerManager(callback=MagicMock(), engine=config['engine']).stop()
+        print("   -> [PASS]")
+
+class TestLaunchDispatcher(unittest.TestCase):
+    """Gom các lần mở Zoom đến hạn cùng lúc"""
+    def test_same_window_is_one_batch(self):
+        """Test case 19: Các lần mở trong cùng cửa sổ được gom thành một lô"""
+        print("\n[TEST 19] Kiểm tra gom lô mở Zoom")
+        lock = threading.Lock()
+        running = {'now': 0, 'peak': 0}
+        def launch(meeting_id, password, zoom_link):
+            with lock:
+                running['now'] += 1
+                running['peak'] = max(running['peak'], running['now'])
+            threading.Event().wait(0.02)
+            with lock:
+                running['now'] -= 1
+
+        dispatcher = CoalescingDispatcher(launch, window=60, max_concurrency=2, stagger=0.01)
+        try:
+            for i in range(6):
+                dispatcher.submit(str(i), "", "")
+            dispatcher.flush()
+            deadline = datetime.now() + timedelta(seconds=3)
+            while dispatcher.stats()['launches'] < 6 and datetime.now() < deadline:
+                threading.Event().wait(0.01)
+        finally:
+            dispatcher.stop()
+
+        # Lần mở đầu tiên có thể đi ngay một mình (lúc đó không có gì đang chờ); phần còn lại là một lô
+        self.assertIn(sorted(b.size for b in dispatcher.batches), ([1, 5], [6]))
+        batch = max(dispatcher.batches, key=lambda b: b.size)
+        self.assertEqual(batch.errors, 0)
+        self.assertGreaterEqual(batch.duration, (batch.size - 1) * 0.01)  # stagger giữa các lần mở
+        self.assertLessEqual(running['peak'], 2)            # giới hạn đồng thời
+        self.assertEqual(dispatcher.stats()['launches'], 6)
+        print("   -> [PASS]")
+
+    def test_manager_routes_fire_through_dispatcher(self):
+        """Test case 20: SchedulerManager đưa lịch đến hạn vào dispatcher"""
+        print("\n[TEST 20] Kiểm tra SchedulerManager dùng dispatcher")
+        manager = SchedulerManager(callback=None, engine='heap', coalesce_window=0.05, launch_stagger=0)
+        opened = []
+        done = threading.Event()
+        def fake_open(*args):
+            opened.append(args)
+            if len(opened) == 3:
+                done.set()
+        manager._open_zoom = fake_open
+        try:
+            for i in range(3):
+                manager._fire(str(i), "", "")
+            self.assertTrue(done.wait(3))
+            deadline = datetime.now() + timedelta(seconds=3)
+            while manager.dispatch_stats()['launches'] < 3 and datetime.now() < deadline:
+                threading.Event().wait(0.01)
+            # Lần đầu đi ngay (không có gì đang chờ), các lần sau gom vào lô kế tiếp
+            self.assertIn(manager.dispatch_stats()['batches'], (1, 2))
+            self.assertEqual(manager.dispatch_stats()['launches'], 3)
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+    def test_batches_run_one_at_a_time(self):
+        """Test case 56: Lần mở đến giữa lúc một lô đang chạy phải chờ lô đó; lần mở đơn lẻ không chờ cửa sổ"""
+        print("\n[TEST 56] Kiểm tra các lô mở Zoom chạy lần lượt")
+        lock = threading.Lock()
+        running = {'now': 0, 'peak': 0}
+        starts = {}
+        release = threading.Event()
+        first_started = threading.Event()
+        all_done = threading.Event()
+
+        def launch(meeting_id, password, zoom_link):
+            with lock:
+                starts[meeting_id] = time.monotonic()
+                running['now'] += 1
+                running['peak'] = max(running['peak'], running['now'])
+            if meeting_id == '0':
+                first_started.set()
+                release.wait(5)
+            with lock:
+                running['now'] -= 1
+                if len(starts) == 4 and running['now'] == 0:
+                    all_done.set()
+
+        dispatcher = CoalescingDispatcher(launch, window=0.3, max_concurrency=2, stagger=0.05)
+        try:
+            submitted = time.monotonic()
+            dispatcher.submit('0', '', '')
+            self.assertTrue(first_started.wait(2))
+            self.assertLess(starts['0'] - submitted, 0.25)  # không chờ hết cửa sổ 0.3s
+            for i in range(1, 4):
+                dispatcher.submit(str(i), '', '')
+            threading.Event().wait(0.6)  # quá cửa sổ: lô thứ hai đã đến hạn nhưng phải chờ lô đầu
+            self.assertEqual(list(starts), ['0'])
+            release.set()
+            self.assertTrue(all_done.wait(5))
+            deadline = time.monotonic() + 3
+            while len(dispatcher.batches) < 2 and time.monotonic() < deadline:
+                threading.Event().wait(0.01)
+        finally:
+            release.set()
+            dispatcher.stop()
+
+        self.assertLessEqual(running['peak'], 2)
+        order = sorted(starts.values())
+        for before, after in zip(order, order[1:]):
+            self.assertGreaterEqual(after - before, 0.05 - 0.005)  # giãn cách giữ qua các lô
+        self.assertEqual([b.size for b in dispatcher.batches], [1, 3])
+        print("   -> [PASS]")
+
+class TestOccurrences(unittest.TestCase):
+    """Khai triển lịch thành các thời điểm chạy trong một khoảng ngày"""
+    def test_expand_rules(self):
+        """Test case 21: Khai triển daily/weekdays/weekly/once/custom"""
+        print("\n[TEST 21] Kiểm tra khai triển thời điểm chạy")
+        start, end = datetime(2025, 1, 1), datetime(2025, 1, 15)  # 01/01/2025 là thứ Tư
+        jobs = {
+            'daily': {'hour': 8, 'minute': 0, 'recurrence': {'type': 'daily'}},
+            'weekdays': {'hour': 7, 'minute': 30, 'recurrence': {'type': 'weekdays'}},
+            'weekly': {'hour': 9, 'minute': 0, 'recurrence': {'type': 'weekly', 'details': {'days_of_week': [0, 2]}}},
+            'once': {'hour': 0, 'minute': 0, 'recurrence': {'type': 'once', 'run_date': '2025-01-03T14:45:00'}},
+            'every3': {'hour': 15, 'minute': 0, 'recurrence': {'type': 'custom', 'details': {
+                'unit': 'ngày', 'interval': 3, 'start_date': '2025-01-02', 'end_date': '2025-01-11'}}},
+            'biweekly': {'hour': 20, 'minute': 0, 'recurrence': {'type': 'custom', 'details': {
+                'unit': 'tuần', 'interval': 2, 'days_of_week': [5], 'start_date': '2025-01-01'}}},
+            'off': {'hour': 8, 'minute': 0, 'enabled': False, 'recurrence': {'type': 'daily'}},
+        }
+        result = occurrences.expand_schedules(jobs, start, end)
+
+        self.assertEqual(len(result['daily']), 14)
+        self.assertEqual(len(result['weekdays']), 10)
+        self.assertEqual(occurrences.to_datetimes(result['weekly']),
+                         [datetime(2025, 1, 1, 9), datetime(2025, 1, 6, 9),
+                          datetime(2025, 1, 8, 9), datetime(2025, 1, 13, 9)])
+        self.assertEqual(occurrences.to_datetimes(result['once']), [datetime(2025, 1, 3, 14, 45)])
+        # end_date là nửa đêm 11/01 -> lần chạy 15:00 ngày 11/01 bị loại
+        self.assertEqual(occurrences.to_datetimes(result['every3']),
+                         [datetime(2025, 1, 2, 15), datetime(2025, 1, 5, 15), datetime(2025, 1, 8, 15)])
+        self.assertEqual(occurrences.to_datetimes(result['biweekly']), [datetime(2025, 1, 4, 20)])
+        self.assertNotIn('off', result)
+        print("   -> [PASS]")
+
+    def test_agenda_and_load_profile(self):
+        """Test case 22: Agenda sắp theo thời gian và đếm số lần mở theo phút"""
+        print("\n[TEST 22] Kiểm tra agenda / load_profile")
+        jobs = {str(i): {'hour': 8, 'minute': 0, 'recurrence': {'type': 'weekdays'}} for i in range(3)}
+        jobs['late'] = {'hour': 9, 'minute': 0, 'recurrence': {'type': 'daily'}}
+        times, owners = occurrences.agenda(jobs, datetime(2025, 1, 6), datetime(2025, 1, 7))
+        self.assertEqual(list(owners), ['0', '1', '2', 'late'])
+        slots, counts = occurrences.load_profile(jobs, datetime(2025, 1, 6), datetime(2025, 1, 7))
+        self.assertEqual(counts.tolist(), [3, 1])
+        print("   -> [PASS]")
+
+class TestLaunchMetrics(unittest.TestCase):
+    """Đo độ trễ các lần mở Zoom"""
+    def test_ring_buffer_percentiles(self):
+        """Test case 26: Ring buffer giới hạn kích thước và tính p50/p95/p99"""
+        print("\n[TEST 26] Kiểm tra ring buffer và phân vị độ trễ")
+        metrics = LaunchMetrics(capacity=100)
+        for i in range(150):
+            metrics.mark_planned(str(i), 1000.0)
+            record = metrics.start(str(i))
+            record.picked_up = 1000.0 + i / 1000.0
+            metrics.finish(record)
+            record.opened = record.picked_up + 0.5
+        metrics.mark_missed('x')
+        stats = metrics.summary()
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual(stats['missed'], 1)
+        # Chỉ giữ 100 bản ghi cuối: pickup_lag 0.050 .. 0.149
+        self.assertAlmostEqual(stats['pickup_lag']['p50'], 0.099)
+        self.assertAlmostEqual(stats['pickup_lag']['p95'], 0.144)
+        self.assertAlmostEqual(stats['pickup_lag']['p99'], 0.148)
+        self.assertAlmostEqual(stats['open_duration']['max'], 0.5)
+        print("   -> [PASS]")
+
+    def test_records_real_fire_on_both_engines(self):
+        """Test case 27: Mỗi lần chạy thật ghi lại giờ dự kiến, giờ nhận và giờ mở xong"""
+        print("\n[TEST 27] Kiểm tra đo độ trễ trên cả hai engine")
+        for engine in SchedulerManager.ENGINES:
+            manager = SchedulerManager(callback=MagicMock(), engine=engine)
+            opened = threading.Event()
+            manager._open_zoom = lambda *args: opened.set()
+            try:
+                run_date = datetime.now() + timedelta(milliseconds=300)
+                job_id = manager.add_schedule(None, run_date.hour, run_date.minute, "123", enabled=True,
+                                              recurrence={'type': 'once', 'run_date': run_date.isoformat()})
+                self.assertTrue(opened.wait(3), f"[{engine}] Job phải được chạy trong vòng 3 giây")
+                deadline = datetime.now() + timedelta(seconds=3)
+                # APScheduler tự gỡ job 'once' sau khi chạy: chờ xong rồi mới dừng
+                pending = lambda: engine == 'apscheduler' and manager.scheduler.get_job(job_id)
+                while ((not manager.launch_metrics.records or pending())
+                       and datetime.now() < deadline):
+                    threading.Event().wait(0.01)
+                record = manager.launch_metrics.recent()[-1]
+                self.assertEqual(record['job_id'], job_id)
+                self.assertAlmostEqual(record['planned'], run_date.timestamp(), delta=0.001)
+                self.assertGreaterEqual(record['pickup_lag'], 0)
+                self.assertLess(record['lag'], 1.0)
+                self.assertEqual(manager.latency_stats()['count'], 1)
+            finally:
+                manager.stop()
+        print("   -> [PASS]")
+
+class TestScheduleStore(unittest.TestCase):
+    """Kho lưu trữ lịch (JSON / SQLite)"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, 'zoom_schedule.json')
+        self.db_path = os.path.join(self.tmp.name, 'zoom_schedule.db')
+        self.jobs = {
+            'a': {'hour': 9, 'minute': 0, 'meeting_id': '111', 'enabled': True, 'name': 'Toán'},
+            'b': {'hour': 7, 'minute': 30, 'meeting_id': '222', 'enabled': True, 'name': 'Văn'},
+        }
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.jobs, f, ensure_ascii=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sqlite_migrates_and_upserts_changed_rows(self):
+        """Test case 28: SQLite chuyển dữ liệu từ JSON một lần và chỉ ghi dòng thay đổi"""
+        print("\n[TEST 28] Kiểm tra kho SQLite: migrate + upsert từng dòng")
+        store = SqliteScheduleStore(self.db_path, legacy_json=self.json_path)
+        loaded = store.load()
+        self.assertEqual(loaded, self.jobs)
+        self.assertEqual(list(loaded), ['b', 'a'])  # sắp theo giờ
+
+        jobs = dict(loaded)
+        jobs['a'] = {**jobs['a'], 'enabled': False}
+        jobs['c'] = {'hour': 20, 'minute': 0, 'meeting_id': '333', 'name': 'Anh'}
+        del jobs['b']
+        before = store._conn.total_changes
+        store.save(jobs, ['a', 'b', 'c'])
+        self.assertEqual(store._conn.total_changes - before, 3)
+        store.close()
+
+        # File JSON cũ không bị nhập lại lần nữa
+        reopened = SqliteScheduleStore(self.db_path, legacy_json=self.json_path)
+        self.assertEqual(reopened.load(), jobs)
+        mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+        reopened.close()
+        print("   -> [PASS]")
+
+    def test_json_store_round_trip(self):
+        """Test case 29: Kho JSON giữ nguyên định dạng zoom_schedule.json"""
+        print("\n[TEST 29] Kiểm tra kho JSON")
+        store = JsonScheduleStore(self.json_path)
+        jobs = store.load()
+        jobs['a']['name'] = 'Toán nâng cao'
+        store.save(jobs, ['a'])
+        with open(self.json_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), jobs)
+        self.assertEqual(JsonScheduleStore(os.path.join(self.tmp.name, 'missing.json')).load(), {})
+        self.assertFalse(os.path.exists(self.json_path + '.tmp'))  # ghi qua file tạm rồi os.replace
+        print("   -> [PASS]")
+
+    def test_write_behind_coalesces_and_flushes(self):
+        """Test case 30: Ghi nền gom nhiều thay đổi thành một lần lưu, flush ghi ngay"""
+        print("\n[TEST 30] Kiểm tra write-behind persister")
+        store = JsonScheduleStore(self.json_path)
+        jobs = store.load()
+        persister = WriteBehindPersister(store, jobs, window=10)
+        try:
+            for i in range(50):
+                jobs['a'] = {**jobs['a'], 'enabled': i % 2 == 0}
+                persister.mark(jobs, ['a'])
+            jobs['c'] = {'hour': 20, 'minute': 0, 'meeting_id': '333'}
+            persister.mark(jobs, ['c'])
+            del jobs['b']
+            persister.mark(jobs, ['b'])
+            jobs['c']['meeting_id'] = '999'  # sửa sau khi mark không ảnh hưởng bản đã ghi nhận
+            self.assertEqual(persister.stats()['saves'], 0)  # còn trong cửa sổ debounce
+            self.assertTrue(persister.flush(timeout=5))
+            stats = persister.stats()
+            self.assertEqual((stats['saves'], stats['mutations'], stats['pending']), (1, 52, 0))
+            saved = store.load()
+            self.assertEqual(sorted(saved), ['a', 'c'])
+            self.assertFalse(saved['a']['enabled'])
+            self.assertEqual(saved['c']['meeting_id'], '333')
+        finally:
+            persister.stop(timeout=5)
+        print("   -> [PASS]")
+
+    def test_write_behind_mirror_owns_records(self):
+        """Test case 59: Write-behind chỉ chép bảng (không chép bản ghi); lịch thay bản ghi mới thay vì sửa tại chỗ"""
+        print("\n[TEST 59] Kiểm tra bản sao nông của write-behind")
+        manager = SchedulerManager(callback=None, engine='heap')
+        try:
+            job_a = manager.add_schedule(None, 8, 0, "111", enabled=True, name="A", recurrence={'type': 'daily'})
+            job_b = manager.add_schedule(None, 9, 0, "222", enabled=True, name="B", recurrence={'type': 'daily'})
+            store = JsonScheduleStore(self.json_path)
+            persister = WriteBehindPersister(store, manager.get_all_jobs(), window=10)
+            try:
+                before = manager.jobs[job_a]
+                self.assertIs(persister._mirror[job_a], before)   # không nhân đôi bản ghi trong bộ nhớ
+                manager.toggle_schedule(job_a, False)
+                # toggle thay bản ghi mới, bản ghi cũ (có thể đang được luồng ghi đọc) giữ nguyên
+                self.assertTrue(before['enabled'])
+                self.assertFalse(manager.jobs[job_a]['enabled'])
+                # Lịch đổi nhưng chưa mark không lọt vào lần lưu
+                manager.add_schedule(job_b, 9, 0, "222", enabled=True, name="B chưa lưu", recurrence={'type': 'daily'})
+                persister.mark(manager.get_all_jobs(), [job_a])
+                self.assertTrue(persister.flush(timeout=5))
+                saved = store.load()
+                self.assertFalse(saved[job_a]['enabled'])
+                self.assertEqual(saved[job_b]['name'], 'B')
+                persister.mark(manager.get_all_jobs())
+                self.assertEqual(persister.stats()['pending'], 2)
+                self.assertTrue(persister.flush(timeout=5))
+                self.assertEqual(store.load()[job_b]['name'], 'B chưa lưu')
+            finally:
+                persister.stop(timeout=5)
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+    def test_journal_replays_and_survives_torn_tail(self):
+        """Test case 31: Journal phát lại snapshot + các thay đổi, bỏ qua bản ghi ghi dở"""
+        print("\n[TEST 31] Kiểm tra journal: replay và bản ghi cuối bị cắt")
+        store = JournalScheduleStore(self.json_path)
+        jobs = store.load()
+        jobs['a'] = {**jobs['a'], 'enabled': False}
+        store.save(jobs, ['a'])
+        del jobs['b']
+        store.save(jobs, ['b'])
+        jobs['c'] = {'hour': 20, 'minute': 0, 'meeting_id': '333'}
+        store.save(jobs, ['c'])
+        store.close()
+        # Giả lập mất điện khi đang ghi bản ghi cuối
+        journal = os.path.join(self.tmp.name, 'zoom_schedule.journal')
+        with open(journal, 'rb+') as f:
+            f.truncate(os.path.getsize(journal) - 5)
+
+        store = JournalScheduleStore(self.json_path)
+        recovered = store.load()
+        self.assertEqual(recovered, {'a': jobs['a']})  # chỉ mất bản ghi cuối ('c')
+        recovered['d'] = {'hour': 6, 'minute': 0}
+        store.save(recovered, ['d'])  # ghi tiếp trên dòng mới, không dính vào phần hỏng
+        store.close()
+        self.assertEqual(JournalScheduleStore(self.json_path).load(), recovered)
+        print("   -> [PASS]")
+
+    def test_journal_skips_malformed_records(self):
+        """Test case 55: Dòng journal là JSON hợp lệ nhưng sai dạng bị bỏ qua, không làm hỏng cả lần tải"""
+        print("\n[TEST 55] Kiểm tra journal: bản ghi sai dạng")
+        store = JournalScheduleStore(self.json_path)
+        jobs = store.load()
+        jobs['a'] = {**jobs['a'], 'enabled': False}
+        store.save(jobs, ['a'])
+        store.close()
+        journal = os.path.join(self.tmp.name, 'zoom_schedule.journal')
+        with open(journal, 'a', encoding='utf-8') as f:
+            f.write('{}\n[]\n["p"]\n["p","b"]\n["d"]\n["x","b"]\n["p","b",7]\n"p"\n')
+            f.write('["d","b"]\n')
+
+        store = JournalScheduleStore(self.json_path)
+        try:
+            recovered = store.load()
+            self.assertEqual(store.skipped_records, 8)
+            del jobs['b']
+            self.assertEqual(recovered, jobs)
+            store.compact()
+            with open(self.json_path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), jobs)
+            self.assertEqual(store.journal_size(), 0)
+        finally:
+            store.close()
+        print("   -> [PASS]")
+
+    def test_journal_compaction(self):
+        """Test case 32: Journal vượt ngưỡng được gộp vào snapshot ở thread nền"""
+        print("\n[TEST 32] Kiểm tra gộp journal vào snapshot")
+        store = JournalScheduleStore(self.json_path, max_bytes=2000)
+        jobs = store.load()
+        try:
+            for i in range(60):
+                jobs['a'] = {**jobs['a'], 'name': f'Toán {i}'}
+                store.save(jobs, ['a'])
+            deadline = datetime.now() + timedelta(seconds=5)
+            while store.compactions == 0 and datetime.now() < deadline:
+                threading.Event().wait(0.01)
+            self.assertGreaterEqual(store.compactions, 1)
+            store.compact()
+            self.assertEqual(store.journal_size(), 0)
+            with open(self.json_path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), jobs)
+            self.assertEqual(store.load(), jobs)
+        finally:
+            store.close()
+        print("   -> [PASS]")
+
+class TestBinarySnapshot(unittest.TestCase):
+    """Snapshot nhị phân: bảng chuỗi + mảng bản ghi, giải mã khi cần"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'zoom_schedule.zsb')
+        weekly = {'type': 'weekly', 'details': {'days_of_week': [0, 2]}}
+        self.jobs = {
+            f'job-{i}': {'id': f'job-{i}', 'name': f'Lớp {i % 3}', 'hour': 7 + i % 10, 'minute': 30,
+                         'meeting_id': '83738062598', 'password': 'abc' if i % 2 else '',
+                         'zoom_link': '', 'enabled': i % 4 != 0,
+                         'recurrence': weekly if i % 2 else {'type': 'daily'}}
+            for i in range(20)
+        }
+        self.jobs['once'] = {'id': 'once', 'name': 'Họp', 'hour': 0, 'minute': 0, 'meeting_id': '',
+                             'password': '', 'zoom_link': 'https://zoom.us/j/1', 'enabled': True,
+                             'recurrence': None}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_lazy_decode(self):
+        """Test case 33: Ghi/đọc snapshot nhị phân, bản ghi chỉ được giải mã khi truy cập"""
+        print("\n[TEST 33] Kiểm tra snapshot nhị phân")
+        binary_snapshot.write_snapshot(self.jobs, self.path)
+        reader = binary_snapshot.SnapshotReader(self.path)
+        try:
+            records = reader.records()
+            self.assertEqual(len(records), 21)
+            self.assertEqual(records.decoded, 0)
+            self.assertEqual(records['job-5'], self.jobs['job-5'])
+            self.assertEqual(records.decoded, 1)
+            self.assertEqual(records.materialize(), self.jobs)
+            # Mỗi bản ghi có bản sao recurrence riêng dù dùng chung một chuỗi trong file
+            records['job-1']['recurrence']['details']['days_of_week'].append(6)
+            self.assertEqual(records['job-3']['recurrence']['details']['days_of_week'], [0, 2])
+        finally:
+            reader.close()
+        # Chuỗi lặp lại (meeting id, dạng lặp) chỉ được lưu một lần
+        self.assertLess(os.path.getsize(self.path), 2000)
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot at all, definitely not')
+        with self.assertRaises(binary_snapshot.SnapshotError):
+            binary_snapshot.SnapshotReader(self.path)
+        print("   -> [PASS]")
+
+    def test_iteration_leaves_records_encoded(self):
+        """Test case 60: Duyệt id và dựng chỉ mục tìm kiếm trên snapshot vừa mở không giải mã bản ghi nào"""
+        print("\n[TEST 60] Kiểm tra duyệt snapshot không giải mã")
+        binary_snapshot.write_snapshot(self.jobs, self.path)
+        reader = binary_snapshot.SnapshotReader(self.path)
+        manager = SchedulerManager(callback=None, engine='heap')
+        try:
+            records = reader.records()
+            self.assertEqual(list(records), list(self.jobs))
+            self.assertIn('job-3', records)
+            self.assertEqual(records.decoded, 0)
+            manager.jobs = schedule_index.OverlayJobs(records)
+            self.assertTrue(manager.warm_search_index(budget=None))
+            self.assertEqual(len(manager.search_index), 21)
+            self.assertEqual(records.decoded, 0)  # chỉ mục chỉ giữ khóa tìm kiếm, không giữ bản ghi
+            self.assertEqual(records.peek('job-5'), self.jobs['job-5'])
+            self.assertIsNone(records.peek('missing'))
+            self.assertEqual(records.decoded, 0)
+        finally:
+            manager.stop()
+            reader.close()
+        print("   -> [PASS]")
+
+    def test_binary_store_migrates_from_json(self):
+        """Test case 34: Kho nhị phân đọc JSON cũ cho tới lần lưu đầu tiên"""
+        print("\n[TEST 34] Kiểm tra BinaryScheduleStore")
+        json_path = os.path.join(self.tmp.name, 'zoom_schedule.json')
+        JsonScheduleStore(json_path).save(self.jobs)
+        store = BinaryScheduleStore(self.path, legacy_json=json_path)
+        jobs = dict(store.load())
+        self.assertEqual(jobs, self.jobs)
+        jobs['job-0'] = {**jobs['job-0'], 'enabled': True}
+        store.save(jobs, ['job-0'])
+        loaded = store.load()
+        self.assertTrue(loaded['job-0']['enabled'])
+        store.save(dict(loaded.items()))  # ghi đè file đang được map
+        self.assertEqual(dict(store.load().items()), jobs)
+        store.close()
+        print("   -> [PASS]")
+
+    def test_binary_save_copies_unchanged_records(self):
+        """Test case 57: Lưu kho nhị phân chỉ mã hóa lịch đã sửa, lịch khác được chép nguyên từ file"""
+        print("\n[TEST 57] Kiểm tra lưu snapshot không giải mã lại")
+        binary_snapshot.write_snapshot(self.jobs, self.path)
+        store = BinaryScheduleStore(self.path)
+        records = store.load()
+        jobs = schedule_index.OverlayJobs(records)
+        jobs['job-2'] = {**jobs['job-2'], 'name': 'Lớp đã đổi tên', 'enabled': False}
+        del jobs['job-4']
+        jobs['job-new'] = {**self.jobs['job-1'], 'id': 'job-new', 'meeting_id': '999'}
+        store.save(jobs.copy(), ['job-2', 'job-4', 'job-new'])
+        # Chỉ job-2 được đọc (để sửa); lịch còn lại vẫn nằm nguyên dạng mã hóa
+        self.assertEqual(records.decoded, 1)
+        expected = {job_id: data for job_id, data in self.jobs.items() if job_id != 'job-4'}
+        expected['job-2'] = jobs['job-2']
+        expected['job-new'] = jobs['job-new']
+        # File đã bị thay thế nhưng các bản ghi đã nạp vẫn đọc được
+        self.assertEqual(records['job-7'], self.jobs['job-7'])
+        jobs['job-7'] = {**jobs['job-7'], 'hour': 23}
+        expected['job-7'] = jobs['job-7']
+        store.save(jobs, ['job-7'])
+        self.assertEqual(records.decoded, 2)
+        self.assertEqual(list(jobs), list(expected))
+        store.close()
+        reloaded = BinaryScheduleStore(self.path)
+        self.assertEqual(reloaded.load().materialize(), expected)
+        reloaded.close()
+        print("   -> [PASS]")
+
+class TestScheduleIndex(unittest.TestCase):
+    """Chỉ mục giờ chạy trên đĩa và khởi động chỉ đăng ký các lịch sớm nhất"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.tmp.name, 'zoom_schedule.zsb')
+        self.index_path = os.path.join(self.tmp.name, 'zoom_schedule.zsx')
+        self.jobs = {
+            f'job-{i}': {'id': f'job-{i}', 'name': f'Lớp {i}', 'hour': (i * 7) % 24, 'minute': (i * 13) % 60,
+                         'meeting_id': str(100 + i), 'password': '', 'zoom_link': '', 'enabled': i != 3,
+                         'recurrence': {'type': 'daily'}}
+            for i in range(30)
+        }
+        binary_snapshot.write_snapshot(self.jobs, self.snapshot)
+        self.manager = None
+
+    def tearDown(self):
+        if self.manager:
+            self.manager.stop()
+        self.tmp.cleanup()
+
+    def _load(self, arm_limit, built_at=None):
+        schedule_index.write_index(self.snapshot, self.index_path, now=built_at)
+        index = schedule_index.FireIndex(self.index_path)
+        self.assertTrue(index.matches(self.snapshot))
+        records = binary_snapshot.SnapshotReader(self.snapshot).records()
+        self.manager = SchedulerManager(callback=MagicMock(), engine='heap')
+        self.manager._open_zoom = lambda *args: None
+        return index, records, self.manager.load_indexed(records, index, arm_limit=arm_limit)
+
+    def _armed(self):
+        return {job.id for job in self.manager.scheduler.get_jobs()} - {SchedulerManager.REFILL_JOB_ID}
+
+    def test_index_is_sorted_by_next_fire(self):
+        """Test case 35: Chỉ mục xếp theo giờ chạy kế tiếp, bỏ lịch đang tắt"""
+        print("\n[TEST 35] Kiểm tra chỉ mục giờ chạy")
+        now = datetime.now()
+        count = schedule_index.write_index(self.snapshot, self.index_path, now=now)
+        index = schedule_index.FireIndex(self.index_path)
+        try:
+            self.assertEqual(count, 29)
+            times = list(index.times)
+            self.assertEqual(times, sorted(times))
+            self.assertTrue(all(now.timestamp() < t <= now.timestamp() + 86400 for t in times))
+            self.assertEqual(index.first_at_or_after(0), 0)
+            self.assertEqual(index.first_at_or_after(times[-1] + 1), 29)
+        finally:
+            index.close()
+        # Snapshot ghi lại -> chỉ mục cũ không còn khớp
+        threading.Event().wait(0.01)
+        binary_snapshot.write_snapshot(self.jobs, self.snapshot)
+        index = schedule_index.FireIndex(self.index_path)
+        self.assertFalse(index.matches(self.snapshot))
+        index.close()
+        print("   -> [PASS]")
+
+    def test_load_indexed_arms_earliest_and_refills(self):
+        """Test case 36: load_indexed chỉ đăng ký N lịch sớm nhất, phần còn lại nạp dần"""
+        print("\n[TEST 36] Kiểm tra khởi động theo chỉ mục")
+        index, records, report = self._load(arm_limit=5)
+        self.assertEqual((report['armed'], report['pending'], report['stale']), (5, 24, 0))
+        self.assertEqual(records.decoded, 5)  # chỉ giải mã các lịch được đăng ký
+        earliest = {records.at(index.positions[i])['id'] for i in range(5)}
+        self.assertEqual(self._armed(), earliest)
+        self.assertIsNotNone(self.manager.scheduler.get_job(SchedulerManager.REFILL_JOB_ID))
+        self.assertEqual(len(self.manager.get_all_jobs()), 30)
+
+        # Lịch bị xóa / sửa sau khi tải không bị đăng ký lại từ chỉ mục
+        removed = records.at(index.positions[5])['id']
+        self.assertTrue(self.manager.remove_schedule(removed))
+        self.assertEqual(self.manager._arm_next(), 5)
+        self.assertNotIn(removed, self._armed())
+        self.assertEqual(len(self._armed()), 10)
+        self.assertNotIn(removed, self.manager.get_all_jobs())
+        while self.manager._arm_next():
+            pass
+        self.assertEqual(len(self._armed()), 28)
+        self.assertIsNone(self.manager.scheduler.get_job(SchedulerManager.REFILL_JOB_ID))
+        print("   -> [PASS]")
+
+    def test_stale_index_is_recomputed(self):
+        """Test case 37: Chỉ mục cũ (ứng dụng tắt lâu) được tính lại giờ ở thread nền"""
+        print("\n[TEST 37] Kiểm tra tính lại chỉ mục quá hạn")
+        _, _, report = self._load(arm_limit=5, built_at=datetime.now() - timedelta(days=2))
+        self.assertEqual((report['armed'], report['stale']), (0, 29))
+        deadline = datetime.now() + timedelta(seconds=5)
+        while len(self.manager._arm_queue) < 29 and datetime.now() < deadline:
+            threading.Event().wait(0.01)
+        self.assertEqual(len(self.manager._arm_queue), 29)
+        self.assertEqual(self.manager._arm_next(), 5)
+        for job_id in self._armed():
+            job = self.manager.scheduler.get_job(job_id)
+            self.assertGreater(job.next_run_time, datetime.now())
+        print("   -> [PASS]")
+
+class TestStreamingLoader(unittest.TestCase):
+    """Đọc tệp lịch từng bản ghi, cách ly bản ghi hỏng"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'zoom_schedule.json')
+        self.quarantine = os.path.join(self.tmp.name, 'zoom_schedule.quarantine.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def _quarantined(self):
+        with open(self.quarantine, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_mixed_layouts_and_quarantine(self):
+        """Test case 38: Đọc cả dạng dict lẫn dạng list, bản ghi hỏng vào tệp cách ly"""
+        print("\n[TEST 38] Kiểm tra loader dạng stream với bản ghi hỏng")
+        self._write('[{"hour": 8, "minute": 0, "meeting_id": "1", "name": "Toán \\"A\\""},'
+                    ' {"id": "x", "hour": 9, "minute": 5}, 42, {"hour": 10,}, {"minute": 7}]')
+        loader = schedule_loader.StreamingJsonLoader(
+            self.path, schedule_loader.Quarantine(self.quarantine), chunk_size=8)
+        records = list(loader)
+        self.assertEqual([r['hour'] for _, r in records if 'hour' in r], [8, 9])
+        self.assertEqual(records[1][0], 'x')
+        self.assertEqual(records[0][1]['name'], 'Toán "A"')
+        self.assertEqual((loader.loaded, loader.quarantined, loader.fatal), (3, 2, None))
+        self.assertEqual([e['error'] for e in self._quarantined()],
+                         ['Bản ghi không phải object', 'JSON không hợp lệ'])
+
+        # Dạng dict: bản ghi thiếu 'hour' không làm dừng cả lần tải
+        self._write(json.dumps({'a': {'hour': 7, 'minute': 0}, 'b': {'minute': 1},
+                                'c': {'hour': 23, 'minute': 59}}))
+        store = JsonScheduleStore(self.path)
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            loaded = store.load()
+            report = manager.add_schedules({**d, 'id': k} for k, d in loaded.items())
+            self.assertEqual(sorted(report['added']), ['a', 'c'])
+            self.assertEqual([(i, job_id) for i, job_id, _ in report['errors']], [(1, 'b')])
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+    def test_truncated_file_keeps_loaded_records(self):
+        """Test case 39: Tệp bị cắt cụt vẫn giữ các lịch đã đọc và báo tiến độ"""
+        print("\n[TEST 39] Kiểm tra tệp bị cắt cụt và tiến độ tải")
+        jobs = {str(i): {'hour': i % 24, 'minute': i % 60, 'name': 'x' * 40} for i in range(200)}
+        text = json.dumps(jobs, indent=4)
+        self._write(text[:len(text) * 3 // 4])
+        progress = []
+        store = JsonScheduleStore(self.path)
+        loaded = store.load(progress=lambda done, total, n: progress.append((done, total, n)))
+        self.assertTrue(store.load_report['fatal'])
+        self.assertGreater(len(loaded), 100)
+        self.assertEqual(loaded, {k: jobs[k] for k in loaded})
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(progress[-1][0], progress[-1][1])
+        self.assertEqual(progress[-1][2], len(loaded))
+        entries = self._quarantined()
+        self.assertEqual(len(entries), 1)
+        self.assertIn(entries[0]['raw'][:20], text)
+        print("   -> [PASS]")
+
+class TestHorizon(unittest.TestCase):
+    """Chế độ cửa sổ: chỉ đăng ký các lịch sắp chạy"""
+    def _check_engine(self, engine):
+        manager = SchedulerManager(callback=MagicMock(), engine=engine, horizon=24 * 3600)
+        try:
+            now = datetime.now()
+            soon = now + timedelta(hours=2)
+            far = now + timedelta(days=30)
+            report = manager.add_schedules([
+                {'id': 'soon', 'hour': soon.hour, 'minute': soon.minute, 'meeting_id': '1',
+                 'recurrence': {'type': 'daily'}},
+                {'id': 'far', 'hour': far.hour, 'minute': far.minute, 'meeting_id': '2',
+                 'recurrence': {'type': 'once', 'run_date': far.replace(second=0, microsecond=0).isoformat()}},
+                {'id': 'off', 'hour': 9, 'minute': 0, 'meeting_id': '3', 'enabled': False,
+                 'recurrence': {'type': 'daily'}},
+            ])
+            self.assertEqual(len(report['added']), 3)
+            self.assertIsNotNone(manager.scheduler.get_job('soon'))
+            self.assertIsNone(manager.scheduler.get_job('far'))
+            self.assertIsNotNone(manager.scheduler.get_job(SchedulerManager.HORIZON_JOB_ID))
+            self.assertEqual(manager.horizon_stats(), {'horizon': 24 * 3600, 'live': 1, 'cold': 1})
+
+            # Cửa sổ mở rộng: lịch xa được đưa vào; thu hẹp: lịch đã đăng ký bị cất lại
+            manager.horizon = 40 * 24 * 3600
+            self.assertEqual(manager._refill_horizon(), {'promoted': 1, 'demoted': 0})
+            self.assertIsNotNone(manager.scheduler.get_job('far'))
+            manager.horizon = 3600
+            self.assertEqual(manager._refill_horizon(), {'promoted': 0, 'demoted': 2})
+            self.assertEqual(manager.horizon_stats()['live'], 0)
+
+            # Xóa / tắt lịch đang nằm trong hàng đợi lạnh: không bị đăng ký lại
+            manager.remove_schedule('far')
+            manager.toggle_schedule('soon', False)
+            manager.horizon = 40 * 24 * 3600
+            self.assertEqual(manager._refill_horizon(), {'promoted': 0, 'demoted': 0})
+            self.assertEqual(manager.horizon_stats()['cold'], 0)
+            self.assertIsNone(manager.scheduler.get_job('far'))
+            self.assertIsNone(manager.scheduler.get_job('soon'))
+        finally:
+            manager.stop()
+
+    def test_only_near_term_jobs_are_armed(self):
+        """Test case 40: Chỉ lịch chạy trong cửa sổ được đăng ký, job nạp định kỳ đưa lịch vào/ra"""
+        print("\n[TEST 40] Kiểm tra chế độ cửa sổ (horizon) trên cả hai engine")
+        for engine in SchedulerManager.ENGINES:
+            with self.subTest(engine=engine):
+                self._check_engine(engine)
+        print("   -> [PASS]")
+
+class TestScheduleWatcher(unittest.TestCase):
+    """Theo dõi tệp lịch do công cụ bên ngoài ghi"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'zoom_schedule.json')
+        self.jobs = {f"j{i}": {'hour': 8 + i, 'minute': 0, 'meeting_id': str(i), 'recurrence': {'type': 'daily'}}
+                     for i in range(4)}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, jobs):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(jobs, f)
+
+    def test_poll_ignores_own_saves_and_waits_for_settled_file(self):
+        """Test case 41: Watcher chỉ báo khi tệp đổi nội dung, đã ghi xong và không phải do ứng dụng ghi"""
+        print("\n[TEST 41] Kiểm tra watcher tệp lịch")
+        store = JsonScheduleStore(self.path)
+        store.save(self.jobs)
+        watcher = schedule_watcher.ScheduleFileWatcher(self.path, ignore_digest=lambda: store.last_written_digest)
+        self.assertFalse(watcher.poll())
+
+        changed = dict(self.jobs, j9={'hour': 6, 'minute': 0})
+        store.save(changed)  # ứng dụng tự lưu
+        os.utime(self.path, ns=(1, 1))
+        self.assertFalse(watcher.poll())
+        self.assertFalse(watcher.poll())
+
+        self._write(self.jobs)  # công cụ bên ngoài ghi
+        os.utime(self.path, ns=(2, 2))
+        self.assertFalse(watcher.poll())  # chờ thêm một lần để chắc tệp đã ghi xong
+        self.assertTrue(watcher.poll())
+        self.assertFalse(watcher.poll())
+        self.assertEqual(watcher.changes, 1)
+        print("   -> [PASS]")
+
+    def test_sync_records_applies_only_the_diff(self):
+        """Test case 42: sync_records chỉ đăng ký lại lịch thêm/sửa và xóa lịch không còn trong tệp"""
+        print("\n[TEST 42] Kiểm tra đồng bộ lịch theo tệp thay đổi")
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            manager.add_schedules({**data, 'id': job_id} for job_id, data in self.jobs.items())
+            untouched = manager.scheduler.get_job('j3')
+            incoming = json.loads(json.dumps(self.jobs))
+            incoming['j1']['hour'] = 20
+            del incoming['j2']
+            incoming['new'] = {'hour': 9, 'minute': 30, 'recurrence': {'type': 'daily'}}
+            incoming['j0'] = {'minute': 5}  # bản ghi lỗi: giữ nguyên lịch cũ
+            with patch.object(manager, 'remove_schedule', wraps=manager.remove_schedule) as remove:
+                result = manager.sync_records(incoming)
+            self.assertEqual((result['added'], result['changed'], result['removed']), (['new'], ['j1'], ['j2']))
+            self.assertEqual([job_id for job_id, _ in result['errors']], ['j0'])
+            remove.assert_called_once_with('j2')
+            self.assertEqual(manager.jobs['j1']['hour'], 20)
+            self.assertEqual(manager.jobs['j0']['hour'], 8)
+            self.assertIn('j0', manager.jobs)
+            self.assertIs(manager.scheduler.get_job('j3'), untouched)
+            self.assertEqual(manager.sync_records(manager.jobs)['changed'], [])
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+    def test_custom_schedule_without_start_date_keeps_its_anchor(self):
+        """Test case 62: Lịch tùy chỉnh thiếu start_date không bị coi là đã sửa khi qua ngày"""
+        print("\n[TEST 62] Kiểm tra ngày bắt đầu của lịch tùy chỉnh khi đồng bộ tệp")
+        rule = {'type': 'custom', 'details': {'interval': 2, 'unit': 'weeks'}}
+        incoming = {'k': {'hour': 7, 'minute': 0, 'meeting_id': '1', 'recurrence': rule}}
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            first = manager.sync_records(incoming)
+            self.assertEqual((first['added'], first['anchored']), (['k'], ['k']))
+            self.assertNotIn('start_date', rule['details'])  # dict của người gọi không bị sửa
+            anchor = manager.jobs['k']['recurrence']['details']['start_date']
+
+            class Tomorrow(date):
+                @classmethod
+                def today(cls):
+                    return date.fromisoformat(anchor) + timedelta(days=1)
+
+            with patch('main.date', Tomorrow):
+                again = manager.sync_records(incoming)
+            self.assertEqual((again['added'], again['changed'], again['removed']), ([], [], []))
+            self.assertEqual(again['anchored'], ['k'])   # tệp vẫn thiếu ngày: cần ghi lại
+            self.assertEqual(manager.jobs['k']['recurrence']['details']['start_date'], anchor)
+
+            report = manager.add_schedules([{**incoming['k'], 'id': 'k2'}])
+            self.assertEqual(report['anchored'], ['k2'])
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+    def test_list_entries_without_id_keep_their_id_across_reads(self):
+        """Test case 63: Bản ghi thiếu id trong tệp dạng mảng được gán id cố định giữa các lần đọc"""
+        print("\n[TEST 63] Kiểm tra id cố định cho bản ghi thiếu id")
+        entry = {'hour': 9, 'minute': 0, 'meeting_id': '5', 'recurrence': {'type': 'daily'}}
+        self._write([entry, dict(entry), {**entry, 'hour': 10}, {**entry, 'id': 'giu'}])
+        first, _ = schedule_loader.load_schedule_file(self.path)
+        second, _ = schedule_loader.load_schedule_file(self.path)
+        self.assertEqual(list(first), list(second))
+        self.assertEqual(len(first), 4)   # hai bản ghi giống nhau vẫn có id riêng
+        self.assertIn('giu', first)
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            manager.sync_records(first)
+            result = manager.sync_records(second)
+            self.assertEqual((result['added'], result['changed'], result['removed']), ([], [], []))
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+class TestScheduleImport(unittest.TestCase):
+    """Nhập lịch hàng loạt từ CSV và iCalendar"""
+    NOW = datetime(2025, 1, 6, 7, 0)  # thứ Hai
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        return path
+
+    def test_ics_rules_map_onto_recurrences(self):
+        """Test case 43: RRULE/EXDATE/RECURRENCE-ID trong .ics được chuyển thành lịch tương ứng"""
+        print("\n[TEST 43] Kiểm tra nhập lịch từ iCalendar")
+        path = self._file('lich.ics', "\r\n".join([
+            "BEGIN:VCALENDAR",
+            "BEGIN:VEVENT", "UID:toan", "SUMMARY:Toán", "DTSTART:20250106T080000",
+            "RRULE:FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20250331T235959", "EXDATE:20250113T080000",
+            "LOCATION:https://us06web.zoom.us/j/83738123456?pwd=abc", "END:VEVENT",
+            "BEGIN:VEVENT", "UID:toan", "RECURRENCE-ID:20250120T080000", "SUMMARY:Toán (dời)",
+            "DTSTART:20250121T090000", "DESCRIPTION:Meeting ID: 837 3812 3456\\nPasscode: 999", "END:VEVENT",
+            "BEGIN:VEVENT", "UID:ly", "SUMMARY:Lý", "DTSTART:20250203T193000",
+            "RRULE:FREQ=WEEKLY;INTERVAL=2", "END:VEVENT",
+            "BEGIN:VEVENT", "UID:cu", "SUMMARY:Đã qua", "DTSTART:20241230T080000", "END:VEVENT",
+            "BEGIN:VEVENT", "UID:kho", "SUMMARY:Thứ Ba thứ hai", "DTSTART:20250114T080000",
+            "RRULE:FREQ=MONTHLY;BYDAY=2TU", "END:VEVENT",
+            "END:VCALENDAR", ""]))
+        importer = schedule_import.ScheduleImporter(path, now=self.NOW)
+        records = {r['id']: r for r in importer}
+        self.assertEqual(importer.skipped, 1)
+        self.assertEqual(len(importer.errors), 1)
+        self.assertEqual(sorted(records), ['ly', 'toan', 'toan/20250120'])
+
+        toan = records['toan']
+        self.assertEqual((toan['hour'], toan['minute'], toan['meeting_id'], toan['password']),
+                         (8, 0, '83738123456', 'abc'))
+        self.assertEqual(toan['recurrence']['type'], 'weekly')
+        self.assertEqual(toan['recurrence']['details']['exclude_dates'], ['2025-01-13', '2025-01-20'])
+        moved = records['toan/20250120']
+        self.assertEqual(moved['recurrence'], {'type': 'once', 'run_date': '2025-01-21T09:00:00'})
+        self.assertEqual((moved['meeting_id'], moved['password']), ('83738123456', '999'))
+        self.assertEqual(records['ly']['recurrence']['details']['start_date'], '2025-02-03')
+
+        grid = occurrences.DayGrid(datetime(2025, 1, 6).date(), datetime(2025, 1, 26).date())
+        fired = grid.days[occurrences.day_mask(grid, toan['recurrence'])].astype(str).tolist()
+        self.assertEqual(fired, ['2025-01-06', '2025-01-08', '2025-01-15', '2025-01-22'])
+        print("   -> [PASS]")
+
+    def test_csv_rows_register_in_one_batch(self):
+        """Test case 44: Các dòng CSV được đăng ký trong một lô, dòng lỗi bị báo và bỏ qua"""
+        print("\n[TEST 44] Kiểm tra nhập lịch từ CSV")
+        path = self._file('lich.csv', "\n".join([
+            "name,meeting_id,password,time,type,days,exclude,date",
+            "Văn,111,p1,07:30,weekly,\"T2,T4\",2099-01-05;2099-01-07,",
+            "Sử,222,,20:00,daily,,,",
+            "Họp,333,,14:00,once,,,2099-05-01",
+            "Hỏng,444,,25:99,daily,,,",
+            "Qua,555,,09:00,once,,,2020-01-01", ""]))
+        importer = schedule_import.ScheduleImporter(path)
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            with patch.object(manager, 'add_schedule') as single:
+                report = manager.add_schedules(importer)
+            single.assert_not_called()
+            self.assertEqual(len(report['added']), 3)
+            self.assertEqual((importer.imported, importer.skipped), (4, 1))
+            self.assertEqual(len(report['errors']), 1)
+            van = next(job for job in manager.jobs.values() if job['name'] == 'Văn')
+            self.assertEqual(van['recurrence']['details'],
+                             {'days_of_week': [0, 2], 'exclude_dates': ['2099-01-05', '2099-01-07']})
+            job = manager.scheduler.get_job(van['id'])
+            self.assertIsNotNone(job)
+            self.assertFalse(hasattr(job.trigger, 'fields'))  # không dùng CronTrigger khi có ngày loại trừ
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+class TestScheduleEntry(unittest.TestCase):
+    """Bản ghi lịch gọn (__slots__) thay cho dict"""
+    def test_entries_behave_like_records_and_share_rules(self):
+        """Test case 45: ScheduleEntry đọc/ghi như dict, lưu ra JSON đúng dạng cũ và dùng chung Recurrence"""
+        print("\n[TEST 45] Kiểm tra ScheduleEntry / Recurrence")
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            weekly = {'type': 'weekly', 'details': {'days_of_week': [0, 2]}}
+            manager.add_schedules([
+                {'id': 'a', 'hour': 8, 'minute': 0, 'meeting_id': '1', 'recurrence': weekly},
+                {'id': 'b', 'hour': 9, 'minute': 30, 'meeting_id': '2', 'recurrence': json.loads(json.dumps(weekly))},
+                {'id': 'c', 'hour': 10, 'minute': 0, 'recurrence': {'type': 'custom', 'details': {'unit': 'ngày', 'interval': 2}}},
+            ])
+            a, b, c = (manager.jobs[job_id] for job_id in 'abc')
+            self.assertIsInstance(a, schedule_entry.ScheduleEntry)
+            self.assertIs(a['recurrence'], b['recurrence'])
+            self.assertEqual(a, {'id': 'a', 'name': '', 'hour': 8, 'minute': 0, 'meeting_id': '1', 'password': '',
+                                 'zoom_link': '', 'enabled': True, 'recurrence': weekly})
+            self.assertEqual({**a}['hour'], 8)
+            self.assertEqual(c['recurrence']['details']['start_date'], datetime.now().date().isoformat())
+            with self.assertRaises(TypeError):
+                a['recurrence']['details']['interval'] = 3
+
+            manager.toggle_schedule('a', False)
+            self.assertFalse(manager.jobs['a']['enabled'])
+            self.assertTrue(b['enabled'])
+
+            rule = schedule_entry.Recurrence.from_dict({'type': 'custom', 'details': {'unit': 'tuần'}})
+            anchored = manager._ensure_anchor(rule)
+            self.assertIsNot(anchored, rule)
+            self.assertNotIn('start_date', rule['details'])
+            self.assertIn('start_date', anchored['details'])
+
+            with tempfile.TemporaryDirectory() as tmp:
+                store = JsonScheduleStore(os.path.join(tmp, 'zoom_schedule.json'))
+                store.save(manager.jobs)
+                loaded = store.load()
+            self.assertEqual(loaded, {job_id: entry.to_dict() for job_id, entry in manager.jobs.items()})
+            self.assertEqual(type(loaded['b']['recurrence']['details']), dict)
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+class TestScheduleSearch(unittest.TestCase):
+    """Chỉ mục phụ: tìm theo Meeting ID, link và tên"""
+    def test_indexes_follow_add_edit_remove(self):
+        """Test case 46: Chỉ mục meeting/link/tên được cập nhật theo từng thao tác thêm/sửa/xóa"""
+        print("\n[TEST 46] Kiểm tra tìm kiếm lịch theo chỉ mục")
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            daily = {'type': 'daily'}
+            manager.add_schedules([
+                {'id': 'a', 'name': 'Toán 10A1', 'hour': 8, 'minute': 0, 'meeting_id': '837 3806 2598',
+                 'recurrence': daily},
+                {'id': 'b', 'name': 'Toán 10A2', 'hour': 9, 'minute': 0,
+                 'zoom_link': 'https://us06web.zoom.us/j/83738062598?pwd=abc', 'recurrence': daily},
+                {'id': 'c', 'name': 'Lý 11', 'hour': 10, 'minute': 0, 'meeting_id': '111222333',
+                 'zoom_link': 'zoom.us/j/83738062598/?pwd=abc', 'recurrence': daily},
+                {'id': 'd', 'name': 'Đại số', 'hour': 11, 'minute': 0, 'meeting_id': '999888777',
+                 'recurrence': daily},
+            ])
+            self.assertEqual(manager.find_by_meeting('83738062598'), ['a', 'b'])
+            self.assertEqual(manager.find_by_link('https://US02WEB.zoom.us/j/83738062598?pwd=abc'), ['b', 'c'])
+            self.assertEqual(manager.find_by_name('toan 10a*'), ['a', 'b'])
+            self.assertEqual(manager.find_by_name('dai'), ['d'])
+            self.assertEqual(manager.find_by_name('', limit=3), ['d', 'c', 'a'])
+            self.assertEqual(manager.duplicate_meetings(), {'83738062598': ['a', 'b']})
+
+            manager.add_schedule('a', 8, 0, '999888777', name='Hóa 12', recurrence=daily)
+            manager.remove_schedule('d')
+            self.assertEqual(manager.find_by_meeting('83738062598'), ['b'])
+            self.assertEqual(manager.find_by_meeting('999888777'), ['a'])
+            self.assertEqual(manager.find_by_name('toan'), ['b'])
+            self.assertEqual(manager.find_by_name('hoa'), ['a'])
+            self.assertEqual(manager.find_by_name('đại'), [])
+            self.assertEqual(manager.duplicate_meetings(), {})
+
+            manager.jobs = {'x': {'id': 'x', 'name': 'Sinh', 'meeting_id': '1234567890'}}
+            self.assertEqual(manager.find_by_meeting('1234567890'), ['x'])  # dựng lại khi jobs bị thay
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+class TestStringInterning(unittest.TestCase):
+    """Chuỗi lặp lại (link, Meeting ID, mật khẩu, tên) được dùng chung giữa các lịch"""
+    def test_repeated_strings_share_one_object(self):
+        """Test case 47: Lịch cùng phòng dùng chung chuỗi; thống kê phòng dùng chung"""
+        print("\n[TEST 47] Kiểm tra dùng chung chuỗi và thống kê phòng trùng")
+        from schedule_entry import intern_record, intern_stats
+        link = ''.join(['https://zoom.us/j/', '83738062598?pwd=abc'])
+        other = ''.join(['https://zoom.us/j/8373806', '2598?pwd=abc'])
+        self.assertIsNot(link, other)
+        self.assertIs(intern_record({'zoom_link': link})['zoom_link'], intern_record({'zoom_link': other})['zoom_link'])
+
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            weekly = {'type': 'weekly', 'details': {'days_of_week': [0]}}
+            manager.add_schedules([
+                {'id': str(i), 'name': ''.join(['Toán ', '10A']), 'hour': 7 + i, 'minute': 0,
+                 'meeting_id': ''.join(['8373806', '2598']), 'zoom_link': ''.join(['https://zoom.us/j/', '83738062598']),
+                 'recurrence': weekly} for i in range(3)
+            ] + [{'id': 'x', 'name': 'Lý', 'hour': 12, 'minute': 0, 'meeting_id': '111222333', 'recurrence': weekly}])
+            manager.add_schedule('3', 15, 0, ''.join(['83738', '062598']), name='Toán 10A', recurrence=weekly)
+            entries = [manager.jobs[job_id] for job_id in ('0', '1', '2', '3')]
+            for key in ('name', 'meeting_id'):
+                self.assertEqual(len({id(entry[key]) for entry in entries}), 1, key)
+
+            stats = manager.duplicate_stats(top=5)
+            self.assertEqual(stats['duplicated_meetings'], 1)
+            self.assertEqual(stats['top'], [('83738062598', 4)])
+            self.assertEqual(stats['strings']['strings'], 13)
+            self.assertGreater(stats['strings']['saved_bytes'], 0)
+            self.assertEqual(intern_stats([]), {'strings': 0, 'objects': 0, 'saved_bytes': 0})
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+class TestScheduleTableModel(unittest.TestCase):
+    """Bảng lịch dạng model/view: không tạo widget cho từng dòng"""
+    def test_model_reads_jobs_and_updates_rows(self):
+        """Test case 48: Model sắp xếp theo giờ, định dạng ô khi được hỏi, bật/tắt và cập nhật từng dòng"""
+        print("\n[TEST 48] Kiểm tra ScheduleTableModel")
+        from PyQt6.QtCore import Qt
+        jobs = {
+            'b': {'id': 'b', 'name': 'Lý', 'hour': 9, 'minute': 0, 'meeting_id': '83738062598', 'enabled': True},
+            'a': {'id': 'a', 'name': 'Toán', 'hour': 7, 'minute': 30, 'meeting_id': '123', 'enabled': False,
+                  'recurrence': {'type': 'once', 'run_date': '2030-05-04T07:30:00'}},
+            'c': {'id': 'c', 'name': 'Hóa', 'hour': 9, 'minute': 0, 'zoom_link': 'https://zoom.us/j/1'},
+        }
+        model = schedule_table.ScheduleTableModel(lambda: jobs, lambda m: f"<{m}>")
+        model.reload()
+        self.assertEqual([model.job_id(row) for row in range(model.rowCount())], ['a', 'b', 'c'])
+        cell = lambda row, col, role=Qt.ItemDataRole.DisplayRole: model.data(model.index(row, col), role)
+        self.assertEqual(cell(0, schedule_table.TIME), '04/05 07:30')
+        self.assertEqual(cell(1, schedule_table.MEETING), '<83738062598>')
+        self.assertEqual(cell(2, schedule_table.LINK), 'https://zoom.us/j/1')
+        self.assertEqual(cell(1, schedule_table.TOGGLE, Qt.ItemDataRole.CheckStateRole), Qt.CheckState.Checked)
+
+        toggled = []
+        model.toggle_requested.connect(lambda job_id, enabled: toggled.append((job_id, enabled)))
+        self.assertTrue(model.setData(model.index(0, schedule_table.TOGGLE), True, Qt.ItemDataRole.CheckStateRole))
+        self.assertFalse(model.setData(model.index(0, schedule_table.NAME), 'x', Qt.ItemDataRole.EditRole))
+        self.assertEqual(toggled, [('a', True)])
+
+        inserted, removed, changed = [], [], []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append(first))
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append(first))
+        model.dataChanged.connect(lambda first, last, roles=(): changed.append(first.row()))
+        jobs['a'] = {**jobs['a'], 'name': 'Toán 2'}          # cùng giờ: chỉ vẽ lại dòng đó
+        jobs['b'] = {**jobs['b'], 'hour': 6}                  # đổi giờ: chuyển lên đầu
+        jobs['d'] = {'id': 'd', 'name': 'Văn', 'hour': 9, 'minute': 0}
+        del jobs['c']
+        model.update_rows(['a', 'b', 'c', 'd'])
+        self.assertEqual([model.job_id(row) for row in range(model.rowCount())], ['b', 'a', 'd'])
+        self.assertEqual((changed, removed, inserted), ([0], [2, 1], [0, 2]))
+        self.assertEqual(model.row_of('d'), 2)
+        self.assertEqual(model.row_of('c'), -1)
+        print("   -> [PASS]")
+
+    def test_edit_updates_one_row_without_reset(self):
+        """Test case 49: Sửa một lịch chỉ phát tín hiệu cho đúng dòng đó, không reset model, dòng chọn được giữ"""
+        print("\n[TEST 49] Kiểm tra cập nhật bảng theo từng dòng")
+        from PyQt6.QtCore import QItemSelectionModel
+        jobs = {f"j{i}": {'id': f"j{i}", 'name': f"Lớp {i}", 'hour': i, 'minute': 0} for i in range(20)}
+        model = schedule_table.ScheduleTableModel(lambda: jobs)
+        model.reload()
+        selection = QItemSelectionModel(model)
+        selection.select(model.index(5, 0), QItemSelectionModel.SelectionFlag.ClearAndSelect
+                         | QItemSelectionModel.SelectionFlag.Rows)
+        events = []
+        model.modelReset.connect(lambda: events.append('reset'))
+        model.rowsInserted.connect(lambda parent, first, last: events.append(('insert', first)))
+        model.rowsRemoved.connect(lambda parent, first, last: events.append(('remove', first)))
+        model.dataChanged.connect(lambda first, last, roles=(): events.append(('change', first.row())))
+
+        jobs['j5'] = {**jobs['j5'], 'name': 'Lớp 5 (sửa)', 'minute': 30}
+        model.update_rows(['j5'])
+        self.assertEqual(events, [('change', 5)])
+        self.assertTrue(selection.isRowSelected(5))
+        self.assertEqual(model.data(model.index(5, schedule_table.NAME)), 'Lớp 5 (sửa)')
+
+        events.clear()
+        jobs['new'] = {'id': 'new', 'name': 'Mới', 'hour': 2, 'minute': 0}
+        model.update_rows(['new'])
+        self.assertEqual(events, [('insert', 3)])
+        self.assertEqual(selection.selectedRows()[0].data(schedule_table.JOB_ID_ROLE), 'j5')
+        print("   -> [PASS]")
+
+    def test_row_map_follows_inserts_removals_and_moves(self):
+        """Test case 50: job_id <-> dòng luôn khớp sau thêm/xóa/đổi giờ ngẫu nhiên"""
+        print("\n[TEST 50] Kiểm tra ánh xạ job_id <-> dòng")
+        import random
+        rnd = random.Random(7)
+        jobs = {f"j{i}": {'id': f"j{i}", 'hour': rnd.randrange(24), 'minute': 0} for i in range(200)}
+        model = schedule_table.ScheduleTableModel(lambda: jobs)
+        model.reload()
+        for step in range(300):
+            batch = []
+            for _ in range(rnd.randrange(1, 4)):
+                job_id = f"j{rnd.randrange(260)}"
+                if job_id in jobs and rnd.random() < 0.3:
+                    del jobs[job_id]
+                else:
+                    jobs[job_id] = {'id': job_id, 'hour': rnd.randrange(24), 'minute': 0}
+                batch.append(job_id)
+            model.update_rows(batch)
+            order = [model.job_id(row) for row in range(model.rowCount())]
+            hours = [jobs[job_id]['hour'] for job_id in order]
+            self.assertEqual(sorted(order), sorted(jobs))
+            self.assertEqual(hours, sorted(hours))
+            probe = rnd.choice(order)
+            self.assertEqual(model.job_id(model.row_of(probe)), probe)
+        self.assertEqual([model.row_of(job_id) for job_id in order], list(range(len(order))))
+        self.assertEqual(model.row_of('missing'), -1)
+
+        # Đặt dòng vào chỗ mới chỉ đọc bản ghi vừa đổi, các dòng khác so theo khóa đã lưu
+        reads = []
+
+        class CountingJobs(dict):
+            def get(self, key, default=None):
+                reads.append(key)
+                return super().get(key, default)
+
+        counted = CountingJobs(jobs)
+        model = schedule_table.ScheduleTableModel(lambda: counted)
+        model.reload()
+        moved = order[0]
+        counted[moved] = {**counted[moved], 'hour': 23, 'minute': 59}
+        model.update_rows([moved])
+        self.assertEqual(reads, [moved])
+        self.assertEqual(model.job_id(model.rowCount() - 1), moved)
+        print("   -> [PASS]")
+
+class TestScheduleFilter(unittest.TestCase):
+    """Thanh lọc: tìm theo tên/Meeting ID/link, loại lặp, bật/tắt qua chỉ mục và proxy"""
+    def test_query_index_and_proxy(self):
+        """Test case 51: search() và accepts() cho cùng kết quả; proxy theo kịp thêm/sửa/xóa khi đang lọc"""
+        print("\n[TEST 51] Kiểm tra bộ lọc lịch")
+        Query = schedule_search.ScheduleQuery
+        manager = SchedulerManager(callback=MagicMock())
+        try:
+            weekly = {'type': 'weekly', 'details': {'days_of_week': [0]}}
+            manager.add_schedules([
+                {'id': 'a', 'name': 'Toán 10A1', 'hour': 7, 'minute': 0, 'meeting_id': '83738062598',
+                 'recurrence': weekly},
+                {'id': 'b', 'name': 'Tiếng Anh 10A1', 'hour': 8, 'minute': 0, 'meeting_id': '83799990000',
+                 'enabled': False, 'recurrence': {'type': 'daily'}},
+                {'id': 'c', 'name': 'Vật lý 11', 'hour': 9, 'minute': 0,
+                 'zoom_link': 'https://us06web.zoom.us/j/83738062598?pwd=x', 'recurrence': weekly},
+                {'id': 'd', 'name': 'Hóa 12', 'hour': 10, 'minute': 0, 'meeting_id': '111222333',
+                 'recurrence': {'type': 'daily'}},
+            ])
+            cases = {
+                Query('to'): {'a'},
+                Query('t 10a'): {'a', 'b'},
+                Query('TIẾNG a'): {'b'},
+                Query('837 3806'): {'a', 'c'},
+                Query('837'): {'a', 'b', 'c'},
+                Query('zoom.us/j/83738062598'): {'a', 'c'},
+                Query(rec_type='weekly'): {'a', 'c'},
+                Query('10', enabled=True): {'a'},
+                Query(enabled=False): {'b'},
+                Query('xyz'): set(),
+            }
+            for query, expected in cases.items():
+                with self.subTest(text=query.text, rec_type=query.rec_type, enabled=query.enabled):
+                    self.assertEqual(set(manager.filter_schedules(query)), expected)
+                    self.assertEqual({j for j in 'abcd' if manager.schedule_matches(j, query)}, expected)
+            self.assertIsNone(manager.filter_schedules(Query('  ')))
+
+            model = schedule_table.ScheduleTableModel(manager.get_all_jobs)
+            model.reload()
+            proxy = schedule_table.ScheduleFilterProxy()
+            proxy.setSourceModel(model)
+            query = Query('toan')
+            proxy.set_filter(lambda: manager.filter_schedules(query), lambda j: manager.schedule_matches(j, query))
+            shown = lambda: [proxy.job_id(row) for row in range(proxy.rowCount())]
+            self.assertEqual(shown(), ['a'])
+            self.assertEqual(proxy.mapToSource(proxy.index(0, 2)).row(), 0)
+
+            manager.add_schedule('e', 6, 0, '5', name='Toán 11', recurrence={'type': 'daily'})
+            manager.add_schedule('d', 10, 0, '111222333', name='Toán 12', recurrence={'type': 'daily'})
+            model.update_rows(['e', 'd'])
+            self.assertEqual(shown(), ['e', 'a', 'd'])
+            manager.add_schedule('a', 7, 0, '83738062598', name='Sinh 10A1', recurrence=weekly)
+            manager.remove_schedule('e')
+            model.update_rows(['a', 'e'])
+            self.assertEqual(shown(), ['d'])
+            self.assertEqual(proxy.row_of('d'), 0)
+            proxy.set_filter()
+            self.assertEqual(shown(), ['a', 'b', 'c', 'd'])
+        finally:
+            manager.stop()
+        print("   -> [PASS]")
+
+class TestDialogCache(unittest.TestCase):
+    """Dialog dựng một lần rồi dùng lại: trạng thái được đặt lại ở mỗi lần mở"""
+    def test_dialogs_are_reused_and_reset(self):
+        """Test case 52: prebuild dựng sẵn, open trả về cùng dialog đã xóa dữ liệu cũ và ghi độ trễ mở"""
+        print("\n[TEST 52] Kiểm tra DialogCache")
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt6.QtWidgets import QApplication, QWidget
+        import main
+        app = QApplication.instance() or QApplication([])
+        parent = QWidget()
+        cache = dialog_cache.DialogCache()
+        built = []
+
+        def make_schedule():
+            built.append('schedule')
+            return main.ScheduleDialog(parent, dialogs=cache)
+        cache.register('schedule', make_schedule)
+        cache.register('recurrence', lambda: main.CustomRecurrenceDialog(cache.get('schedule')))
+        cache.register('help', lambda: main.HelpDialog(parent))
+        cache.prebuild(['schedule', 'help'])
+        self.assertFalse(cache.is_built('schedule'))  # chỉ dựng khi vòng lặp sự kiện rảnh
+        cache.build_pending()
+        self.assertTrue(cache.is_built('schedule') and cache.is_built('help'))
+        self.assertFalse(cache.is_built('recurrence'))
+
+        dialog = cache.open('schedule')
+        dialog.set_data({'name': 'Toán', 'meeting_id': '83738062598', 'password': 'x', 'hour': 9, 'minute': 5,
+                         'recurrence': {'type': 'daily'}})
+        self.assertEqual(dialog.get_data()['name'], 'Toán')
+        dialog.custom_recurrence_data = {'interval': 2, 'unit': 'tuần', 'days_of_week': [1]}
+        again = cache.open('schedule')
+        self.assertIs(again, dialog)
+        self.assertEqual(built, ['schedule'])
+        data = again.get_data()
+        self.assertEqual((data['name'], data['meeting_id'], data['password'], data['hour'], data['minute']),
+                         ('', '', '', 8, 0))
+        self.assertEqual(data['recurrence']['type'], 'once')
+        self.assertIsNone(again.custom_recurrence_data)
+
+        custom = cache.open('recurrence')
+        self.assertIs(custom.parent(), dialog)
+        custom.set_data({'interval': 3, 'unit': 'tháng', 'days_of_week': [], 'end_date': '2031-01-01'})
+        custom = cache.open('recurrence')
+        data = custom.get_data()
+        self.assertEqual((data['interval'], data['unit'], data['end_date']), (1, 'tuần', None))
+        self.assertEqual(data['days_of_week'], [main.QDate.currentDate().dayOfWeek() - 1])
+
+        help_dialog = cache.get('help')
+        self.assertEqual(sorted(help_dialog.tab_builders), [1, 2, 3])  # tab 2-4 chưa dựng
+        help_dialog.tab_widget.setCurrentIndex(2)
+        self.assertEqual(sorted(help_dialog.tab_builders), [1, 3])
+        cache.open('help').show()
+        self.assertEqual(help_dialog.tab_widget.currentIndex(), 0)
+        for _ in range(50):
+            app.processEvents()
+            if cache.stats()['help']['opens']:
+                break
+        help_dialog.hide()
+        stats = cache.stats()
+        self.assertEqual(stats['help']['opens'], 1)
+        self.assertGreater(stats['help']['open_max_ms'], 0)
+        self.assertTrue(stats['schedule']['prebuilt'])
+        self.assertFalse(stats['recurrence']['prebuilt'])
+        self.assertEqual(stats['schedule']['opens'], 0)  # chưa hiện lần nào
+        print("   -> [PASS]")
+
+STARTUP_SCRIPT = """
+import json, pathlib, sys
+folder = pathlib.Path(sys.argv[1])
+import main
+main.SCHEDULE_FILE = folder / 'zoom_schedule.json'
+main.SCHEDULE_DB = folder / 'zoom_schedule.db'
+main.APP_CONFIG_FILE = folder / 'app_config.json'
+code = main.main([sys.argv[0], '--startup-report'])
+print(json.dumps([name for name in ('requests', 'webbrowser') if name in sys.modules]))
+sys.exit(code)
+"""
+
+INDEXED_STARTUP_SCRIPT = """
+import json, pathlib, sys
+folder = pathlib.Path(sys.argv[1])
+import main
+main.SCHEDULE_FILE = folder / 'zoom_schedule.json'
+main.SCHEDULE_DB = folder / 'zoom_schedule.db'
+main.APP_CONFIG_FILE = folder / 'app_config.json'
+app = main.QApplication(sys.argv[:1])
+window = main.ZoomAutoApp(startup=main.STARTUP)
+
+def done(report):
+    print(json.dumps({'load': report['phases']['load'], 'rows': window.table_model.rowCount(),
+                      'first': window.table_model.job_id(0), 'decoded': window.scheduler._records.decoded}))
+    window.close()
+    app.quit()
+
+window.startup_finished.connect(done)
+window.show()
+sys.exit(app.exec())
+"""
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Thời gian khởi động theo pha và ngân sách startup_budget_ms"""
+    def test_phases_and_budget_check(self):
+        """Test case 53: StartupTimer đo các pha liên tiếp; over_budget chỉ báo pha vượt ngân sách"""
+        print("\n[TEST 53] Kiểm tra StartupTimer")
+        now = [10.0]
+        timer = startup_timer.StartupTimer(clock=lambda: now[0])
+        for phase, seconds in (('imports', 0.3), ('ui', 0.05), ('load', 1.2)):
+            now[0] += seconds
+            timer.mark(phase)
+        self.assertIsNone(timer.report()['time_to_interactive'])
+        now[0] += 0.01
+        self.assertAlmostEqual(timer.interactive(), 1.56)
+        now[0] += 5
+        self.assertAlmostEqual(timer.interactive(), 1.56)  # lần gọi đầu được giữ
+        report = timer.report()
+        self.assertEqual(list(report['phases']), ['imports', 'ui', 'load'])
+        self.assertAlmostEqual(report['phases']['load'], 1200)
+        exceeded = startup_timer.over_budget(report, {'imports': 500, 'load': 1000, 'first_paint': 10,
+                                                      'ui': 0, 'time_to_interactive': 1500})
+        self.assertEqual(sorted(exceeded), ['load', 'time_to_interactive'])
+        self.assertAlmostEqual(exceeded['time_to_interactive'][0], 1560)
+        self.assertEqual(startup_timer.over_budget(report, {'time_to_interactive': 2000}), {})
+        print("   -> [PASS]")
+
+    def test_app_starts_within_budget(self):
+        """Test case 54: Khởi động ứng dụng thật (tiến trình riêng, 300 lịch) trong ngân sách mặc định"""
+        print("\n[TEST 54] Kiểm tra ngân sách khởi động")
+        from main import DEFAULT_APP_CONFIG
+        budget = DEFAULT_APP_CONFIG['startup_budget_ms']
+        with tempfile.TemporaryDirectory() as folder:
+            jobs = {f'job-{i}': {'id': f'job-{i}', 'name': f'Lớp {i % 40}', 'hour': i % 24, 'minute': i % 60,
+                                 'meeting_id': str(83700000000 + i % 40), 'enabled': True,
+                                 'recurrence': {'type': 'weekly', 'details': {'days_of_week': [i % 7]}}}
+                    for i in range(300)}
+            with open(os.path.join(folder, 'zoom_schedule.json'), 'w', encoding='utf-8') as f:
+                json.dump(jobs, f)
+            with open(os.path.join(folder, 'app_config.json'), 'w', encoding='utf-8') as f:
+                json.dump({'watch_interval': 0}, f)
+            env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+            result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, folder], capture_output=True,
+                                    text=True, timeout=120, env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        lines = result.stdout.splitlines()
+        report = json.loads(next(line for line in lines if line.startswith('{"phases"')))
+        lazy_loaded = json.loads(lines[-1])
+        print(f"   {report}")
+        self.assertEqual(list(report['phases']), ['imports', 'scheduler', 'ui', 'first_paint', 'load'])
+        self.assertEqual(lazy_loaded, [])  # requests/webbrowser chưa cần khi khởi động
+        self.assertEqual(startup_timer.over_budget(report, budget), {},
+                         f"Khởi động vượt ngân sách {budget}: {report}")
+        print("   -> [PASS]")
+
+    def test_indexed_startup_decodes_independent_of_size(self):
+        """Test case 61: finish_startup thật với kho nhị phân: số bản ghi giải mã không tăng theo số lịch"""
+        print("\n[TEST 61] Kiểm tra khởi động theo chỉ mục không giải mã cả bảng")
+        results = {}
+        for n in (500, 5000):
+            with tempfile.TemporaryDirectory() as folder:
+                jobs = {f'job-{i}': {'id': f'job-{i}', 'name': f'Lớp {i % 40}', 'hour': 23 - i % 24,
+                                     'minute': i % 60, 'meeting_id': str(83700000000 + i % 40), 'password': '',
+                                     'zoom_link': '', 'enabled': True,
+                                     'recurrence': {'type': 'weekly', 'details': {'days_of_week': [i % 7]}}}
+                        for i in range(n)}
+                BinaryScheduleStore(os.path.join(folder, 'zoom_schedule.zsb')).save(jobs)
+                with open(os.path.join(folder, 'app_config.json'), 'w', encoding='utf-8') as f:
+                    json.dump({'store': 'binary', 'startup_arm_limit': 32, 'watch_interval': 0}, f)
+                env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+                result = subprocess.run([sys.executable, '-c', INDEXED_STARTUP_SCRIPT, folder], capture_output=True,
+                                        text=True, timeout=120, env=env,
+                                        cwd=os.path.dirname(os.path.abspath(__file__)))
+            self.assertEqual(result.returncode, 0, result.stderr)
+            results[n] = json.loads(next(line for line in result.stdout.splitlines() if line.startswith('{')))
+            print(f"   {n} lịch: {results[n]}")
+            self.assertEqual(results[n]['rows'], n)
+            self.assertEqual(jobs[results[n]['first']]['hour'], 0)   # bảng vẫn sắp theo giờ
+        # Chỉ các lịch được đăng ký sớm và các dòng đang hiện trên màn hình được giải mã
+        self.assertEqual(results[500]['decoded'], results[5000]['decoded'])
+        self.assertLess(results[5000]['decoded'], 200)
         print("   -> [PASS]")
 
 if __name__ == '__main__':
@@ -0,0 +1,335 @@
+"""Native timer-heap scheduling engine.
+
+Implements the subset of APScheduler's ``BackgroundScheduler`` API that
+``SchedulerManager`` relies on (``start``, ``shutdown``, ``pause``, ``resume``,
+``add_job``, ``remove_job``, ``reschedule_job``, ``get_job``), backed by a single min-heap
+of next-fire timestamps and one dispatcher thread that sleeps until the
+earliest deadline. Insert, remove and reschedule are O(log n) (removal is
+lazy: cancelled heap entries are skipped when they reach the top and the heap
+is compacted once tombstones outnumber live entries).
+
+Times are naive local datetimes, matching what the app stores on disk.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Upper bound for a single dispatcher sleep so wall-clock jumps (sleep/hibernate,
+# manual clock changes) are noticed reasonably quickly.
+MAX_SLEEP_SECONDS = 60.0
+
+
+class JobLookupError(KeyError):
+    """Raised when a job id is not registered (mirrors APScheduler)."""
+
+
+def _parse_day_of_week(expr: Optional[str]) -> Optional[frozenset]:
+    # Accepts the forms SchedulerManager produces: "0,2", "0-4", "5".
+    if expr is None or expr == "" or expr == "*":
+        return None
+    days = set()
+    for part in str(expr).split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            days.update(range(int(lo), int(hi) + 1))
+        elif part:
+            days.add(int(part))
+    return frozenset(d for d in days if 0 <= d <= 6)
+
+
+class DateTrigger:
+    """Fires once at ``run_date``."""
+
+    def __init__(self, run_date: datetime):
+        self.run_date = run_date
+
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        return self.run_date if self.run_date > after else None
+
+    def __repr__(self) -> str:
+        return f"<DateTrigger run_date={self.run_date.isoformat()}>"
+
+
+class CronTrigger:
+    """Fires every day at ``hour:minute``, optionally limited to some weekdays."""
+
+    def __init__(self, hour: int = 0, minute: int = 0, day_of_week: Optional[str] = None,
+                 end_date: Optional[datetime] = None):
+        self.hour = int(hour)
+        self.minute = int(minute)
+        self.days = _parse_day_of_week(day_of_week)
+        self.end_date = end_date
+
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        candidate = after.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if candidate <= after:
+            candidate += timedelta(days=1)
+        if self.days is not None:
+            if not self.days:
+                return None
+            for _ in range(7):
+                if candidate.weekday() in self.days:
+                    break
+                candidate += timedelta(days=1)
+        if self.end_date is not None and candidate > self.end_date:
+            return None
+        return candidate
+
+    def __repr__(self) -> str:
+        days = ",".join(str(d) for d in sorted(self.days)) if self.days is not None else "*"
+        return f"<CronTrigger {self.hour:02d}:{self.minute:02d} dow={days}>"
+
+
+class IntervalTrigger:
+    """Fires every ``days`` days starting at ``start_date``."""
+
+    def __init__(self, days: int = 1, start_date: Optional[datetime] = None,
+                 end_date: Optional[datetime] = None, **_ignored: Any):
+        self.period = timedelta(days=max(1, int(days)))
+        self.start_date = start_date or datetime.now()
+        self.end_date = end_date
+
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        if self.start_date > after:
+            candidate = self.start_date
+        else:
+            steps = (after - self.start_date) // self.period + 1
+            candidate = self.start_date + steps * self.period
+        if self.end_date is not None and candidate > self.end_date:
+            return None
+        return candidate
+
+    def __repr__(self) -> str:
+        return f"<IntervalTrigger every {self.period.days}d from {self.start_date.isoformat()}>"
+
+
+_TRIGGER_ALIASES = {
+    "date": DateTrigger,
+    "cron": CronTrigger,
+    "interval": IntervalTrigger,
+}
+
+
+def create_trigger(alias: str, **trigger_args: Any):
+    """Build a native trigger from an APScheduler-style alias and kwargs."""
+    try:
+        cls = _TRIGGER_ALIASES[alias]
+    except KeyError:
+        raise ValueError(f"Unsupported trigger: {alias!r}") from None
+    return cls(**trigger_args)
+
+
+class HeapJob:
+    """A registered job. ``next_run_time`` is None while the job is exhausted."""
+
+    __slots__ = ("id", "func", "args", "kwargs", "trigger", "next_run_time", "_entry")
+
+    def __init__(self, job_id: str, func: Callable, args: Iterable, kwargs: Dict, trigger):
+        self.id = job_id
+        self.func = func
+        self.args = tuple(args or ())
+        self.kwargs = dict(kwargs or {})
+        self.trigger = trigger
+        self.next_run_time: Optional[datetime] = None
+        self._entry: Optional[list] = None
+
+
+class HeapScheduler:
+    """Single-thread, min-heap based replacement for ``BackgroundScheduler``."""
+
+    def __init__(self, max_workers: int = 10, misfire_grace_time: float = 1.0,
+                 on_submit: Optional[Callable[[str, datetime], None]] = None,
+                 on_missed: Optional[Callable[[str, datetime], None]] = None):
+        self.misfire_grace_time = misfire_grace_time
+        # Hooks called from the dispatcher thread with (job_id, planned fire time).
+        self.on_submit = on_submit
+        self.on_missed = on_missed
+        self._max_workers = max_workers
+        self._heap: List[list] = []           # [timestamp, seq, job or None]
+        self._jobs: Dict[str, HeapJob] = {}
+        self._tombstones = 0
+        self._paused = False
+        self._needs_heapify = False
+        self._batch_now: Optional[datetime] = None
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.running = False
+
+    # ---- lifecycle -------------------------------------------------------
+    def start(self) -> None:
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers,
+                                            thread_name_prefix="heap-scheduler-worker")
+            self._thread = threading.Thread(target=self._run, name="heap-scheduler", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cond:
+            if not self.running:
+                return
+            self.running = False
+            self._cond.notify_all()
+        if self._thread is not None and wait:
+            self._thread.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+        self._thread = None
+        self._pool = None
+
+    def pause(self) -> None:
+        """Stop dispatching and defer heap maintenance (used for bulk inserts)."""
+        with self._cond:
+            self._paused = True
+            # One reference time per batch so shared triggers compute once.
+            self._batch_now = datetime.now()
+
+    def resume(self) -> None:
+        """Restore the heap invariant in one O(n) pass and wake the dispatcher once."""
+        with self._cond:
+            if not self._paused:
+                return
+            self._paused = False
+            self._batch_now = None
+            if self._needs_heapify:
+                heapq.heapify(self._heap)
+                self._needs_heapify = False
+            self._cond.notify()
+
+    # ---- job management --------------------------------------------------
+    def add_job(self, func: Callable, trigger: Any = None, id: Optional[str] = None,
+                args: Optional[Iterable] = None, kwargs: Optional[Dict] = None,
+                replace_existing: bool = False, **trigger_args: Any) -> HeapJob:
+        if isinstance(trigger, str):
+            trigger = create_trigger(trigger, **trigger_args)
+        if trigger is None:
+            raise ValueError("A trigger is required")
+        job_id = id or f"job-{next(self._seq)}"
+        job = HeapJob(job_id, func, args, kwargs, trigger)
+        with self._cond:
+            if job_id in self._jobs:
+                if not replace_existing:
+                    raise ValueError(f"Job {job_id!r} already exists")
+                self._unlink(self._jobs.pop(job_id))
+            self._jobs[job_id] = job
+            self._arm(job, job.trigger.next_fire_time(self._batch_now or datetime.now()))
+        return job
+
+    def remove_job(self, job_id: str) -> None:
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                raise JobLookupError(job_id)
+            self._unlink(job)
+
+    def reschedule_job(self, job_id: str, trigger: Any = None, **trigger_args: Any) -> HeapJob:
+        if isinstance(trigger, str):
+            trigger = create_trigger(trigger, **trigger_args)
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise JobLookupError(job_id)
+            self._unlink(job)
+            job.trigger = trigger
+            self._arm(job, trigger.next_fire_time(datetime.now()))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[HeapJob]:
+        return self._jobs.get(job_id)
+
+    def get_jobs(self) -> List[HeapJob]:
+        with self._cond:
+            return list(self._jobs.values())
+
+    # ---- heap internals (caller holds self._cond) -------------------------
+    def _arm(self, job: HeapJob, fire_time: Optional[datetime]) -> None:
+        job.next_run_time = fire_time
+        if fire_time is None:
+            job._entry = None
+            return
+        entry = [fire_time.timestamp(), next(self._seq), job]
+        job._entry = entry
+        if self._paused:
+            # Bulk mode: append now, heapify once in resume().
+            self._heap.append(entry)
+            self._needs_heapify = True
+            return
+        heapq.heappush(self._heap, entry)
+        # Only wake the dispatcher when the earliest deadline moved forward.
+        if self._heap[0] is entry:
+            self._cond.notify()
+
+    def _unlink(self, job: HeapJob) -> None:
+        if job._entry is not None:
+            job._entry[2] = None
+            job._entry = None
+            self._tombstones += 1
+            if self._tombstones > 64 and self._tombstones * 2 > len(self._heap):
+                self._heap = [e for e in self._heap if e[2] is not None]
+                heapq.heapify(self._heap)
+                self._tombstones = 0
+                self._needs_heapify = False
+        job.next_run_time = None
+
+    def _pop_due(self, now_ts: float) -> List[tuple]:
+        due = []
+        heap = self._heap
+        while heap:
+            ts, _, job = heap[0]
+            if job is None:
+                heapq.heappop(heap)
+                self._tombstones -= 1
+                continue
+            if ts > now_ts:
+                break
+            heapq.heappop(heap)
+            job._entry = None
+            planned = job.next_run_time
+            # Coalesce missed runs: the next fire is computed from "now".
+            after = max(planned, datetime.fromtimestamp(now_ts))
+            self._arm(job, job.trigger.next_fire_time(after))
+            if now_ts - ts <= self.misfire_grace_time:
+                due.append((job, planned))
+            elif self.on_missed is not None:
+                self.on_missed(job.id, planned)
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self.running:
+                    return
+                if self._paused:
+                    self._cond.wait()
+                    continue
+                now_ts = time.time()
+                due = self._pop_due(now_ts)
+                if not due:
+                    while self._heap and self._heap[0][2] is None:
+                        heapq.heappop(self._heap)
+                        self._tombstones -= 1
+                    if self._heap:
+                        delay = min(self._heap[0][0] - now_ts, MAX_SLEEP_SECONDS)
+                    else:
+                        delay = MAX_SLEEP_SECONDS
+                    if delay > 0:
+                        self._cond.wait(delay)
+                    continue
+                pool = self._pool
+            for job, planned in due:
+                if self.on_submit is not None:
+                    self.on_submit(job.id, planned)
+                try:
+                    pool.submit(job.func, *job.args, **job.kwargs)
+                except RuntimeError:
+                    # Pool already shut down: the scheduler is stopping.
+                    return
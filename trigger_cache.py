@@ -0,0 +1,173 @@
+"""Shared, memoized trigger objects keyed by recurrence signature.
+
+Most schedules share a handful of shapes ("weekdays 08:00", "weekly T2,T4
+09:00", ...). ``TriggerCache`` compiles each distinct shape once and hands the
+same trigger object to every job that uses it. The wrappers also memoize the
+last next-fire computation, so N jobs sharing a trigger cost one computation
+per scheduler tick instead of N.
+
+Entries are reference counted by the owner (``SchedulerManager``) and dropped
+once no job uses them, so one-off signatures do not accumulate.
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+import timer_heap
+from recurrence import BitmaskTrigger
+
+_MISSING = object()
+
+
+class _MemoStats:
+    __slots__ = ("hits", "misses")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+class SharedTrigger(BaseTrigger):
+    """APScheduler trigger wrapper that memoizes ``get_next_fire_time``.
+
+    APScheduler evaluates every due job with the same ``now`` inside one
+    processing pass, so jobs that share this trigger (and fired together last
+    time) hit the memo instead of re-running the cron arithmetic.
+    """
+
+    __slots__ = ("alias", "trigger_args", "trigger", "_memo", "_stats")
+
+    def __init__(self, alias: str, trigger_args: Dict[str, Any], trigger: BaseTrigger, stats: _MemoStats):
+        self.alias = alias
+        self.trigger_args = trigger_args
+        self.trigger = trigger
+        self._memo: Tuple[Any, Any, Any] = (_MISSING, _MISSING, None)
+        self._stats = stats
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        prev, at, result = self._memo
+        if prev == previous_fire_time and at == now:
+            self._stats.hits += 1
+            return result
+        self._stats.misses += 1
+        result = self.trigger.get_next_fire_time(previous_fire_time, now)
+        self._memo = (previous_fire_time, now, result)
+        return result
+
+    def __str__(self) -> str:
+        return str(self.trigger)
+
+    def __repr__(self) -> str:
+        return f"<SharedTrigger {self.trigger!r}>"
+
+
+class SharedNativeTrigger:
+    """Same idea for ``timer_heap`` triggers (``next_fire_time(after)``)."""
+
+    __slots__ = ("alias", "trigger_args", "trigger", "_memo", "_stats")
+
+    def __init__(self, alias: str, trigger_args: Dict[str, Any], trigger, stats: _MemoStats):
+        self.alias = alias
+        self.trigger_args = trigger_args
+        self.trigger = trigger
+        self._memo: Tuple[Any, Any] = (_MISSING, None)
+        self._stats = stats
+
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        at, result = self._memo
+        if at == after:
+            self._stats.hits += 1
+            return result
+        self._stats.misses += 1
+        result = self.trigger.next_fire_time(after)
+        self._memo = (after, result)
+        return result
+
+    def __repr__(self) -> str:
+        return f"<SharedNativeTrigger {self.trigger!r}>"
+
+
+_APSCHEDULER_TRIGGERS = {
+    "cron": CronTrigger,
+    "date": DateTrigger,
+    "interval": IntervalTrigger,
+    "bitmask": BitmaskTrigger,
+}
+
+
+def apscheduler_factory(alias: str, trigger_args: Dict[str, Any], stats: _MemoStats) -> SharedTrigger:
+    return SharedTrigger(alias, trigger_args, _APSCHEDULER_TRIGGERS[alias](**trigger_args), stats)
+
+
+def native_factory(alias: str, trigger_args: Dict[str, Any], stats: _MemoStats) -> SharedNativeTrigger:
+    if alias == "bitmask":
+        trigger = BitmaskTrigger(**trigger_args)
+    else:
+        trigger = timer_heap.create_trigger(alias, **trigger_args)
+    return SharedNativeTrigger(alias, trigger_args, trigger, stats)
+
+
+class TriggerCache:
+    """Reference-counted map of recurrence signature -> shared trigger."""
+
+    def __init__(self, factory: Callable[[str, Dict[str, Any], _MemoStats], Any]):
+        self._factory = factory
+        self._entries: Dict[Hashable, list] = {}   # key -> [trigger, refcount]
+        self._fire_stats = _MemoStats()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, key: Hashable, build: Callable[[], Optional[Tuple[str, Dict[str, Any]]]]):
+        """Return the shared trigger for ``key``, compiling it with ``build()`` on a miss.
+
+        ``build`` returns ``(alias, trigger_args)`` or None when the recurrence
+        cannot be scheduled; in that case nothing is cached and None is returned.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry[1] += 1
+            return entry[0]
+        spec = build()
+        if spec is None:
+            return None
+        self.misses += 1
+        alias, trigger_args = spec
+        trigger = self._factory(alias, trigger_args, self._fire_stats)
+        self._entries[key] = [trigger, 1]
+        return trigger
+
+    def get(self, key: Hashable):
+        """Peek at a cached trigger without touching counters or refcounts."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def release(self, key: Hashable) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        fire = self._fire_stats
+        fire_lookups = fire.hits + fire.misses
+        return {
+            "size": len(self._entries),
+            "jobs": sum(entry[1] for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "fire_time_hits": fire.hits,
+            "fire_time_misses": fire.misses,
+            "fire_time_hit_rate": fire.hits / fire_lookups if fire_lookups else 0.0,
+        }
@@ -8,7 +8,8 @@ import time
 from pathlib import Path
 from typing import Callable, Dict, Optional, Tuple
 
-import requests
+# requests is imported inside the functions that go online: importing it
+# takes ~80 ms, and most starts only read the config and the throttle stamp.
 
 
 def _resource_dir() -> Path:
@@ -73,6 +74,7 @@ def is_newer(remote: str, local: str) -> bool:
 
 def _github_latest_release(repo: str) -> Dict:
     url = f"https://api.github.com/repos/{repo}/releases/latest"
+    import requests
     headers = {"Accept": "application/vnd.github+json"}
     resp = requests.get(url, headers=headers, timeout=20)
     resp.raise_for_status()
@@ -95,6 +97,7 @@ def _extract_sha256(release: Dict, asset_name: str) -> Optional[str]:
         if a.get("name") == want:
             url = a.get("browser_download_url")
             if url:
+                import requests
                 text = requests.get(url, timeout=20).text.strip()
                 # file can be: "<sha256>  <filename>" or just hash
                 m = re.search(r"([a-fA-F0-9]{64})", text)
@@ -133,6 +136,7 @@ def check_latest(config: Dict) -> Optional[Dict]:
 
 
 def download(url: str, dest: Path, progress_cb: Optional[Callable[[int, int], None]] = None) -> None:
+    import requests
     with requests.get(url, stream=True, timeout=60) as r:
         r.raise_for_status()
         total = int(r.headers.get("Content-Length", 0))
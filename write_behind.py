@@ -0,0 +1,136 @@
+"""Debounced write-behind persistence for the schedule table.
+
+The UI thread only records *what* changed (``mark``); a background thread
+waits for the debounce window to close, folds every change made in the
+meantime into one ``store.save`` call and performs the I/O. A burst of
+toggles therefore costs one write instead of one write per click.
+
+The persister keeps its own mirror of the schedule table so the writer never
+sees a table the UI thread is changing. Records are replaced, never edited in
+place (``SchedulerManager`` builds a new entry for every change), so the
+mirror and a full ``mark`` share them with the live table and only copy the
+mapping; ``mark`` with ``changed`` copies just the touched records, and the
+writer applies them to the mirror before saving.
+"""
+import copy
+import threading
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+
+class WriteBehindPersister:
+    """Coalesce schedule mutations for ``window`` seconds, then save them off the UI thread."""
+
+    def __init__(self, store, jobs: Mapping[str, Any], window: float = 0.5):
+        self.store = store
+        self.window = max(0.0, float(window))
+        self._mirror = self._snapshot(jobs)
+        self._pending: Dict[str, Optional[dict]] = {}
+        self._full: Optional[Mapping[str, Any]] = None   # table of the last full mark
+        self._deadline: Optional[float] = None
+        self._writing = False
+        self._stopped = False
+        self._cond = threading.Condition()
+        self.saves = 0
+        self.errors = 0
+        self.mutations = 0
+        self.total_duration = 0.0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self._thread = threading.Thread(target=self._run, name="schedule-writer", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _snapshot(jobs: Mapping[str, Any]) -> Mapping[str, Any]:
+        # Shallow: records are shared. Lazy mappings (schedule_index.OverlayJobs)
+        # copy without decoding every record.
+        if isinstance(jobs, dict) or not hasattr(jobs, "copy"):
+            return dict(jobs)
+        return jobs.copy()
+
+    def mark(self, jobs: Mapping[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+        """Record a mutation. ``changed=None`` means the whole table may have changed."""
+        with self._cond:
+            if self._stopped:
+                return
+            if changed is None:
+                self._pending = {}
+                self._full = self._snapshot(jobs)
+            else:
+                for job_id in changed:
+                    data = jobs.get(job_id)
+                    self._pending[job_id] = copy.deepcopy(data) if data is not None else None
+            self.mutations += 1
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.window
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._deadline is not None and time.monotonic() >= self._deadline:
+                        break
+                    if self._stopped and self._deadline is None:
+                        return
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+                pending, full = self._pending, self._full
+                self._pending, self._full, self._deadline = {}, None, None
+                if full is not None:
+                    self._mirror = full
+                for job_id, data in pending.items():
+                    if data is None:
+                        self._mirror.pop(job_id, None)
+                    else:
+                        self._mirror[job_id] = data
+                self._writing = True
+            started = time.perf_counter()
+            try:
+                self.store.save(self._mirror, None if full is not None else list(pending))
+            except Exception as e:
+                self.errors += 1
+                print(f"[SAVE] Lỗi khi lưu lịch: {e}")
+            elapsed = time.perf_counter() - started
+            with self._cond:
+                self._writing = False
+                self.saves += 1
+                self.last_duration = elapsed
+                self.total_duration += elapsed
+                self.max_duration = max(self.max_duration, elapsed)
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything marked so far now and wait for it. Returns False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._deadline is not None:
+                self._deadline = time.monotonic()
+                self._cond.notify_all()
+            while self._deadline is not None or self._writing:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Flush pending changes and stop the writer thread."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "saves": self.saves,
+                "errors": self.errors,
+                "mutations": self.mutations,
+                "pending": len(self._pending) if self._full is None else len(self._full) + len(self._pending),
+                "last_duration": self.last_duration,
+                "avg_duration": self.total_duration / self.saves if self.saves else 0.0,
+                "max_duration": self.max_duration,
+            }